@@ -5,13 +5,14 @@ import functools
 import logging
 import random
 import secrets
+import threading
 import warnings
 from argparse import Namespace
 from collections import Counter, deque, defaultdict
 from collections.abc import Collection, MutableSequence
 from enum import IntEnum, IntFlag
 from typing import (AbstractSet, Any, Callable, ClassVar, Dict, Iterable, Iterator, List, Literal, Mapping, NamedTuple,
-                    Optional, Protocol, Set, Tuple, Union, TYPE_CHECKING, Literal, overload)
+                    Optional, Protocol, Set, Tuple, TypeVar, Union, TYPE_CHECKING, overload)
 import dataclasses
 
 from typing_extensions import NotRequired, TypedDict
@@ -68,6 +69,22 @@ class PlandoItemBlock:
     count: dict[str, int] = dataclasses.field(default_factory=dict)
 
 
+class SphereSweep(NamedTuple):
+    """
+    Result of MultiWorld.sweep_spheres. Events are collected as soon as they are reachable, in steps of their own, so
+    each sphere of non-event locations is preceded by the steps collecting the events that became reachable before it.
+    """
+    steps: List[Set[Location]]
+    """The locations collected in each step, either a round of events or a sphere."""
+    states: List[CollectionState]
+    """Per step, the state before it, if the sweep was asked to keep them."""
+    spheres: List[Set[Location]]
+    """The reachable non-event locations of each sphere, including empty ones."""
+    unreachable: Set[Location]
+    state: CollectionState
+    """The state after collecting everything reachable."""
+
+
 class MultiWorld():
     debug_types = False
     player_name: Dict[int, str]
@@ -87,6 +104,16 @@ class MultiWorld():
     progression_balancing: Dict[int, Options.ProgressionBalancing]
     completion_condition: Dict[int, Callable[[CollectionState], bool]]
     indirect_connections: Dict[Region, Set[Entrance]]
+    rule_dependencies: Dict[int, Dict[Union[str, Region], Set[Union[Entrance, Location]]]]
+    """per player, the Entrances and Locations whose access rules read an item name or Region while they could not be
+    reached, see World.track_rule_dependencies"""
+    cache_spheres: bool
+    """set once item placement is final, to compute get_sphere_sweep only once for all post-fill consumers"""
+    keep_sphere_states: bool
+    """set if a consumer of the cached get_sphere_sweep needs the state before each step, like the playthrough"""
+    _sphere_sweep: Optional[SphereSweep]
+    generation_control: Utils.GenerationControl
+    """checked for cancellation and given the progress during long running steps of generation"""
     exclude_locations: Dict[int, Options.ExcludeLocations]
     priority_locations: Dict[int, Options.PriorityLocations]
     start_inventory: Dict[int, Options.StartInventory]
@@ -166,6 +193,12 @@ class MultiWorld():
         self.early_items = {player: {} for player in self.player_ids}
         self.local_early_items = {player: {} for player in self.player_ids}
         self.indirect_connections = {}
+        self.rule_dependencies = {}
+        self.cache_spheres = False
+        self.keep_sphere_states = False
+        self._sphere_sweep = None
+        self._sphere_sweep_lock = threading.Lock()
+        self.generation_control = Utils.GenerationControl()
         self.start_inventory_from_pool: Dict[int, Options.StartInventoryPool] = {}
         self.plando_item_blocks = {}
 
@@ -608,53 +641,100 @@ class MultiWorld():
                 state.collect(location.item, True, location)
             locations -= sphere
 
-    def get_sendable_spheres(self) -> Iterator[Set[Location]]:
+    def sweep_spheres(self, state: Optional[CollectionState] = None, keep_states: bool = False) -> SphereSweep:
         """
-        yields a set of multiserver sendable locations (location.item.code: int) for each logical sphere
+        Collects all reachable locations sphere by sphere, starting from state or a new CollectionState.
+        Events are collected as soon as they become reachable, instead of counting as a sphere.
 
-        If there are unreachable locations, the last sphere of reachable locations is followed by an empty set,
-        and then a set of all of the unreachable locations.
+        :param keep_states: Also keep a copy of the state before each step in SphereSweep.states.
         """
-        state = CollectionState(self)
+        if not state:
+            state = CollectionState(self)
         locations: Set[Location] = set()
         events: Set[Location] = set()
-        for location in self.get_filled_locations():
-            if type(location.item.code) is int and type(location.address) is int:
-                locations.add(location)
-            else:
+        for location in self.get_locations():
+            if location.item and (type(location.item.code) is not int or type(location.address) is not int):
                 events.add(location)
+            else:
+                locations.add(location)
 
-        while locations:
-            sphere: Set[Location] = set()
-
+        sweep = SphereSweep([], [], [], set(), state)
+        while True:
             # cull events out
-            done_events: Set[Union[Location, None]] = {None}
-            while done_events:
-                done_events = set()
+            found_events = False
+            while True:
+                done_events: Set[Location] = set()
                 for event in events:
                     if event.can_reach(state):
+                        if keep_states and not done_events:
+                            sweep.states.append(state.copy())
                         state.collect(event.item, True, event)
                         done_events.add(event)
+                if not done_events:
+                    break
                 events -= done_events
+                found_events = True
+                sweep.steps.append(done_events)
 
-            for location in locations:
-                if location.can_reach(state):
-                    sphere.add(location)
-
-            yield sphere
-            if not sphere:
-                if locations:
-                    yield locations  # unreachable locations
+            sphere = {location for location in locations if location.can_reach(state)}
+            if not sphere and not found_events:
                 break
+            sweep.steps.append(sphere)
+            if keep_states:
+                sweep.states.append(state.copy())
+            sweep.spheres.append(sphere)
 
             for location in sphere:
-                state.collect(location.item, True, location)
+                if location.item:
+                    state.collect(location.item, True, location)
+            locations -= sphere
+
+        sweep.unreachable.update(locations, events)
+        return sweep
+
+    def get_sphere_sweep(self, keep_states: bool = False) -> SphereSweep:
+        """
+        Returns sweep_spheres of the current placement.
+        After cache_spheres was set, the sweep is only computed once and then shared, keeping its states if
+        keep_sphere_states was set as well.
+
+        :param keep_states: The states before each step are needed, see sweep_spheres.
+        """
+        if not self.cache_spheres:
+            return self.sweep_spheres(keep_states=keep_states)
+        with self._sphere_sweep_lock:
+            sweep = self._sphere_sweep
+            if not sweep or keep_states and len(sweep.states) != len(sweep.steps):
+                sweep = self._sphere_sweep = self.sweep_spheres(keep_states=keep_states or self.keep_sphere_states)
+            return sweep
+
+    def get_sendable_spheres(self) -> Iterator[Set[Location]]:
+        """
+        yields a set of multiserver sendable locations (location.item.code: int) for each logical sphere
+
+        If there are unreachable locations, the last sphere of reachable locations is followed by an empty set,
+        and then a set of all of the unreachable locations.
+        """
+        sweep = self.get_sphere_sweep()
+        locations = {location for location in self.get_filled_locations()
+                     if type(location.item.code) is int and type(location.address) is int}
+
+        for sweep_sphere in sweep.spheres:
+            if not locations:
+                return
+            sphere = locations.intersection(sweep_sphere)
+            yield sphere
+            if not sphere:
+                yield locations  # unreachable locations
+                return
             locations -= sphere
 
+        if locations:
+            yield set()
+            yield locations  # unreachable locations
+
     def fulfills_accessibility(self, state: Optional[CollectionState] = None):
         """Check if accessibility rules are fulfilled with current or supplied state."""
-        if not state:
-            state = CollectionState(self)
         players: Dict[str, Set[int]] = {
             "minimal": set(),
             "items": set(),
@@ -663,8 +743,6 @@ class MultiWorld():
         for player, world in self.worlds.items():
             players[world.options.accessibility.current_key].add(player)
 
-        beatable_fulfilled = False
-
         def location_condition(location: Location) -> bool:
             """Determine if this location has to be accessible, location is already filtered by location_relevant"""
             return location.player in players["full"] or \
@@ -674,48 +752,182 @@ class MultiWorld():
             """Determine if this location is relevant to sweep."""
             return location.player in players["full"] or location.advancement
 
-        def all_done() -> bool:
-            """Check if all access rules are fulfilled"""
-            if not beatable_fulfilled:
-                return False
-            if any(location_condition(location) for location in locations):
-                return False  # still locations required to be collected
+        sweep = self.sweep_spheres(state) if state else self.get_sphere_sweep()
+        locations = [location for location in sweep.unreachable if location_relevant(location)]
+
+        if self.has_beaten_game(sweep.state) and not any(location_condition(location) for location in locations):
             return True
 
-        locations = [location for location in self.get_locations() if location_relevant(location)]
+        if locations:
+            if __debug__:
+                from Fill import FillError
+                raise FillError(
+                    f"Could not access required locations for accessibility check. Missing: {locations}",
+                    multiworld=self,
+                )
+            # ran out of places and did not finish yet, quit
+            logging.warning(f"Could not access required locations for accessibility check."
+                            f" Missing: {locations}")
+        return False
 
-        while locations:
-            sphere: List[Location] = []
-            for n in range(len(locations) - 1, -1, -1):
-                if locations[n].can_reach(state):
-                    sphere.append(locations.pop(n))
 
-            if not sphere:
-                if __debug__:
-                    from Fill import FillError
-                    raise FillError(
-                        f"Could not access required locations for accessibility check. Missing: {locations}",
-                        multiworld=self,
-                    )
-                # ran out of places and did not finish yet, quit
-                logging.warning(f"Could not access required locations for accessibility check."
-                                f" Missing: {locations}")
-                return False
+PathValue = Tuple[str, Optional["PathValue"]]
 
-            for location in sphere:
-                if location.item:
-                    state.collect(location.item, True, location)
 
-            if self.has_beaten_game(state):
-                beatable_fulfilled = True
+class _RuleDependencyCounter(Counter):
+    """
+    Items of a player tracking rule dependencies, see World.track_rule_dependencies.
+
+    Records the items looked up in it while `reads` is set, and the items written to it in `changed`, as well as in
+    `watch` while that is set.
+    """
+    reads: Optional[Set[Union[str, Region]]] = None
+    watch: Optional[Set[Union[str, Region]]] = None
+    changed: Set[str]
+    """items written since the player's reachable regions were last updated"""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        self.changed = set()
+        super().__init__(*args, **kwargs)
+
+    def __getitem__(self, key: str) -> int:
+        if self.reads is not None:
+            self.reads.add(key)
+        return super().__getitem__(key)
+
+    def __contains__(self, key: object) -> bool:
+        if self.reads is not None:
+            self.reads.add(key)
+        return super().__contains__(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if self.reads is not None:
+            self.reads.add(key)
+        return super().get(key, default)
+
+    def __setitem__(self, key: str, value: int) -> None:
+        self.changed.add(key)
+        if self.watch is not None:
+            self.watch.add(key)
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key: str) -> None:
+        self.changed.add(key)
+        if self.watch is not None:
+            self.watch.add(key)
+        super().__delitem__(key)
+
+    def copy(self) -> _RuleDependencyCounter:
+        ret = _RuleDependencyCounter(self)
+        ret.changed = self.changed.copy()
+        return ret
 
-            if all_done():
-                return True
 
-        return False
+class _RuleDependencySet(set):
+    """
+    Reachable Regions of a player tracking rule dependencies, see World.track_rule_dependencies.
 
+    Records the Regions tested for membership while `reads` is set, and the Regions added to it while `watch` is set.
+    """
+    reads: Optional[Set[Union[str, Region]]] = None
+    watch: Optional[Set[Union[str, Region]]] = None
 
-PathValue = Tuple[str, Optional["PathValue"]]
+    def __contains__(self, key: object) -> bool:
+        if self.reads is not None:
+            self.reads.add(key)
+        return super().__contains__(key)
+
+    def add(self, region: Region) -> None:
+        if self.watch is not None:
+            self.watch.add(region)
+        super().add(region)
+
+    def copy(self) -> _RuleDependencySet:
+        return _RuleDependencySet(self)
+
+
+_T = TypeVar("_T", Counter, set)
+
+
+class _CopyOnAccessDict(Dict[int, _T]):
+    """
+    Per player containers of a CollectionState, which may be shared with copies of that state.
+
+    A shared container is only copied the first time it gets looked up, so copying a state only costs as much as the
+    players that are looked at afterwards.
+
+    As only looking a container up copies it, a reference to a container taken before the state got copied still points
+    to the shared one, and writing through it would change the copy as well. Look containers up again after copying,
+    instead of holding on to them across a copy.
+    """
+    __slots__ = ("shared",)
+    shared: Set[int]
+    """players whose container may also be referenced by another state, and has to be copied before it can be used"""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.shared = set()
+
+    def __getitem__(self, player: int) -> _T:
+        container = super().__getitem__(player)
+        if player in self.shared:
+            self.shared.remove(player)
+            container = container.copy()
+            super().__setitem__(player, container)
+        return container
+
+    def __setitem__(self, player: int, container: _T) -> None:
+        self.shared.discard(player)
+        super().__setitem__(player, container)
+
+    def __delitem__(self, player: int) -> None:
+        self.shared.discard(player)
+        super().__delitem__(player)
+
+    def _unshare(self) -> None:
+        for player in tuple(self.shared):
+            self[player]
+
+    def get(self, player: int, default: Any = None) -> Any:
+        return self[player] if player in self else default
+
+    def setdefault(self, player: int, default: _T) -> _T:
+        if player in self:
+            return self[player]
+        self[player] = default
+        return default
+
+    def pop(self, player: int, *default: Any) -> Any:
+        if player in self:
+            container = self[player]
+            del self[player]
+            return container
+        return super().pop(player, *default)
+
+    def popitem(self) -> Tuple[int, _T]:
+        self._unshare()
+        return super().popitem()
+
+    def values(self):  # type: ignore[override]
+        self._unshare()
+        return super().values()
+
+    def items(self):  # type: ignore[override]
+        self._unshare()
+        return super().items()
+
+    def copy(self) -> _CopyOnAccessDict[_T]:
+        ret = _CopyOnAccessDict(self)
+        ret.shared = set(self)
+        self.shared = set(self)
+        return ret
+
+    @staticmethod
+    def copy_of(containers: Dict[int, _T]) -> _CopyOnAccessDict[_T]:
+        """Copy per player containers, which only shares them if the original is a _CopyOnAccessDict as well."""
+        if isinstance(containers, _CopyOnAccessDict):
+            return containers.copy()
+        return _CopyOnAccessDict((player, container.copy()) for player, container in containers.items())
 
 
 class CollectionState():
@@ -733,10 +945,10 @@ class CollectionState():
 
     def __init__(self, parent: MultiWorld, allow_partial_entrances: bool = False):
         assert parent.worlds, "CollectionState created without worlds initialized in parent"
-        self.prog_items = {player: Counter() for player in parent.get_all_ids()}
+        self.prog_items = _CopyOnAccessDict((player, Counter()) for player in parent.get_all_ids())
         self.multiworld = parent
-        self.reachable_regions = {player: set() for player in parent.get_all_ids()}
-        self.blocked_connections = {player: set() for player in parent.get_all_ids()}
+        self.reachable_regions = _CopyOnAccessDict((player, set()) for player in parent.get_all_ids())
+        self.blocked_connections = _CopyOnAccessDict((player, set()) for player in parent.get_all_ids())
         self.advancements = set()
         self.path = {}
         self.locations_checked = set()
@@ -752,8 +964,12 @@ class CollectionState():
         self.stale[player] = False
         world: AutoWorld.World = self.multiworld.worlds[player]
         reachable_regions = self.reachable_regions[player]
-        queue = deque(self.blocked_connections[player])
         start: Region = world.get_region(world.origin_region_name)
+        if self.tracks_rule_dependencies(player):
+            self._update_reachable_regions_tracked_rule_dependencies(player, start)
+            return
+
+        queue = deque(self.blocked_connections[player])
 
         # init on first call - this can't be done on construction since the regions don't exist yet
         if start not in reachable_regions:
@@ -815,16 +1031,107 @@ class CollectionState():
             # sweep for indirect connections, mostly Entrance.can_reach(unrelated_Region)
             queue.extend(blocked_connections)
 
+    def tracks_rule_dependencies(self, player: int) -> bool:
+        """Whether the items and Regions the player's rules read get recorded, see World.track_rule_dependencies."""
+        return self.multiworld.worlds[player].track_rule_dependencies and not self.allow_partial_entrances
+
+    def _update_reachable_regions_tracked_rule_dependencies(self, player: int, start: Region):
+        blocked_connections = self.blocked_connections[player]
+        rule_dependencies = self.multiworld.rule_dependencies.setdefault(player, defaultdict(set))
+        prog_items = self.prog_items[player]
+        reachable_regions = self.reachable_regions[player]
+        queue: deque[Entrance]
+        if not isinstance(prog_items, _RuleDependencyCounter) or not isinstance(reachable_regions, _RuleDependencySet):
+            # first update, or the containers got replaced, so there is nothing known about what changed
+            prog_items = self.prog_items[player] = _RuleDependencyCounter(prog_items)
+            reachable_regions = self.reachable_regions[player] = _RuleDependencySet(reachable_regions)
+            queue = deque(blocked_connections)
+        else:
+            # only retry the blocked connections that read an item which changed since the last update
+            retry: Set[Union[Entrance, Location]] = set()
+            for item_name in prog_items.changed:
+                retry |= rule_dependencies.get(item_name, set())
+            queue = deque(retry & blocked_connections)
+        prog_items.changed.clear()
+        if not set.__contains__(reachable_regions, start):
+            # init on first call - this can't be done on construction since the regions don't exist yet
+            reachable_regions.add(start)
+            blocked_connections.update(start.exits)
+            queue = deque(blocked_connections)
+        queued = set(queue)
+
+        # this update may run while a Location's rules are being recorded, see can_reach_recording_dependencies
+        outer_reads = prog_items.reads
+        reads: Set[Union[str, Region]] = set()
+        prog_items.reads = reachable_regions.reads = reads
+        try:
+            # run BFS on all connections, and keep track of those blocked by missing items or Regions
+            while queue:
+                connection = queue.popleft()
+                queued.discard(connection)
+                new_region = connection.connected_region
+                if set.__contains__(reachable_regions, new_region):
+                    blocked_connections.discard(connection)
+                    continue
+                reads.clear()
+                if connection.can_reach(self):
+                    assert new_region, f"tried to search through an Entrance \"{connection}\" with no connected Region"
+                    reachable_regions.add(new_region)
+                    blocked_connections.discard(connection)
+                    blocked_connections.update(new_region.exits)
+                    queue.extend(new_region.exits)
+                    queued.update(new_region.exits)
+                    self.path[new_region] = (new_region.name, self.path.get(connection, None))
+
+                    # Retry connections that read the new region
+                    for dependent in rule_dependencies.get(new_region, ()):
+                        if dependent in blocked_connections and dependent not in queued:
+                            queue.append(dependent)
+                            queued.add(dependent)
+                else:
+                    for read in reads:
+                        rule_dependencies[read].add(connection)
+        finally:
+            prog_items.reads = reachable_regions.reads = outer_reads
+
+    def can_reach_recording_dependencies(self, location: Location) -> bool:
+        """
+        Location.can_reach for a player tracking rule dependencies, which records what the Location's rules read in
+        MultiWorld.rule_dependencies if it can't be reached, so it only has to be checked again once one of those
+        changes.
+        """
+        player = location.player
+        if self.stale[player] or not isinstance(self.prog_items[player], _RuleDependencyCounter) \
+                or not isinstance(self.reachable_regions[player], _RuleDependencySet):
+            self.update_reachable_regions(player)
+        prog_items = self.prog_items[player]
+        reachable_regions = self.reachable_regions[player]
+        reads: Set[Union[str, Region]] = set()
+        prog_items.reads = reachable_regions.reads = reads
+        try:
+            reachable = location.can_reach(self)
+        finally:
+            prog_items.reads = reachable_regions.reads = None
+        if not reachable:
+            rule_dependencies = self.multiworld.rule_dependencies.setdefault(player, defaultdict(set))
+            for read in reads:
+                rule_dependencies[read].add(location)
+        return reachable
+
     def copy(self) -> CollectionState:
-        ret = CollectionState(self.multiworld)
-        ret.prog_items = {player: counter.copy() for player, counter in self.prog_items.items()}
-        ret.reachable_regions = {player: region_set.copy() for player, region_set in
-                                 self.reachable_regions.items()}
-        ret.blocked_connections = {player: entrance_set.copy() for player, entrance_set in
-                                   self.blocked_connections.items()}
+        # skip __init__, as collecting the precollected items again would just be thrown away
+        ret = CollectionState.__new__(CollectionState)
+        ret.multiworld = self.multiworld
+        for function in self.additional_init_functions:
+            function(ret, self.multiworld)
+        # the per player containers are shared until either state looks them up, see _CopyOnAccessDict
+        ret.prog_items = _CopyOnAccessDict.copy_of(self.prog_items)
+        ret.reachable_regions = _CopyOnAccessDict.copy_of(self.reachable_regions)
+        ret.blocked_connections = _CopyOnAccessDict.copy_of(self.blocked_connections)
         ret.advancements = self.advancements.copy()
         ret.path = self.path.copy()
         ret.locations_checked = self.locations_checked.copy()
+        ret.stale = {player: True for player in self.multiworld.get_all_ids()}
         ret.allow_partial_entrances = self.allow_partial_entrances
         for function in self.additional_copy_functions:
             ret = function(self, ret)
@@ -1695,39 +2002,32 @@ class Spoiler:
         # get locations containing progress items
         multiworld = self.multiworld
         prog_locations = {location for location in multiworld.get_filled_locations() if location.item.advancement}
-        state_cache: List[Optional[CollectionState]] = [None]
-        collection_spheres: List[Set[Location]] = []
-        state = CollectionState(multiworld)
-        sphere_candidates = set(prog_locations)
         logging.debug('Building up collection spheres.')
-        while sphere_candidates:
-
-            # build up spheres of collection radius.
-            # Everything in each sphere is independent from each other in dependencies and only depends on lower spheres
-
-            sphere = {location for location in sphere_candidates if state.can_reach(location)}
-
-            for location in sphere:
-                state.collect(location.item, True, location)
-
-            sphere_candidates -= sphere
-            collection_spheres.append(sphere)
-            state_cache.append(state.copy())
 
-            logging.debug('Calculated sphere %i, containing %i of %i progress items.', len(collection_spheres),
-                          len(sphere),
-                          len(prog_locations))
-            if not sphere:
-                logging.debug('The following items could not be reached: %s', ['%s (Player %d) at %s (Player %d)' % (
-                    location.item.name, location.item.player, location.name, location.player) for location in
-                                                                               sphere_candidates])
-                if not multiworld.has_beaten_game(state):
-                    raise RuntimeError("During playthrough generation, the game was determined to be unbeatable. "
-                                       "Something went terribly wrong here. "
-                                       f"Unreachable progression items: {sphere_candidates}")
-                else:
-                    self.unreachables = sphere_candidates
-                    break
+        # build up spheres of collection radius from the sweep shared with the other post-fill steps.
+        # Everything in each sphere is independent from each other in dependencies and only depends on lower spheres
+        sweep = multiworld.get_sphere_sweep(keep_states=True)
+        state_cache: List[CollectionState] = []
+        collection_spheres: List[Set[Location]] = []
+        for step, state in zip(sweep.steps, sweep.states):
+            sphere = {location for location in step if location.advancement}
+            if sphere:
+                collection_spheres.append(sphere)
+                state_cache.append(state)
+                logging.debug('Calculated sphere %i, containing %i of %i progress items.', len(collection_spheres),
+                              len(sphere), len(prog_locations))
+
+        unreachables = {location for location in sweep.unreachable if location.advancement}
+        if unreachables:
+            logging.debug('The following items could not be reached: %s', ['%s (Player %d) at %s (Player %d)' % (
+                location.item.name, location.item.player, location.name, location.player) for location in
+                                                                           unreachables])
+            if not multiworld.has_beaten_game(sweep.state):
+                raise RuntimeError("During playthrough generation, the game was determined to be unbeatable. "
+                                   "Something went terribly wrong here. "
+                                   f"Unreachable progression items: {unreachables}")
+            else:
+                self.unreachables = unreachables
 
         # in the second phase, we cull each sphere such that the game is still beatable,
         # reducing each range of influence to the bare minimum required inside it
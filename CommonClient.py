@@ -25,6 +25,7 @@ from MultiServer import CommandProcessor, mark_raw
 from NetUtils import (Endpoint, decode, NetworkItem, encode, JSONtoTextParser, ClientStatus, Permission, NetworkSlot,
                       RawJSONtoTextParser, add_json_text, add_json_location, add_json_item, JSONTypes, HintStatus, SlotType)
 from Utils import Version, stream_input, async_start
+from DataPackageTables import NameToIdTable
 from worlds import network_data_package, AutoWorldRegister
 import os
 import ssl
@@ -283,10 +284,16 @@ class CommonContext:
 
             return self.lookup_in_game(code, self.ctx.slot_info[slot].game)
 
-        def update_game(self, game: str, name_to_id_lookup_table: typing.Dict[str, int]) -> None:
+        def update_game(self, game: str, name_to_id_lookup_table: typing.Mapping[str, int]) -> None:
             """Overrides existing lookup tables for a particular game."""
-            id_to_name_lookup_table = Utils.KeyedDefaultDict(self._unknown_item)
-            id_to_name_lookup_table.update({code: name for name, code in name_to_id_lookup_table.items()})
+            id_to_name_lookup_table: typing.MutableMapping[int, str]
+            if isinstance(name_to_id_lookup_table, NameToIdTable):
+                # packages from the binary cache only decode the names that actually get looked up
+                id_to_name_lookup_table = collections.ChainMap(
+                    {}, name_to_id_lookup_table.id_to_name, Utils.KeyedDefaultDict(self._unknown_item))
+            else:
+                id_to_name_lookup_table = Utils.KeyedDefaultDict(self._unknown_item)
+                id_to_name_lookup_table.update({code: name for name, code in name_to_id_lookup_table.items()})
             self._game_store[game] = collections.ChainMap(self._archipelago_lookup, id_to_name_lookup_table)
             if game == "Archipelago":
                 # Keep track of the Archipelago data package separately so if it gets updated in a custom datapackage,
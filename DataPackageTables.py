@@ -0,0 +1,176 @@
+"""
+Compact binary form of data packages, shared by the client data package cache and the WebHost static server data.
+
+The item and location name <-> id tables of a game are stored as an id sorted array, a UTF-8 string table and a name
+sorted permutation of the entries. Files holding them are memory-mapped, so loading a game only reads its small
+header, and names are only decoded once they are looked up.
+"""
+from __future__ import annotations
+
+import array
+import bisect
+import itertools
+import json
+import mmap
+import os
+import struct
+import typing
+from collections.abc import Mapping
+
+__all__ = ["NameToIdTable", "IdToNameTable", "align", "pack_table", "write_game_package", "load_game_package"]
+
+_MAGIC = b"APGAMEDP"
+_VERSION = 1
+_header = struct.Struct("<8sII")
+table_keys = ("item_name_to_id", "location_name_to_id")
+"""Keys of a game package that hold name -> id tables."""
+
+
+def align(size: int) -> int:
+    """Rounds size up to the alignment of the tables."""
+    return size + (-size % 8)
+
+
+class NameToIdTable(Mapping[str, int]):
+    """
+    Read-only name -> id lookup over a table in the mapped file.
+
+    Entries are stored sorted by id, together with a permutation sorting them by name, so lookups in either direction
+    are a binary search. The reverse lookup is available as `id_to_name`.
+    """
+    __slots__ = ("_ids", "_name_offsets", "_name_order", "_names", "id_to_name")
+
+    def __init__(self, buffer: memoryview, offset: int, count: int, names_size: int) -> None:
+        ids_end = offset + 8 * count
+        name_offsets_end = ids_end + 4 * (count + 1)
+        name_order_end = name_offsets_end + 4 * count
+        self._ids = buffer[offset:ids_end].cast("q")
+        self._name_offsets = buffer[ids_end:name_offsets_end].cast("I")
+        self._name_order = buffer[name_offsets_end:name_order_end].cast("I")
+        self._names = buffer[name_order_end:name_order_end + names_size]
+        self.id_to_name = IdToNameTable(self)
+
+    def _name(self, index: int) -> str:
+        return str(self._names[self._name_offsets[index]:self._name_offsets[index + 1]], "utf-8")
+
+    def _index_of_id(self, code: typing.Any) -> int:
+        if not isinstance(code, int):
+            return -1
+        index = bisect.bisect_left(self._ids, code)
+        return index if index < len(self._ids) and self._ids[index] == code else -1
+
+    def _index_of_name(self, name: typing.Any) -> int:
+        if not isinstance(name, str):
+            return -1
+        position = bisect.bisect_left(self._name_order, name, key=self._name)
+        if position < len(self._name_order):
+            index = self._name_order[position]
+            if self._name(index) == name:
+                return index
+        return -1
+
+    def __getitem__(self, name: str) -> int:
+        index = self._index_of_name(name)
+        if index < 0:
+            raise KeyError(name)
+        return self._ids[index]
+
+    def __contains__(self, name: object) -> bool:
+        return self._index_of_name(name) >= 0
+
+    def __iter__(self) -> typing.Iterator[str]:
+        return map(self._name, range(len(self._ids)))
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def to_dict(self) -> typing.Dict[str, int]:
+        """Decodes the whole table, for sending it to clients."""
+        return {self._name(index): code for index, code in enumerate(self._ids)}
+
+
+class IdToNameTable(Mapping[int, str]):
+    """Read-only id -> name lookup, sharing the table of a NameToIdTable."""
+    __slots__ = ("_table",)
+
+    def __init__(self, table: NameToIdTable) -> None:
+        self._table = table
+
+    def __getitem__(self, code: int) -> str:
+        index = self._table._index_of_id(code)
+        if index < 0:
+            raise KeyError(code)
+        return self._table._name(index)
+
+    def __contains__(self, code: object) -> bool:
+        return self._table._index_of_id(code) >= 0
+
+    def __iter__(self) -> typing.Iterator[int]:
+        return iter(self._table._ids)
+
+    def __len__(self) -> int:
+        return len(self._table._ids)
+
+
+def pack_table(tables: bytearray, name_to_id: typing.Mapping[str, int]) -> typing.Tuple[int, int, int]:
+    """
+    Appends a name -> id table to tables, padded to 8 bytes.
+
+    :return: The offset, entry count and size of the string table, to construct a NameToIdTable from.
+    """
+    entries = sorted(name_to_id.items(), key=lambda entry: entry[1])
+    names = [name.encode("utf-8") for name, _ in entries]
+    name_order = sorted(range(len(entries)), key=lambda index: entries[index][0])
+    name_offsets = list(itertools.accumulate(map(len, names), initial=0))
+
+    offset = len(tables)
+    tables += array.array("q", [code for _, code in entries]).tobytes()
+    tables += array.array("I", name_offsets).tobytes()
+    tables += array.array("I", name_order).tobytes()
+    tables += b"".join(names)
+    tables += bytes(align(len(tables)) - len(tables))
+    return offset, len(entries), name_offsets[-1]
+
+
+def write_game_package(path: str, game_package: typing.Mapping[str, typing.Any]) -> None:
+    """
+    Writes the data package of one game to path, with its name <-> id tables packed into sorted arrays.
+    All other entries of the package have to be JSON serializable.
+
+    :param path: The file to (atomically) replace.
+    :param game_package: The data package of the game, as sent by the server.
+    """
+    tables = bytearray()
+    index = {key: pack_table(tables, value) if key in table_keys else value for key, value in game_package.items()}
+    encoded_index = json.dumps(index, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    header_size = _header.size + len(encoded_index)
+
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(_header.pack(_MAGIC, _VERSION, len(encoded_index)))
+            f.write(encoded_index)
+            f.write(bytes(align(header_size) - header_size))
+            f.write(tables)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def load_game_package(path: str) -> typing.Dict[str, typing.Any]:
+    """
+    Maps a file written by write_game_package. The returned package holds NameToIdTables, which are backed by the
+    mapping, in place of the name to id dicts.
+    """
+    with open(path, "rb") as f:
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, index_size = _header.unpack_from(data)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError(f"{path} is not a data package file of version {_VERSION}.")
+    game_package = json.loads(data[_header.size:_header.size + index_size].decode("utf-8"))
+    buffer = memoryview(data)[align(_header.size + index_size):]
+    for key in table_keys:
+        if key in game_package:
+            game_package[key] = NameToIdTable(buffer, *game_package[key])
+    return game_package
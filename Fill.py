@@ -4,7 +4,7 @@ import logging
 import typing
 from collections import Counter, deque
 
-from BaseClasses import CollectionState, Item, Location, LocationProgressType, MultiWorld, PlandoItemBlock
+from BaseClasses import CollectionState, Item, Location, LocationProgressType, MultiWorld, PlandoItemBlock, Region
 from Options import Accessibility
 
 from worlds.AutoWorld import call_all
@@ -33,11 +33,153 @@ def sweep_from_pool(base_state: CollectionState, itempool: typing.Sequence[Item]
     return new_state
 
 
+class IncrementalSweep:
+    """
+    Maximum exploration state for an item pool that shrinks as items get placed.
+
+    Instead of sweeping from scratch, every update replays the spheres found by the previous sweep, checking each of
+    their locations once in the order they were collected, and only leaves the locations that are no longer reachable
+    or whose item was swapped out to a final sweep.
+
+    For players tracking rule dependencies, see World.track_rule_dependencies, the final sweep only checks a location
+    that could not be reached again once an item or Region its rules read changed. Across updates, a location that
+    could not be reached at the end of the previous sweep only has to be checked once the new state has more of
+    something it read than the previous state had.
+    """
+    base_state: CollectionState
+    state: CollectionState
+    spheres: typing.List[typing.List[typing.Tuple[Location, Item]]]
+    """locations collected by each sweep step, with the item they held when they were collected"""
+    blocked: typing.Set[Location]
+    """locations of players tracking rule dependencies that could not be reached at the end of the last sweep"""
+
+    def __init__(self, base_state: CollectionState, itempool: typing.Sequence[Item] = tuple(),
+                 locations: typing.Optional[typing.List[Location]] = None) -> None:
+        self.base_state = base_state
+        self.spheres = []
+        self.blocked = set()
+        self.state = self._sweep(sweep_from_pool(base_state, itempool, []), locations)
+
+    def _sweep(self, state: CollectionState, locations: typing.Optional[typing.List[Location]],
+               previous_state: typing.Optional[CollectionState] = None) -> CollectionState:
+        multiworld = state.multiworld
+        if locations is None:
+            locations = multiworld.get_filled_locations()
+        pending: typing.List[Location] = []
+        waiting: typing.Set[Location] = set()
+        for location in locations:
+            if location.advancement and location not in state.advancements:
+                if location in self.blocked:
+                    waiting.add(location)
+                else:
+                    pending.append(location)
+        tracked_players = {location.player for location in itertools.chain(pending, waiting)
+                           if state.tracks_rule_dependencies(location.player)}
+        if previous_state is not None:
+            for player in {location.player for location in waiting}:
+                pending += self._wake(waiting, player, self._increases(previous_state, state, player))
+
+        changes: typing.Dict[int, typing.Set[typing.Union[str, Region]]] = {}
+        for player in tracked_players:
+            # also sets up the containers that record what changes
+            state.update_reachable_regions(player)
+            changes[player] = state.prog_items[player].watch = state.reachable_regions[player].watch = set()
+        try:
+            while pending:
+                reachable: typing.List[Location] = []
+                unreachable: typing.List[Location] = []
+                for location in pending:
+                    if location.player in tracked_players:
+                        if state.can_reach_recording_dependencies(location):
+                            reachable.append(location)
+                        else:
+                            waiting.add(location)
+                    elif location.can_reach(state):
+                        reachable.append(location)
+                    else:
+                        unreachable.append(location)
+                if not reachable:
+                    break
+                for location in reachable:
+                    state.advancements.add(location)
+                    state.collect(location.item, True, location)
+                self.spheres.append([(location, location.item) for location in sorted(reachable)])
+
+                # untracked locations get checked every step, tracked ones once something they read changed
+                pending = unreachable
+                for player, changed in changes.items():
+                    if changed:
+                        # reaching new Regions adds them to the changes as well
+                        state.update_reachable_regions(player)
+                        pending += self._wake(waiting, player, changed)
+                        changed.clear()
+        finally:
+            for player in changes:
+                state.prog_items[player].watch = state.reachable_regions[player].watch = None
+        self.blocked = waiting
+        return state
+
+    def _wake(self, waiting: typing.Set[Location], player: int,
+              changed: typing.Iterable[typing.Union[str, Region]]) -> typing.List[Location]:
+        """Take the waiting locations whose rules read something that changed out of waiting."""
+        dependencies = self.base_state.multiworld.rule_dependencies.get(player, {})
+        woken: typing.List[Location] = []
+        for read in changed:
+            for dependent in dependencies.get(read, ()):
+                if dependent in waiting:
+                    waiting.remove(dependent)
+                    woken.append(dependent)
+        return woken
+
+    @staticmethod
+    def _increases(previous_state: CollectionState, state: CollectionState,
+                   player: int) -> typing.Set[typing.Union[str, Region]]:
+        """The items and Regions of a player that state has more of than previous_state."""
+        previous_items = previous_state.prog_items[player]
+        increases: typing.Set[typing.Union[str, Region]] = \
+            {item_name for item_name, count in state.prog_items[player].items() if count > previous_items[item_name]}
+        for region_state in (previous_state, state):
+            if region_state.stale[player]:
+                region_state.update_reachable_regions(player)
+        increases.update(region for region in state.reachable_regions[player]
+                         if not set.__contains__(previous_state.reachable_regions[player], region))
+        return increases
+
+    def update(self, itempool: typing.Sequence[Item] = tuple(),
+               locations: typing.Optional[typing.List[Location]] = None) -> CollectionState:
+        """
+        Sweep again for a changed item pool.
+
+        :param itempool: The items that are assumed to be collected.
+        :param locations: The locations to sweep through, defaulting to all locations in the multiworld.
+        :return: The new maximum exploration state.
+        """
+        # Items are not removed from the previous state, as collecting and removing are not inverse for all worlds.
+        state = sweep_from_pool(self.base_state, itempool, [])
+        sweep_locations = None if locations is None else set(locations)
+        previous_spheres = self.spheres
+        self.spheres = []
+        for sphere in previous_spheres:
+            # like in the sweep, the whole sphere is checked for reachability before collecting any of its items
+            # a swap may have replaced the item of a location since, which then is left to the final sweep
+            reachable_locations = [(location, item) for location, item in sphere
+                                   if location.item is item and location.advancement
+                                   and (sweep_locations is None or location in sweep_locations)
+                                   and location.can_reach(state)]
+            for location, item in reachable_locations:
+                state.advancements.add(location)
+                state.collect(item, True, location)
+            if reachable_locations:
+                self.spheres.append(reachable_locations)
+        self.state = self._sweep(state, locations, self.state)
+        return self.state
+
+
 def fill_restrictive(multiworld: MultiWorld, base_state: CollectionState, locations: typing.List[Location],
                      item_pool: typing.List[Item], single_player_placement: bool = False, lock: bool = False,
                      swap: bool = True, on_place: typing.Optional[typing.Callable[[Location], None]] = None,
                      allow_partial: bool = False, allow_excluded: bool = False, one_item_per_player: bool = True,
-                     name: str = "Unknown") -> None:
+                     name: str = "Unknown", incremental_sweep: bool = False) -> None:
     """
     :param multiworld: Multiworld to be filled.
     :param base_state: State assumed before fill.
@@ -50,6 +192,8 @@ def fill_restrictive(multiworld: MultiWorld, base_state: CollectionState, locati
     :param allow_partial: only place what is possible. Remaining items will be in the item_pool list.
     :param allow_excluded: if true and placement fails, it is re-attempted while ignoring excluded on Locations
     :param name: name of this fill step for progress logging purposes
+    :param incremental_sweep: if true, each placement round replays the spheres found in the previous one, instead of
+    sweeping from base_state from scratch
     """
     unplaced_items: typing.List[Item] = []
     placements: typing.List[Location] = []
@@ -58,12 +202,14 @@ def fill_restrictive(multiworld: MultiWorld, base_state: CollectionState, locati
     reachable_items: typing.Dict[int, typing.Deque[Item]] = {}
     for item in item_pool:
         reachable_items.setdefault(item.player, deque()).append(item)
+    exploration: typing.Optional[IncrementalSweep] = None
 
     # for progress logging
     total = min(len(item_pool), len(locations))
     placed = 0
 
     while any(reachable_items.values()) and locations:
+        multiworld.generation_control.set_progress(placed, total)
         if one_item_per_player:
             # grab one item per player
             items_to_place = [items.pop()
@@ -82,9 +228,14 @@ def fill_restrictive(multiworld: MultiWorld, base_state: CollectionState, locati
                     del item_pool[-p]
                     break
 
-        maximum_exploration_state = sweep_from_pool(
-            base_state, item_pool + unplaced_items, multiworld.get_filled_locations(item.player)
-            if single_player_placement else None)
+        sweep_locations = multiworld.get_filled_locations(item.player) if single_player_placement else None
+        if not incremental_sweep:
+            maximum_exploration_state = sweep_from_pool(base_state, item_pool + unplaced_items, sweep_locations)
+        elif exploration is None:
+            exploration = IncrementalSweep(base_state, item_pool + unplaced_items, sweep_locations)
+            maximum_exploration_state = exploration.state
+        else:
+            maximum_exploration_state = exploration.update(item_pool + unplaced_items, sweep_locations)
 
         has_beaten_game = multiworld.has_beaten_game(maximum_exploration_state)
 
@@ -231,7 +382,7 @@ def fill_restrictive(multiworld: MultiWorld, base_state: CollectionState, locati
             for location in excluded_locations:
                 location.progress_type = location.progress_type.DEFAULT
             fill_restrictive(multiworld, base_state, excluded_locations, unplaced_items, single_player_placement, lock,
-                             swap, on_place, allow_partial, False)
+                             swap, on_place, allow_partial, False, incremental_sweep=incremental_sweep)
             for location in excluded_locations:
                 if not location.item:
                     location.progress_type = location.progress_type.EXCLUDED
@@ -277,6 +428,7 @@ def remaining_fill(multiworld: MultiWorld,
             return location_to_fill.item_rule(item_to_fill)
 
     while locations and itempool:
+        multiworld.generation_control.set_progress(placed, total)
         item_to_place = itempool.pop()
         spot_to_fill: typing.Optional[Location] = None
 
@@ -486,7 +638,8 @@ def distribute_early_items(multiworld: MultiWorld,
 
 
 def distribute_items_restrictive(multiworld: MultiWorld,
-                                 panic_method: typing.Literal["swap", "raise", "start_inventory"] = "swap") -> None:
+                                 panic_method: typing.Literal["swap", "raise", "start_inventory"] = "swap",
+                                 incremental_sweep: bool = False) -> None:
     assert all(item.location is None for item in multiworld.itempool), (
         "At the start of distribute_items_restrictive, "
         "there are items in the multiworld itempool that are already placed on locations:\n"
@@ -548,7 +701,8 @@ def distribute_items_restrictive(multiworld: MultiWorld,
         priority_fill_state = sweep_from_pool(multiworld.state, deprioritized_progression)
         fill_restrictive(multiworld, priority_fill_state, prioritylocations, regular_progression,
                          single_player_placement=single_player, swap=False, on_place=mark_for_locking,
-                         name="Priority", one_item_per_player=True, allow_partial=True)
+                         name="Priority", one_item_per_player=True, allow_partial=True,
+                         incremental_sweep=incremental_sweep)
 
         if prioritylocations and regular_progression:
             # retry with one_item_per_player off because some priority fills can fail to fill with that optimization
@@ -558,7 +712,7 @@ def distribute_items_restrictive(multiworld: MultiWorld,
             fill_restrictive(multiworld, priority_retry_state, prioritylocations, regular_progression,
                              single_player_placement=single_player, swap=False, on_place=mark_for_locking,
                              name="Priority Retry", one_item_per_player=False,
-                             allow_partial=bool(deprioritized_progression))
+                             allow_partial=bool(deprioritized_progression), incremental_sweep=incremental_sweep)
 
         if prioritylocations and deprioritized_progression:
             # There are no more regular progression items that can be placed on any priority locations.
@@ -567,7 +721,8 @@ def distribute_items_restrictive(multiworld: MultiWorld,
             priority_retry_2_state = sweep_from_pool(multiworld.state, regular_progression)
             fill_restrictive(multiworld, priority_retry_2_state, prioritylocations, deprioritized_progression,
                              single_player_placement=single_player, swap=False, on_place=mark_for_locking,
-                             name="Priority Retry 2", one_item_per_player=True, allow_partial=True)
+                             name="Priority Retry 2", one_item_per_player=True, allow_partial=True,
+                             incremental_sweep=incremental_sweep)
 
         if prioritylocations and deprioritized_progression:
             # retry with deprioritized items AND without one_item_per_player optimisation
@@ -575,7 +730,7 @@ def distribute_items_restrictive(multiworld: MultiWorld,
             priority_retry_3_state = sweep_from_pool(multiworld.state, regular_progression)
             fill_restrictive(multiworld, priority_retry_3_state, prioritylocations, deprioritized_progression,
                              single_player_placement=single_player, swap=False, on_place=mark_for_locking,
-                             name="Priority Retry 3", one_item_per_player=False)
+                             name="Priority Retry 3", one_item_per_player=False, incremental_sweep=incremental_sweep)
 
         # restore original order of progitempool
         progitempool[:] = [item for item in progitempool if not item.location]
@@ -587,13 +742,16 @@ def distribute_items_restrictive(multiworld: MultiWorld,
         maximum_exploration_state = sweep_from_pool(multiworld.state)
         if panic_method == "swap":
             fill_restrictive(multiworld, maximum_exploration_state, defaultlocations, progitempool, swap=True,
-                             name="Progression", single_player_placement=single_player)
+                             name="Progression", single_player_placement=single_player,
+                             incremental_sweep=incremental_sweep)
         elif panic_method == "raise":
             fill_restrictive(multiworld, maximum_exploration_state, defaultlocations, progitempool, swap=False,
-                             name="Progression", single_player_placement=single_player)
+                             name="Progression", single_player_placement=single_player,
+                             incremental_sweep=incremental_sweep)
         elif panic_method == "start_inventory":
             fill_restrictive(multiworld, maximum_exploration_state, defaultlocations, progitempool, swap=False,
-                             allow_partial=True, name="Progression", single_player_placement=single_player)
+                             allow_partial=True, name="Progression", single_player_placement=single_player,
+                             incremental_sweep=incremental_sweep)
             if progitempool:
                 for item in progitempool:
                     logging.debug(f"Moved {item} to start_inventory to prevent fill failure.")
@@ -680,6 +838,7 @@ def flood_items(multiworld: MultiWorld) -> None:
 
     # fill multiworld from top of itempool while we can
     while not progress_done:
+        multiworld.generation_control.check()
         location_list = multiworld.get_unfilled_locations()
         multiworld.random.shuffle(location_list)
         spot_to_fill = None
@@ -781,6 +940,7 @@ def balance_multiworld_progression(multiworld: MultiWorld) -> None:
             return
 
         while True:
+            multiworld.generation_control.check()
             # Gather non-locked locations.
             # This ensures that only shuffled locations get counted for progression balancing,
             #   i.e. the items the players will be checking.
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
 import argparse
+import concurrent.futures
 import copy
+import hashlib
 import logging
+import multiprocessing
 import os
+import pickle
 import random
 import string
 import sys
@@ -54,6 +58,10 @@ def mystery_argparse(argv: list[str] | None = None):
     parser.add_argument("--skip_output", action="store_true",
                         help="Skips generation assertion and output stages and skips multidata and spoiler output. "
                              "Intended for debugging and testing purposes.")
+    parser.add_argument("--roll_processes", type=int, default=defaults.roll_processes,
+                        help="Amount of processes to read player files and roll their options in.")
+    parser.add_argument("--cache_player_files", action="store_true", default=defaults.cache_player_files,
+                        help="Reuse player files parsed by earlier runs if their content did not change.")
     parser.add_argument("--spoiler_only", action="store_true",
                         help="Skips generation assertion and multidata, outputting only a spoiler log. "
                              "Intended for debugging and testing purposes.")
@@ -122,26 +130,37 @@ def main(args=None) -> tuple[argparse.Namespace, int]:
     player_id: int = 1
     player_files: dict[int, str] = {}
     player_errors: list[str] = []
+    player_file_paths: dict[str, str] = {}
     for file in os.scandir(args.player_files_path):
         fname = file.name
         if file.is_file() and not fname.startswith(".") and not fname.lower().endswith(".ini") and \
                 os.path.join(args.player_files_path, fname) not in {args.meta_file_path, args.weights_file_path}:
-            path = os.path.join(args.player_files_path, fname)
-            try:
-                weights_for_file = []
-                for doc_idx, yaml in enumerate(read_weights_yamls(path)):
-                    if yaml is None:
-                        logging.warning(f"Ignoring empty yaml document #{doc_idx + 1} in {fname}")
-                    else:
-                        weights_for_file.append(yaml)
-                weights_cache[fname] = tuple(weights_for_file)
-                        
-            except Exception as e:
-                logging.exception(f"Exception reading weights in file {fname}")
-                player_errors.append(
-                    f"{len(player_errors) + 1}. "
-                    f"File {fname} is invalid. Please fix your yaml.\n{Utils.get_all_causes(e)}"
-                )
+            player_file_paths[fname] = os.path.join(args.player_files_path, fname)
+
+    read_futures: dict[str, concurrent.futures.Future[tuple[Any, ...]]] = {}
+    if args.roll_processes:
+        with concurrent.futures.ProcessPoolExecutor(args.roll_processes, multiprocessing.get_context("spawn")) as pool:
+            for fname, path in player_file_paths.items():
+                read_futures[fname] = pool.submit(_read_weights_yamls_job, path, args.cache_player_files)
+
+    for fname, path in player_file_paths.items():
+        try:
+            weights_for_file = []
+            yamls = read_futures[fname].result() if fname in read_futures \
+                else read_weights_yamls(path, args.cache_player_files)
+            for doc_idx, yaml in enumerate(yamls):
+                if yaml is None:
+                    logging.warning(f"Ignoring empty yaml document #{doc_idx + 1} in {fname}")
+                else:
+                    weights_for_file.append(yaml)
+            weights_cache[fname] = tuple(weights_for_file)
+                    
+        except Exception as e:
+            logging.exception(f"Exception reading weights in file {fname}")
+            player_errors.append(
+                f"{len(player_errors) + 1}. "
+                f"File {fname} is invalid. Please fix your yaml.\n{get_error_causes(e)}"
+            )
 
     # sort dict for consistent results across platforms:
     weights_cache = {key: value for key, value in sorted(weights_cache.items(), key=lambda k: k[0].casefold())}
@@ -177,6 +196,10 @@ def main(args=None) -> tuple[argparse.Namespace, int]:
                         f"Provide a general weights file ({args.weights_file_path}) or individual player files. "
                         f"A mix is also permitted.")
 
+    if "worlds" not in sys.modules:
+        import WorldIndex
+        # only import the worlds that can be rolled, instead of every installed world
+        WorldIndex.restrict_world_loading(get_weighted_games(weights_cache, meta_weights))
     from worlds.AutoWorld import AutoWorldRegister
     args.outputname = seed_name
     args.sprite = dict.fromkeys(range(1, args.multi+1), None)
@@ -205,16 +228,51 @@ def main(args=None) -> tuple[argparse.Namespace, int]:
                             else:
                                 yaml[category_name][key] = option
 
+    player_path_cache: dict[int, str] = {}
+    for player in range(1, args.multi + 1):
+        player_path_cache[player] = player_files.get(player, args.weights_file_path)
+
+    # rolled up front in a process pool, with a random stream per file or player drawn from the seeded one
+    roll_futures: dict[tuple[str, int] | int, concurrent.futures.Future[argparse.Namespace]] = {}
+    if args.roll_processes:
+        games = get_weighted_games(weights_cache, meta_weights)
+        with concurrent.futures.ProcessPoolExecutor(args.roll_processes, multiprocessing.get_context("spawn")) as pool:
+            if args.sameoptions:
+                for fname, yamls in weights_cache.items():
+                    for doc_index, yaml in enumerate(yamls):
+                        roll_futures[fname, doc_index] = pool.submit(
+                            _roll_settings_job, yaml, args.plando, random.getrandbits(64), games)
+            else:
+                # same assignment of yaml documents to players as when applying the settings below
+                player = 1
+                while player <= args.multi:
+                    path = player_path_cache[player]
+                    if not path:
+                        player += 1
+                        continue
+                    if path not in weights_cache:
+                        break  # reported when applying the settings
+                    for yaml in weights_cache[path]:
+                        roll_futures[player] = pool.submit(
+                            _roll_settings_job, yaml, args.plando, random.getrandbits(64), games)
+                        player += 1
+
+    def get_rolled_settings(roll_key: tuple[str, int] | int, yaml: dict) -> argparse.Namespace:
+        if roll_key in roll_futures:
+            return roll_futures[roll_key].result()
+        return roll_settings(yaml, args.plando)
+
     settings_cache: dict[str, tuple[argparse.Namespace, ...]] = {fname: None for fname in weights_cache}
     if args.sameoptions:
         for fname, yamls in weights_cache.items():
             try:
-                settings_cache[fname] = tuple(roll_settings(yaml, args.plando) for yaml in yamls)
+                settings_cache[fname] = tuple(get_rolled_settings((fname, doc_index), yaml)
+                                              for doc_index, yaml in enumerate(yamls))
             except Exception as e:
                 logging.exception(f"Exception reading settings in file {fname}")
                 player_errors.append(
                     f"{len(player_errors) + 1}. "
-                    f"File {fname} is invalid. Please fix your yaml.\n{Utils.get_all_causes(e)}"
+                    f"File {fname} is invalid. Please fix your yaml.\n{get_error_causes(e)}"
                 )
         # Exit early here to avoid throwing the same errors again later
         if player_errors:
@@ -222,9 +280,6 @@ def main(args=None) -> tuple[argparse.Namespace, int]:
             raise ValueError(f"Encountered {len(player_errors)} error(s) in player files. "
                              f"See logs for full tracebacks.\n\n{errors}")
 
-    player_path_cache: dict[int, str] = {}
-    for player in range(1, args.multi + 1):
-        player_path_cache[player] = player_files.get(player, args.weights_file_path)
     name_counter = Counter()
     args.player_options = {}
 
@@ -244,7 +299,7 @@ def main(args=None) -> tuple[argparse.Namespace, int]:
                 settingsObject: argparse.Namespace = (
                     settings_cache[path][doc_index]
                     if settings_cache[path]
-                    else roll_settings(yaml, args.plando)
+                    else get_rolled_settings(player, yaml)
                 )
                 
                 for k, v in vars(settingsObject).items():
@@ -272,7 +327,7 @@ def main(args=None) -> tuple[argparse.Namespace, int]:
                 player_errors.append(
                     f"{len(player_errors) + 1}. "
                     f"File {path} document #{doc_index + 1} (name: {args.name.get(player, name)}) is invalid. "
-                    f"Please fix your yaml.\n{Utils.get_all_causes(e)}")
+                    f"Please fix your yaml.\n{get_error_causes(e)}")
 
             # increment for each yaml document in the file
             player += 1
@@ -291,19 +346,53 @@ def main(args=None) -> tuple[argparse.Namespace, int]:
     return args, seed
 
 
-def read_weights_yamls(path) -> tuple[Any, ...]:
+def get_weighted_games(weights_cache: dict[str, tuple[Any, ...]], meta_weights: dict | None) -> set[str]:
+    """Names of all games the weights could roll, plus any other top level keys, which are game sections or options."""
+    games: set[str] = set(meta_weights or ())
+    for yamls in weights_cache.values():
+        for yaml in yamls:
+            if not isinstance(yaml, dict):
+                continue
+            games.update(yaml)
+            game = yaml.get("game")
+            if isinstance(game, str):
+                games.add(game)
+            elif isinstance(game, dict):
+                games.update(game)
+    return games
+
+
+def read_weights_yamls(path, cache: bool = False) -> tuple[Any, ...]:
+    """
+    Reads all yaml documents of a weights file.
+
+    :param cache: Keep the parsed documents in the cache directory, keyed by a hash of the file's content, and reuse
+        them if a file with the same content is read again.
+    """
     try:
         if urllib.parse.urlparse(path).scheme in ('https', 'file'):
-            yaml = str(urllib.request.urlopen(path).read(), "utf-8-sig")
+            data = urllib.request.urlopen(path).read()
         else:
             with open(path, 'rb') as f:
-                yaml = str(f.read(), "utf-8-sig")
+                data = f.read()
+        yaml = str(data, "utf-8-sig")
     except Exception as e:
         raise Exception(f"Failed to read weights ({path})") from e
 
+    cache_file = ""
+    if cache:
+        digest = hashlib.sha256(f"{__version__};".encode() + data).hexdigest()
+        cache_file = Utils.cache_path("weights", f"{digest}.pickle")
+        if os.path.exists(cache_file):
+            try:
+                with open(cache_file, "rb") as f:
+                    return pickle.load(f)
+            except Exception as e:
+                logging.debug(f"Could not load parsed weights {cache_file}: {e}")
+
     from yaml.error import MarkedYAMLError
     try:
-        return tuple(parse_yamls(yaml))
+        yamls = tuple(parse_yamls(yaml))
     except MarkedYAMLError as ex:
         if ex.problem_mark:
             lines = yaml.splitlines()
@@ -316,6 +405,51 @@ def read_weights_yamls(path) -> tuple[Any, ...]:
                             f"\n{relevant_lines}\n{error_line}")
         raise ex
 
+    if cache_file:
+        try:
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            temp_path = f"{cache_file}.{os.getpid()}.tmp"
+            with open(temp_path, "wb") as f:
+                pickle.dump(yamls, f, pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, cache_file)
+        except Exception as e:
+            logging.debug(f"Could not store parsed weights {cache_file}: {e}")
+    return yamls
+
+
+class PlayerFileError(Exception):
+    """Raised from a worker process reading or rolling a player file, describing the causes of the original error."""
+
+    def __init__(self, causes: str) -> None:
+        super().__init__(causes)
+        self.causes = causes
+
+
+def get_error_causes(ex: Exception) -> str:
+    """Utils.get_all_causes, but for errors from worker processes it describes the error raised in the worker."""
+    if isinstance(ex, PlayerFileError):
+        return ex.causes
+    return Utils.get_all_causes(ex)
+
+
+def _read_weights_yamls_job(path: str, cache: bool) -> tuple[Any, ...]:
+    try:
+        return read_weights_yamls(path, cache)
+    except Exception as e:
+        # the causes of an exception get lost on its way back from the worker process
+        raise PlayerFileError(Utils.get_all_causes(e)) from e
+
+
+def _roll_settings_job(weights: dict, plando_options: PlandoOptions, random_seed: int,
+                       games: set[str]) -> argparse.Namespace:
+    import WorldIndex
+    WorldIndex.restrict_world_loading(games)
+    random.seed(random_seed)
+    try:
+        return roll_settings(weights, plando_options)
+    except Exception as e:
+        raise PlayerFileError(Utils.get_all_causes(e)) from e
+
 
 def interpret_on_off(value) -> bool:
     return {"on": True, "off": False}.get(value, value)
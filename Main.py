@@ -1,7 +1,10 @@
+import abc
 import collections
 from collections.abc import Mapping
 import concurrent.futures
+import contextlib
 import logging
+import multiprocessing
 import os
 import tempfile
 import time
@@ -15,15 +18,61 @@ from Fill import FillError, balance_multiworld_progression, distribute_items_res
     parse_planned_blocks, distribute_planned_blocks, resolve_early_locations_for_planned
 from NetUtils import convert_to_base_types
 from Options import StartInventoryPool
-from Utils import __version__, output_path, restricted_dumps, version_tuple
+from Utils import GenerationControl, __version__, output_path, restricted_dumps, version_tuple
 from settings import get_settings
+from WorldIndex import restrict_world_loading
 from worlds import AutoWorld
 from worlds.generic.Rules import exclusion_rules, locality_rules
 
-__all__ = ["main"]
+__all__ = ["main", "OutputSink", "ZipOutputSink"]
 
 
-def main(args, seed=None, baked_server_options: dict[str, object] | None = None):
+class OutputSink(abc.ABC):
+    """Receives the output files of a generation, once all of them are done."""
+
+    @abc.abstractmethod
+    def add_data(self, name: str, data: bytes) -> None:
+        """Adds a file that only exists in memory."""
+
+    def add_file(self, path: str) -> None:
+        """Adds a file that was written into the output directory."""
+        with open(path, "rb") as f:
+            self.add_data(os.path.basename(path), f.read())
+
+    def close(self) -> None:
+        """Called once all files were added."""
+
+
+class ZipOutputSink(OutputSink):
+    """Writes the output files into a zip archive, storing files that are zip archives themselves uncompressed."""
+
+    def __init__(self, path: str, compresslevel: int = 9) -> None:
+        """
+        :param path: Path of the archive to create.
+        :param compresslevel: Deflate level from 1 to 9, or 0 to store every file uncompressed.
+        """
+        self.path = path
+        self.zipfile = zipfile.ZipFile(path, mode="w", compression=zipfile.ZIP_DEFLATED if compresslevel else
+                                       zipfile.ZIP_STORED, compresslevel=compresslevel or None)
+
+    def add_data(self, name: str, data: bytes) -> None:
+        if data.startswith(b"PK\x03\x04"):
+            self.zipfile.writestr(name, data, compress_type=zipfile.ZIP_STORED)
+        else:
+            self.zipfile.writestr(name, data)
+
+    def add_file(self, path: str) -> None:
+        with open(path, "rb") as f:
+            is_zip = f.read(4) == b"PK\x03\x04"
+        self.zipfile.write(path, arcname=os.path.basename(path),
+                           compress_type=zipfile.ZIP_STORED if is_zip else None)
+
+    def close(self) -> None:
+        self.zipfile.close()
+
+
+def main(args, seed=None, baked_server_options: dict[str, object] | None = None,
+         control: GenerationControl | None = None, output_sink: OutputSink | None = None):
     if not baked_server_options:
         baked_server_options = get_settings().server_options.as_dict()
     assert isinstance(baked_server_options, dict)
@@ -34,6 +83,9 @@ def main(args, seed=None, baked_server_options: dict[str, object] | None = None)
     start = time.perf_counter()
     # initialize the multiworld
     multiworld = MultiWorld(args.multi)
+    if control:
+        multiworld.generation_control = control
+    control = multiworld.generation_control
 
     logger = logging.getLogger()
     multiworld.set_seed(seed, args.race, str(args.outputname) if args.outputname else None)
@@ -73,6 +125,7 @@ def main(args, seed=None, baked_server_options: dict[str, object] | None = None)
     if not args.skip_output and not args.spoiler_only:
         AutoWorld.call_stage(multiworld, "assert_generate")
 
+    control.set_stage("Generating early", 0, 5)
     AutoWorld.call_all(multiworld, "generate_early")
 
     logger.info('')
@@ -109,12 +162,15 @@ def main(args, seed=None, baked_server_options: dict[str, object] | None = None)
         multiworld.worlds[1].options.local_items.value = set()
 
     logger.info('Creating MultiWorld.')
+    control.set_stage("Creating regions", 5, 10)
     AutoWorld.call_all(multiworld, "create_regions")
 
     logger.info('Creating Items.')
+    control.set_stage("Creating items", 10, 15)
     AutoWorld.call_all(multiworld, "create_items")
 
     logger.info('Calculating Access Rules.')
+    control.set_stage("Setting rules", 15, 20)
     AutoWorld.call_all(multiworld, "set_rules")
 
     for player in multiworld.player_ids:
@@ -141,7 +197,9 @@ def main(args, seed=None, baked_server_options: dict[str, object] | None = None)
 
     multiworld.plando_item_blocks = parse_planned_blocks(multiworld)
 
+    control.set_stage("Connecting entrances", 20, 23)
     AutoWorld.call_all(multiworld, "connect_entrances")
+    control.set_stage("Generating basic", 23, 25)
     AutoWorld.call_all(multiworld, "generate_basic")
 
     # remove starting inventory from pool items.
@@ -185,23 +243,29 @@ def main(args, seed=None, baked_server_options: dict[str, object] | None = None)
         multiworld._all_state = None
 
     logger.info("Running Item Plando.")
+    control.set_stage("Placing planned items", 25, 27)
     resolve_early_locations_for_planned(multiworld)
     distribute_planned_blocks(multiworld, [x for player in multiworld.plando_item_blocks
                                            for x in multiworld.plando_item_blocks[player]])
 
     logger.info('Running Pre Main Fill.')
+    control.set_stage("Pre filling", 27, 30)
 
     AutoWorld.call_all(multiworld, "pre_fill")
 
     logger.info(f'Filling the multiworld with {len(multiworld.itempool)} items.')
+    control.set_stage("Filling", 30, 70)
 
     if multiworld.algorithm == 'flood':
         flood_items(multiworld)  # different algo, biased towards early game progress items
     elif multiworld.algorithm == 'balanced':
-        distribute_items_restrictive(multiworld, get_settings().generator.panic_method)
+        distribute_items_restrictive(multiworld, get_settings().generator.panic_method,
+                                     bool(get_settings().generator.incremental_sweep))
 
+    control.set_stage("Post filling", 70, 72)
     AutoWorld.call_all(multiworld, 'post_fill')
 
+    control.set_stage("Balancing progression", 72, 80)
     if multiworld.players > 1 and not args.skip_prog_balancing:
         balance_multiworld_progression(multiworld)
     else:
@@ -209,12 +273,16 @@ def main(args, seed=None, baked_server_options: dict[str, object] | None = None)
 
     # we're about to output using multithreading, so we're removing the global random state to prevent accidental use
     multiworld.random.passthrough = False
+    # item placement is final, so the accessibility check, multidata spheres and playthrough can share one sweep
+    multiworld.cache_spheres = True
+    multiworld.keep_sphere_states = args.spoiler > 1
 
     if args.skip_output:
         logger.info('Done. Skipped output/spoiler generation. Total Time: %s', time.perf_counter() - start)
         return multiworld
 
     logger.info(f'Beginning output...')
+    control.set_stage("Writing output", 80, 98)
     outfilebase = 'AP_' + multiworld.seed_name
 
     if args.spoiler_only:
@@ -230,7 +298,13 @@ def main(args, seed=None, baked_server_options: dict[str, object] | None = None)
     with output as temp_dir:
         output_players = [player for player in multiworld.player_ids if AutoWorld.World.generate_output.__code__
                           is not multiworld.worlds[player].generate_output.__code__]
-        with concurrent.futures.ThreadPoolExecutor(len(output_players) + 2) as pool:
+        output_job_players = [player for player in multiworld.player_ids if AutoWorld.World.get_output_job.__code__
+                              is not multiworld.worlds[player].get_output_job.__code__]
+        output_processes = min(get_settings().generator.output_processes, len(output_job_players))
+        with concurrent.futures.ThreadPoolExecutor(len(output_players) + len(output_job_players) + 2) as pool, \
+                (concurrent.futures.ProcessPoolExecutor(output_processes, multiprocessing.get_context("spawn"),
+                                                        restrict_world_loading, (set(multiworld.game.values()),))
+                 if output_processes else contextlib.nullcontext()) as output_process_pool:
             check_accessibility_task = pool.submit(multiworld.fulfills_accessibility)
 
             output_file_futures = [pool.submit(AutoWorld.call_stage, multiworld, "generate_output", temp_dir)]
@@ -238,6 +312,9 @@ def main(args, seed=None, baked_server_options: dict[str, object] | None = None)
                 # skip starting a thread for methods that say "pass".
                 output_file_futures.append(
                     pool.submit(AutoWorld.call_single, multiworld, "generate_output", player, temp_dir))
+            for player in output_job_players:
+                output_file_futures.append(
+                    pool.submit(AutoWorld.call_output_job, multiworld, player, temp_dir, output_process_pool))
 
             # collect ER hint info
             er_hint_data: dict[int, dict[int, str]] = {}
@@ -350,13 +427,11 @@ def main(args, seed=None, baked_server_options: dict[str, object] | None = None)
                 for key in ("slot_data", "er_hint_data"):
                     multidata[key] = convert_to_base_types(multidata[key])
 
-                serialized_multidata = zlib.compress(restricted_dumps(multidata), 9)
-
-                with open(os.path.join(temp_dir, f'{outfilebase}.archipelago'), 'wb') as f:
-                    f.write(bytes([3]))  # version of format
-                    f.write(serialized_multidata)
+                # version of format, followed by the multidata
+                return bytes([3]) + zlib.compress(restricted_dumps(multidata), 9)
 
-            output_file_futures.append(pool.submit(write_multidata))
+            multidata_task = pool.submit(write_multidata)
+            output_file_futures.append(multidata_task)
             if not check_accessibility_task.result():
                 if not multiworld.can_beat_game():
                     raise FillError("Game appears as unbeatable. Aborting.", multiworld=multiworld)
@@ -368,6 +443,7 @@ def main(args, seed=None, baked_server_options: dict[str, object] | None = None)
                 if i % 10 == 0 or i == len(output_file_futures):
                     logger.info(f'Generating output files ({i}/{len(output_file_futures)}).')
                 future.result()
+                control.set_progress(i, len(output_file_futures))
 
         if args.spoiler > 1:
             logger.info('Calculating playthrough.')
@@ -376,12 +452,17 @@ def main(args, seed=None, baked_server_options: dict[str, object] | None = None)
         if args.spoiler:
             multiworld.spoiler.to_file(os.path.join(temp_dir, '%s_Spoiler.txt' % outfilebase))
 
-        zipfilename = output_path(f"AP_{multiworld.seed_name}.zip")
-        logger.info(f"Creating final archive at {zipfilename}")
-        with zipfile.ZipFile(zipfilename, mode="w", compression=zipfile.ZIP_DEFLATED,
-                             compresslevel=9) as zf:
+        control.set_stage("Creating archive", 98, 100)
+        if output_sink is None:
+            zipfilename = output_path(f"AP_{multiworld.seed_name}.zip")
+            logger.info(f"Creating final archive at {zipfilename}")
+            output_sink = ZipOutputSink(zipfilename, get_settings().generator.output_compression)
+        try:
             for file in os.scandir(temp_dir):
-                zf.write(file.path, arcname=file.name)
+                output_sink.add_file(file.path)
+            output_sink.add_data(f"{outfilebase}.archipelago", multidata_task.result())
+        finally:
+            output_sink.close()
 
     logger.info('Done. Enjoy. Total Time: %s', time.perf_counter() - start)
     return multiworld
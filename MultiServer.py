@@ -13,9 +13,11 @@ import itertools
 import logging
 import math
 import operator
+import os
 import pickle
 import random
 import shlex
+import struct
 import threading
 import time
 import typing
@@ -249,6 +251,12 @@ class Context:
     non_hintable_names: typing.Dict[str, typing.AbstractSet[str]]
     spheres: typing.List[typing.Dict[int, typing.Set[int]]]
     """ each sphere is { player: { location_id, ... } } """
+    slots_with_new_items: typing.Set[team_slot]
+    """ slots whose received items grew since their clients were last sent them """
+    save_journal: bool = False
+    """ append what changed to a journal next to the save file, instead of rewriting the whole save every time """
+    journal_compaction_size: int = 1024 * 1024
+    """ size in bytes the journal may grow to, or the size of the save file if larger, before getting compacted """
     logger: logging.Logger
 
     def __init__(self, host: str, port: int, server_password: str, password: str, location_check_points: int,
@@ -277,6 +285,7 @@ class Context:
         self.server = None
         self.countdown_timer = 0
         self.received_items = {}
+        self.slots_with_new_items = set()
         self.start_inventory = {}
         self.name_aliases: typing.Dict[team_slot, str] = {}
         self.location_checks = collections.defaultdict(set)
@@ -284,6 +293,7 @@ class Context:
         self.location_check_points = location_check_points
         self.hints_used = collections.defaultdict(int)
         self.hints: typing.Dict[team_slot, typing.Set[Hint]] = collections.defaultdict(set)
+        self.location_hints: typing.Dict[typing.Tuple[int, int, int], Hint] = {}
         self.release_mode: str = release_mode
         self.remaining_mode: str = remaining_mode
         self.collect_mode: str = collect_mode
@@ -303,6 +313,14 @@ class Context:
         self.auto_save_interval = 60  # in seconds
         self.auto_saver_thread: typing.Optional[threading.Thread] = None
         self.save_dirty = False
+        self.journal_generation = -1
+        self.journal_size: typing.Optional[int] = None  # None until a snapshot starts a new journal
+        self.journal_snapshot_size = 0
+        self.journal_received_items: typing.Dict[typing.Tuple[int, int, bool], int] = {}
+        self.journal_location_checks: typing.Dict[team_slot, typing.Set[int]] = collections.defaultdict(set)
+        self.journal_small_save: typing.Dict[str, typing.Any] = {}
+        self.journal_hints: typing.Set[team_slot] = set()
+        self.journal_stored_data: typing.Set[str] = set()
         self.tags = ['AP']
         self.games: typing.Dict[int, str] = {}
         self.minimum_client_versions: typing.Dict[int, Version] = {}
@@ -332,20 +350,18 @@ class Context:
 
     # Data package retrieval
     def _load_game_data(self):
-        import worlds
-        self.gamespackage = worlds.network_data_package["games"]
-
-        self.item_name_groups = {world_name: world.item_name_groups for world_name, world in
-                                 worlds.AutoWorldRegister.world_types.items()}
-        self.location_name_groups = {world_name: world.location_name_groups for world_name, world in
-                                     worlds.AutoWorldRegister.world_types.items()}
-        for world_name, world in worlds.AutoWorldRegister.world_types.items():
-            self.non_hintable_names[world_name] = world.hint_blacklist
+        # served from the world index, so the server does not have to import every world
+        from WorldIndex import get_world_index
+        world_index = get_world_index()
 
-        for game_package in self.gamespackage.values():
+        self.gamespackage = {}
+        for world_name, world in world_index.items():
             # remove groups from data sent to clients
-            del game_package["item_name_groups"]
-            del game_package["location_name_groups"]
+            self.gamespackage[world_name] = {key: value for key, value in world.data_package.items()
+                                             if key not in ("item_name_groups", "location_name_groups")}
+            self.item_name_groups[world_name] = world.data_package["item_name_groups"]
+            self.location_name_groups[world_name] = world.data_package["location_name_groups"]
+            self.non_hintable_names[world_name] = world.hint_blacklist
 
     def _init_game_data(self):
         for game_name, game_package in self.gamespackage.items():
@@ -367,6 +383,10 @@ class Context:
             self.item_names[game].update(archipelago_item_names)
             self.location_names[game].update(archipelago_location_names)
 
+    def get_game_package(self, game: str) -> typing.Dict[str, typing.Any]:
+        """Returns the data package of game, as it is sent to clients."""
+        return self.gamespackage[game]
+
     def item_names_for_game(self, game: str) -> typing.Optional[typing.Dict[str, int]]:
         return self.gamespackage[game]["item_name_to_id"] if game in self.gamespackage else None
 
@@ -546,6 +566,7 @@ class Context:
 
         for slot, hints in decoded_obj["precollected_hints"].items():
             self.hints[0, slot].update(hints)
+        self.index_hints()
 
         # declare slots that aren't players as done
         for slot, slot_info in self.slot_info.items():
@@ -592,28 +613,120 @@ class Context:
 
     def _save(self, exit_save: bool = False) -> bool:
         try:
-            # Does not use Utils.restricted_dumps because we'd rather make a save than not make one
-            encoded_save = pickle.dumps(self.get_save())
-            with open(self.save_filename, "wb") as f:
-                f.write(zlib.compress(encoded_save))
+            if self.save_journal and not exit_save and self.journal_size is not None and \
+                    self.journal_size < max(self.journal_compaction_size, self.journal_snapshot_size):
+                self._append_journal()
+            else:
+                self._write_snapshot()
         except Exception as e:
             self.logger.exception(e)
+            self.journal_size = None  # changes may be missing from the journal now, so write everything next time
             return False
         else:
             return True
 
+    @property
+    def journal_filename(self) -> str:
+        return self.save_filename + ".journal"
+
+    def _write_snapshot(self) -> None:
+        generation = self.journal_generation + 1
+        save = self.get_save()
+        save["journal_generation"] = generation
+        # Does not use Utils.restricted_dumps because we'd rather make a save than not make one
+        encoded_save = zlib.compress(pickle.dumps(save))
+        with open(self.save_filename + ".tmp", "wb") as f:
+            f.write(encoded_save)
+        os.replace(self.save_filename + ".tmp", self.save_filename)
+        self.journal_snapshot_size = len(encoded_save)
+        self._reset_journal(generation)
+        if self.save_journal:
+            with open(self.journal_filename, "wb") as f:
+                self.journal_size = f.write(self._encode_journal_record({"journal_generation": generation}))
+        elif os.path.exists(self.journal_filename):
+            os.remove(self.journal_filename)
+
+    def _reset_journal(self, generation: int) -> None:
+        """Marks the current state as saved, for the journal to only contain what changed from here on."""
+        self.journal_generation = generation
+        self.journal_received_items = {key: len(items) for key, items in self.received_items.items()}
+        self.journal_location_checks.clear()
+        self.journal_small_save = self.get_small_save()
+        self.journal_hints.clear()
+        self.journal_stored_data.clear()
+
+    def _append_journal(self) -> None:
+        # only what changed since the last record gets written, hints were already rechecked when locations got checked
+        record: typing.Dict[str, typing.Any] = {
+            key: value for key, value in self.get_small_save().items() if self.journal_small_save.get(key) != value}
+        self.journal_small_save.update(record)
+        record["received_items"] = {}
+        for key, items in list(self.received_items.items()):
+            saved = self.journal_received_items.get(key, 0)
+            if len(items) > saved:
+                record["received_items"][key] = (saved, items[saved:])
+                self.journal_received_items[key] = len(items)
+        record["location_checks"] = dict(self.journal_location_checks)
+        self.journal_location_checks.clear()
+        hints, self.journal_hints = self.journal_hints, set()
+        record["hints"] = {key: set(self.hints[key]) for key in hints}
+        stored_data, self.journal_stored_data = self.journal_stored_data, set()
+        record["stored_data"] = {key: self.stored_data[key] for key in stored_data if key in self.stored_data}
+
+        with open(self.journal_filename, "ab") as f:
+            self.journal_size += f.write(self._encode_journal_record(record))
+
+    @staticmethod
+    def _encode_journal_record(record: dict) -> bytes:
+        encoded_record = zlib.compress(pickle.dumps(record))
+        return struct.pack("<I", len(encoded_record)) + encoded_record
+
+    def _replay_journal(self, savedata: dict) -> None:
+        """Applies the journal written after savedata to it, if there is one."""
+        try:
+            with open(self.journal_filename, "rb") as f:
+                journal = f.read()
+        except FileNotFoundError:
+            return
+        records: typing.List[dict] = []
+        position = 0
+        try:
+            while position < len(journal):
+                size, = struct.unpack_from("<I", journal, position)
+                position += 4
+                records.append(restricted_loads(zlib.decompress(journal[position:position + size])))
+                position += size
+        except Exception as e:
+            # the last record may have only been partially written
+            self.logger.warning(f"Ignoring the rest of the save journal after {len(records)} records: {e}")
+        if not records or records[0].get("journal_generation") != savedata.get("journal_generation"):
+            return  # journal from before the current save file was written
+
+        for record in records[1:]:
+            for key, (start, items) in record.pop("received_items").items():
+                savedata["received_items"].setdefault(key, [])[start:start + len(items)] = items
+            for key, checks in record.pop("location_checks").items():
+                savedata["location_checks"].setdefault(key, set()).update(checks)
+            savedata["hints"].update(record.pop("hints"))
+            savedata.setdefault("stored_data", {}).update(record.pop("stored_data"))
+            savedata.update(record)
+        self.logger.info(f"Replayed {len(records) - 1} records of the save journal.")
+
     def init_save(self, enabled: bool = True):
         self.saving = enabled
         if self.saving:
             if not self.save_filename:
-                import os
                 name, ext = os.path.splitext(self.data_filename)
                 self.save_filename = name + '.apsave' if ext.lower() in ('.archipelago', '.zip') \
                     else self.data_filename + '_' + 'apsave'
             try:
                 with open(self.save_filename, 'rb') as f:
-                    save_data = restricted_loads(zlib.decompress(f.read()))
-                    self.set_save(save_data)
+                    compressed_save = f.read()
+                save_data = restricted_loads(zlib.decompress(compressed_save))
+                self._replay_journal(save_data)
+                self.set_save(save_data)
+                # the first save after loading writes a snapshot, which compacts the replayed journal
+                self.journal_generation = save_data.get("journal_generation", -1)
             except FileNotFoundError:
                 self.logger.error('No save data found, starting a new game')
             except Exception as e:
@@ -657,29 +770,34 @@ class Context:
             "version": self.save_version,
             "connect_names": self.connect_names,
             "received_items": self.received_items,
-            "hints_used": dict(self.hints_used),
             "hints": dict(self.hints),
             "location_checks": dict(self.location_checks),
-            "name_aliases": self.name_aliases,
+            "stored_data": self.stored_data,
+            **self.get_small_save()
+        }
+
+        return d
+
+    def get_small_save(self) -> dict:
+        """The parts of the save that are small enough to compare and write whole whenever they change."""
+        return {
+            "hints_used": dict(self.hints_used),
+            "name_aliases": dict(self.name_aliases),
             "client_game_state": dict(self.client_game_state),
             "client_activity_timers": tuple(
                 (key, value.timestamp()) for key, value in self.client_activity_timers.items()),
             "client_connection_timers": tuple(
                 (key, value.timestamp()) for key, value in self.client_connection_timers.items()),
             "random_state": self.random.getstate(),
-            "group_collected": dict(self.group_collected),
-            "stored_data": self.stored_data,
+            "group_collected": {group: set(slots) for group, slots in self.group_collected.items()},
             "game_options": {"hint_cost": self.hint_cost, "location_check_points": self.location_check_points,
                              "server_password": self.server_password, "password": self.password,
                              "release_mode": self.release_mode,
                              "remaining_mode": self.remaining_mode, "collect_mode": self.collect_mode,
                              "countdown_mode": self.countdown_mode,
                              "item_cheat": self.item_cheat, "compatibility": self.compatibility}
-
         }
 
-        return d
-
     def set_save(self, savedata: dict):
         if self.connect_names != savedata["connect_names"]:
             raise Exception("This savegame does not appear to match the loaded multiworld.")
@@ -688,6 +806,7 @@ class Context:
         self.received_items = savedata["received_items"]
         self.hints_used.update(savedata["hints_used"])
         self.hints.update(savedata["hints"])
+        self.index_hints()
 
         self.name_aliases.update(savedata["name_aliases"])
         self.client_game_state.update(savedata["client_game_state"])
@@ -735,28 +854,46 @@ class Context:
         will refresh all teams or all slots respectively. If a set is passed for 'changed', each (team,slot)
         pair that has at least one hint modified will be added to the set.
         """
-        for hint_team, hint_slot in self.hints:
+        for hint_team, hint_slot in list(self.hints):
             if team != hint_team and team is not None:
                 continue  # Check specified team only, all if team is None
             if slot != hint_slot and slot is not None:
                 continue  # Check specified slot only, all if slot is None
-            new_hints: typing.Set[Hint] = set()
-            for hint in self.hints[hint_team, hint_slot]:
-                new_hint = hint.re_check(self, hint_team)
-                new_hints.add(new_hint)
-                if hint == new_hint:
-                    continue
-                for player in self.slot_set(hint.receiving_player) | {hint.finding_player}:
-                    if changed is not None:
-                        changed.add((hint_team,player))
-                    if slot is not None and slot != player:
-                        self.replace_hint(hint_team, player, hint, new_hint)
-            self.hints[hint_team, hint_slot] = new_hints
-
-    def get_rechecked_hints(self, team: int, slot: int):
-        self.recheck_hints(team, slot)
+            for hint in list(self.hints[hint_team, hint_slot]):
+                self._recheck_hint(hint_team, hint, changed)
+
+    def recheck_location_hints(self, team: int, slot: int, locations: typing.Iterable[int],
+                               changed: typing.Optional[typing.Set[team_slot]] = None) -> None:
+        """Refreshes only the hints pointing at the specified locations of a slot, for after they got checked.
+        If a set is passed for 'changed', each (team,slot) pair that has at least one hint modified will be added
+        to the set.
+        """
+        for location in locations:
+            hint = self.location_hints.get((team, slot, location))
+            if hint:
+                self._recheck_hint(team, hint, changed)
+
+    def get_rechecked_hints(self, team: int, slot: int) -> typing.Set[Hint]:
+        """Returns the hints of a slot, after rechecking the locations they point at."""
+        for hint in list(self.hints[team, slot]):
+            self.recheck_location_hints(team, hint.finding_player, (hint.location,))
         return self.hints[team, slot]
 
+    def _recheck_hint(self, team: int, hint: Hint, changed: typing.Optional[typing.Set[team_slot]]) -> None:
+        new_hint = hint.re_check(self, team)
+        if hint == new_hint:
+            return
+        for player in self.slot_set(hint.receiving_player) | {hint.finding_player}:
+            if changed is not None:
+                changed.add((team, player))
+            self.replace_hint(team, player, hint, new_hint)
+
+    def index_hints(self) -> None:
+        """Rebuilds the lookup of hints by location from the hints of every slot."""
+        self.location_hints = {(team, hint.finding_player, hint.location): hint
+                               for (team, slot), hints in self.hints.items() for hint in hints
+                               if hint.finding_player == slot}
+
     def get_sphere(self, player: int, location_id: int) -> int:
         """Get sphere of a location, -1 if spheres are not available."""
         if self.spheres:
@@ -823,10 +960,12 @@ class Context:
                 # we can check once if hint already exists
                 if hint not in self.hints[team, hint.finding_player]:
                     self.hints[team, hint.finding_player].add(hint)
+                    self.location_hints[team, hint.finding_player, hint.location] = hint
                     new_hint_events.add(hint.finding_player)
                     for player in self.slot_set(hint.receiving_player):
                         self.hints[team, player].add(hint)
                         new_hint_events.add(player)
+                    self.journal_hints.update((team, player) for player in new_hint_events)
 
             self.logger.info("Notice (Team #%d): %s" % (team + 1, format_hint(self, team, hint)))
         for slot in new_hint_events:
@@ -841,15 +980,15 @@ class Context:
                     async_start(self.send_msgs(client, client_hints))
 
     def get_hint(self, team: int, finding_player: int, seeked_location: int) -> typing.Optional[Hint]:
-        for hint in self.hints[team, finding_player]:
-            if hint.location == seeked_location and hint.finding_player == finding_player:
-                return hint
-        return None
+        return self.location_hints.get((team, finding_player, seeked_location))
     
     def replace_hint(self, team: int, slot: int, old_hint: Hint, new_hint: Hint) -> None:
         if old_hint in self.hints[team, slot]:
             self.hints[team, slot].remove(old_hint)
             self.hints[team, slot].add(new_hint)
+            self.journal_hints.add((team, slot))
+            if slot == new_hint.finding_player:
+                self.location_hints[team, new_hint.finding_player, new_hint.location] = new_hint
     
     # "events"
 
@@ -1072,20 +1211,21 @@ def get_start_inventory(ctx: Context, player: int, remote_start_inventory: bool)
 
 
 def send_new_items(ctx: Context):
-    for team, clients in ctx.clients.items():
-        for slot, clients in clients.items():
-            for client in clients:
-                if client.no_items:
-                    continue
-                start_inventory = get_start_inventory(ctx, slot, client.remote_start_inventory)
-                items = get_received_items(ctx, team, slot, client.remote_items)
-                if len(start_inventory) + len(items) > client.send_index:
-                    first_new_item = max(0, client.send_index - len(start_inventory))
-                    async_start(ctx.send_msgs(client, [{
-                        "cmd": "ReceivedItems",
-                        "index": client.send_index,
-                        "items": start_inventory[client.send_index:] + items[first_new_item:]}]))
-                    client.send_index = len(start_inventory) + len(items)
+    """Send the new items of every slot whose received items grew since the last call to that slot's clients."""
+    slots, ctx.slots_with_new_items = ctx.slots_with_new_items, set()
+    for team, slot in slots:
+        for client in ctx.clients.get(team, {}).get(slot, ()):
+            if client.no_items:
+                continue
+            start_inventory = get_start_inventory(ctx, slot, client.remote_start_inventory)
+            items = get_received_items(ctx, team, slot, client.remote_items)
+            if len(start_inventory) + len(items) > client.send_index:
+                first_new_item = max(0, client.send_index - len(start_inventory))
+                async_start(ctx.send_msgs(client, [{
+                    "cmd": "ReceivedItems",
+                    "index": client.send_index,
+                    "items": start_inventory[client.send_index:] + items[first_new_item:]}]))
+                client.send_index = len(start_inventory) + len(items)
 
 
 def update_checked_locations(ctx: Context, team: int, slot: int):
@@ -1111,8 +1251,10 @@ def collect_player(ctx: Context, team: int, slot: int, is_group: bool = False):
                            % (ctx.player_names[(team, slot)], team + 1),
                            {"type": "Collect", "team": team, "slot": slot})
     for source_player, location_ids in all_locations.items():
-        register_location_checks(ctx, team, source_player, location_ids, count_activity=False)
+        register_location_checks(ctx, team, source_player, location_ids, count_activity=False, send_items=False)
         update_checked_locations(ctx, team, source_player)
+    # one ReceivedItems per client for everything collected
+    send_new_items(ctx)
 
     if not is_group:
         for group, group_players in ctx.groups.items():
@@ -1133,10 +1275,11 @@ def send_items_to(ctx: Context, team: int, target_slot: int, *items: NetworkItem
             if item.player != target_slot:
                 get_received_items(ctx, team, target, False).append(item)
             get_received_items(ctx, team, target, True).append(item)
+        ctx.slots_with_new_items.add((team, target))
 
 
 def register_location_checks(ctx: Context, team: int, slot: int, locations: typing.Iterable[int],
-                             count_activity: bool = True):
+                             count_activity: bool = True, send_items: bool = True):
     slot_locations = ctx.locations[slot]
     new_locations = set(locations) - ctx.location_checks[team, slot]
     new_locations.intersection_update(slot_locations)  # ignore location IDs unknown to this multidata
@@ -1170,14 +1313,16 @@ def register_location_checks(ctx: Context, team: int, slot: int, locations: typi
         del sortable
 
         ctx.location_checks[team, slot] |= new_locations
-        send_new_items(ctx)
+        ctx.journal_location_checks[team, slot] |= new_locations
+        if send_items:
+            send_new_items(ctx)
         ctx.broadcast(ctx.clients[team][slot], [{
             "cmd": "RoomUpdate",
             "hint_points": get_slot_points(ctx, team, slot),
             "checked_locations": new_locations,  # send back new checks only
         }])
         updated_slots: typing.Set[tuple[int, int]] = set()
-        ctx.recheck_hints(team, slot, updated_slots)
+        ctx.recheck_location_hints(team, slot, new_locations, updated_slots)
         for hint_team, hint_slot in updated_slots:
             ctx.on_changed_hints(hint_team, hint_slot)
         ctx.save()
@@ -1669,6 +1814,7 @@ class ClientMessageProcessor(CommonCommandProcessor):
                 new_item = NetworkItem(names[item_name], -1, self.client.slot)
                 get_received_items(self.ctx, self.client.team, self.client.slot, False).append(new_item)
                 get_received_items(self.ctx, self.client.team, self.client.slot, True).append(new_item)
+                self.ctx.slots_with_new_items.add((self.client.team, self.client.slot))
                 self.ctx.broadcast_text_all(
                     'Cheat console: sending "' + item_name + '" to ' + self.ctx.get_aliased_name(self.client.team,
                                                                                                  self.client.slot),
@@ -1686,9 +1832,7 @@ class ClientMessageProcessor(CommonCommandProcessor):
         points_available = get_client_points(self.ctx, self.client)
         cost = self.ctx.get_hint_cost(self.client.slot)
         if not input_text:
-            hints = {hint.re_check(self.ctx, self.client.team) for hint in
-                     self.ctx.hints[self.client.team, self.client.slot]}
-            self.ctx.hints[self.client.team, self.client.slot] = hints
+            hints = self.ctx.get_rechecked_hints(self.client.team, self.client.slot)
             self.ctx.notify_hints(self.client.team, list(hints), recipients=(self.client.slot,))
             self.output(f"A hint costs {self.ctx.get_hint_cost(self.client.slot)} points. "
                         f"You have {points_available} points.")
@@ -1936,15 +2080,14 @@ async def process_client_cmd(ctx: Context, client: Client, args: dict):
     elif cmd == "GetDataPackage":
         exclusions = args.get("exclusions", [])
         if "games" in args:
-            games = {name: game_data for name, game_data in ctx.gamespackage.items()
-                     if name in set(args.get("games", []))}
+            requested_games = set(args.get("games", []))
+            games = {name: ctx.get_game_package(name) for name in ctx.gamespackage if name in requested_games}
             await ctx.send_msgs(client, [{"cmd": "DataPackage",
                                           "data": {"games": games}}])
         # TODO: remove exclusions behaviour around 0.5.0
         elif exclusions:
             exclusions = set(exclusions)
-            games = {name: game_data for name, game_data in ctx.gamespackage.items()
-                     if name not in exclusions}
+            games = {name: ctx.get_game_package(name) for name in ctx.gamespackage if name not in exclusions}
 
             package = {"games": games}
             await ctx.send_msgs(client, [{"cmd": "DataPackage",
@@ -1952,7 +2095,8 @@ async def process_client_cmd(ctx: Context, client: Client, args: dict):
 
         else:
             await ctx.send_msgs(client, [{"cmd": "DataPackage",
-                                          "data": {"games": ctx.gamespackage}}])
+                                          "data": {"games": {name: ctx.get_game_package(name)
+                                                             for name in ctx.gamespackage}}}])
 
     elif client.auth:
         if cmd == "ConnectUpdate":
@@ -2181,6 +2325,7 @@ async def process_client_cmd(ctx: Context, client: Client, args: dict):
                 func = modify_functions[operation["operation"]]
                 value = func(value, operation["value"])
             ctx.stored_data[args["key"]] = args["value"] = value
+            ctx.journal_stored_data.add(args["key"])
             targets = set(ctx.stored_data_notification_clients[args["key"]])
             if args.get("want_reply", False):
                 targets.add(client)
@@ -2583,6 +2728,8 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument('--password', default=defaults["password"])
     parser.add_argument('--savefile', default=defaults["savefile"])
     parser.add_argument('--disable_save', default=defaults["disable_save"], action='store_true')
+    parser.add_argument('--save_journal', default=defaults["save_journal"], action='store_true',
+                        help="Append changes to a journal next to the save file instead of rewriting it every time.")
     parser.add_argument('--cert', help="Path to a SSL Certificate for encryption.")
     parser.add_argument('--cert_key', help="Path to SSL Certificate Key file")
     parser.add_argument('--loglevel', default=defaults["loglevel"],
@@ -2713,6 +2860,7 @@ async def main(args: argparse.Namespace):
         logging.exception(f"Failed to read multiworld data ({e})")
         raise
 
+    ctx.save_journal = args.save_journal
     ctx.init_save(not args.disable_save)
 
     ssl_context = load_server_cert(args.cert, args.cert_key) if args.cert else None
@@ -427,20 +427,31 @@ class _LocationStore(dict, typing.MutableMapping[int, typing.Dict[int, typing.Tu
         if len(self.get(0, {})):
             raise ValueError("Invalid player id 0 for location")
 
+        # receiving player -> item id -> entries as yielded by find_item, so lookups for a receiver don't scan everything
+        self._receiver_index: typing.Dict[int, typing.Dict[int, typing.List[typing.Tuple[int, int, int, int, int]]]] = {}
+        for finding_player, check_data in sorted(self.items()):
+            for location_id, (item_id, receiving_player, item_flags) in sorted(check_data.items()):
+                self._receiver_index.setdefault(receiving_player, {}).setdefault(item_id, []).append(
+                    (finding_player, location_id, item_id, receiving_player, item_flags))
+
     def find_item(self, slots: typing.Set[int], seeked_item_id: int
                   ) -> typing.Generator[typing.Tuple[int, int, int, int, int], None, None]:
-        for finding_player, check_data in self.items():
-            for location_id, (item_id, receiving_player, item_flags) in check_data.items():
-                if receiving_player in slots and item_id == seeked_item_id:
-                    yield finding_player, location_id, item_id, receiving_player, item_flags
+        if len(slots) == 1:
+            for slot in slots:
+                yield from self._receiver_index.get(slot, {}).get(seeked_item_id, ())
+        elif slots:
+            receivers = slots if len(slots) < len(self._receiver_index) else \
+                [receiver for receiver in self._receiver_index if receiver in slots]
+            # sorted to yield in sender and location order, independent of the receiver
+            yield from sorted(entry for receiver in receivers
+                              for entry in self._receiver_index.get(receiver, {}).get(seeked_item_id, ()))
 
     def get_for_player(self, slot: int) -> typing.Dict[int, typing.Set[int]]:
         import collections
         all_locations: typing.Dict[int, typing.Set[int]] = collections.defaultdict(set)
-        for source_slot, location_data in self.items():
-            for location_id, values in location_data.items():
-                if values[1] == slot:
-                    all_locations[source_slot].add(location_id)
+        for entries in self._receiver_index.get(slot, {}).values():
+            for finding_player, location_id, *_ in entries:
+                all_locations[finding_player].add(location_id)
         return all_locations
 
     def get_checked(self, state: typing.Dict[typing.Tuple[int, int], typing.Set[int]], team: int, slot: int
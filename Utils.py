@@ -9,6 +9,7 @@ import os
 import itertools
 import subprocess
 import sys
+import threading
 import pickle
 import functools
 import io
@@ -29,6 +30,7 @@ except ImportError:
     from yaml import Loader as UnsafeLoader, SafeLoader, Dumper
 
 if typing.TYPE_CHECKING:
+    import mmap
     import tkinter
     import pathlib
     from BaseClasses import Region
@@ -353,10 +355,24 @@ def get_file_safe_name(name: str) -> str:
 
 
 def load_data_package_for_checksum(game: str, checksum: typing.Optional[str]) -> Dict[str, Any]:
+    """
+    Loads the cached data package of game with checksum, or returns an empty dict if it isn't cached.
+    Packages from the binary cache hold DataPackageTables.NameToIdTable mappings instead of name to id dicts.
+    """
     if checksum and game:
         if checksum != get_file_safe_name(checksum):
             raise ValueError(f"Bad symbols in checksum: {checksum}")
-        path = cache_path("datapackage", get_file_safe_name(game), f"{checksum}.json")
+        game_folder = cache_path("datapackage", get_file_safe_name(game))
+        path = os.path.join(game_folder, f"{checksum}.bin")
+        if os.path.exists(path):
+            from DataPackageTables import load_game_package
+            try:
+                return load_game_package(path)
+            except Exception as e:
+                logging.debug(f"Could not load data package: {e}")
+
+        # fall back to json cache of older versions
+        path = os.path.join(game_folder, f"{checksum}.json")
         if os.path.exists(path):
             try:
                 with open(path, "r", encoding="utf-8-sig") as f:
@@ -380,9 +396,9 @@ def store_data_package_for_checksum(game: str, data: typing.Dict[str, Any]) -> N
             raise ValueError(f"Bad symbols in checksum: {checksum}")
         game_folder = cache_path("datapackage", get_file_safe_name(game))
         os.makedirs(game_folder, exist_ok=True)
+        from DataPackageTables import write_game_package
         try:
-            with open(os.path.join(game_folder, f"{checksum}.json"), "w", encoding="utf-8-sig") as f:
-                json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            write_game_package(os.path.join(game_folder, f"{checksum}.bin"), data)
         except Exception as e:
             logging.debug(f"Could not store data package: {e}")
 
@@ -953,6 +969,72 @@ def read_snes_rom(stream: BinaryIO, strip_header: bool = True) -> bytearray:
     return buffer
 
 
+_file_md5_lock = threading.Lock()
+
+
+def get_file_md5(path: str) -> str:
+    """
+    Returns the md5 hexdigest of a file. Digests are remembered in the cache directory for as long as the file keeps
+    its size and modification time, so big files like base roms are only hashed once.
+    """
+    import hashlib
+
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    with _file_md5_lock:
+        file_md5s = getattr(get_file_md5, "file_md5s", None)
+        if file_md5s is None:
+            try:
+                with open(cache_path("file_md5s.json")) as f:
+                    file_md5s = json.load(f)
+            except (OSError, ValueError):
+                file_md5s = {}
+            get_file_md5.file_md5s = file_md5s
+        size, mtime, md5 = file_md5s.get(path, (None, None, None))
+        if size == stat.st_size and mtime == stat.st_mtime_ns:
+            return md5
+
+        with open(path, "rb") as f:
+            md5 = hashlib.file_digest(f, "md5").hexdigest() if sys.version_info >= (3, 11, 0) \
+                else hashlib.md5(f.read()).hexdigest()
+        file_md5s[path] = (stat.st_size, stat.st_mtime_ns, md5)
+        try:
+            _write_atomic(cache_path("file_md5s.json"), json.dumps(file_md5s).encode("utf-8"))
+        except OSError as e:
+            logging.debug(f"Could not store file checksums: {e}")
+        return md5
+
+
+def get_derived_data(name: str, key: str, derive: typing.Callable[[], bytes]) -> mmap.mmap:
+    """
+    Returns data that is expensive to derive from other files, like a decompressed or base patched rom, memory mapped
+    from the cache directory, so it is shared between processes. Read from the mapping where possible, and only copy it
+    with bytearray() where the data gets changed, or bytes() where an API does not take buffers.
+
+    :param name: Name of the data.
+    :param key: Has to change with everything the data is derived from, e.g. a checksum of the source file.
+    :param derive: Creates the data if it is not cached yet.
+    """
+    import mmap
+
+    path = cache_path("derived", f"{name}_{key}")
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        _write_atomic(path, derive())
+        f = open(path, "rb")
+    with f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(data)
+    os.replace(temp_path, path)
+
+
 _faf_tasks: "Set[asyncio.Task[typing.Any]]" = set()
 
 
@@ -1224,6 +1306,73 @@ class DaemonThreadPoolExecutor(concurrent.futures.ThreadPoolExecutor):
             # NOTE: don't add to _threads_queues so we don't block on shutdown
 
 
+class GenerationCancelled(Exception):
+    """Raised inside a generation when its GenerationControl got cancelled."""
+
+
+class GenerationControl:
+    """
+    Lets whoever started a generation cancel it cooperatively and follow its progress. The generation checks for
+    cancellation at stage boundaries and between placement batches, raising GenerationCancelled once cancelled.
+    """
+    stage: str
+    """name of the current stage"""
+    percent: float
+    """estimate of the overall progress, from 0 to 100, only ever increasing"""
+
+    def __init__(self, on_progress: typing.Optional[typing.Callable[[str, float], None]] = None) -> None:
+        """
+        :param on_progress: Called from the generating thread with the stage and percent whenever either changes.
+        """
+        self.on_progress = on_progress
+        self.stage = ""
+        self.percent = 0.
+        self._cancelled = threading.Event()
+        self._stage_start = 0.
+        self._stage_end = 0.
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def cancel(self) -> None:
+        """Requests the generation to stop at its next check. May be called from any thread."""
+        self._cancelled.set()
+
+    def check(self) -> None:
+        """Raises GenerationCancelled if the generation was cancelled."""
+        if self._cancelled.is_set():
+            raise GenerationCancelled("Generation was cancelled.")
+
+    def set_stage(self, stage: str, start: float, end: float) -> None:
+        """
+        Enters the next stage of generation, after checking for cancellation.
+
+        :param stage: Name of the stage.
+        :param start: Overall percent at the start of the stage.
+        :param end: Overall percent once the stage is done, which set_progress scales the progress of the stage to.
+        """
+        self.check()
+        self.stage = stage
+        self._stage_start = start
+        self._stage_end = end
+        self.percent = max(self.percent, start)
+        if self.on_progress:
+            self.on_progress(stage, self.percent)
+
+    def set_progress(self, done: int, total: int) -> None:
+        """Reports the progress within the current stage, after checking for cancellation."""
+        self.check()
+        if not total:
+            return
+        percent = self._stage_start + (self._stage_end - self._stage_start) * min(done / total, 1)
+        # a stage can consist of multiple steps with their own progress, so only ever report progress forward
+        if percent > self.percent:
+            self.percent = percent
+            if self.on_progress:
+                self.on_progress(self.stage, percent)
+
+
 def get_full_typename(t: type) -> str:
     """Returns the full qualified name of a type, including its module (if not builtins)."""
     module = t.__module__
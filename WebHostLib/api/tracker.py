@@ -129,7 +129,7 @@ def tracker_data(tracker: UUID) -> dict[str, Any]:
         for player in players:
             activity_timers.append({"team": team, "player": player, "time": None})
 
-    for (team, player), timestamp in tracker_data._multisave.get("client_activity_timers", []):
+    for (team, player), timestamp in tracker_data.get_room_activity_timestamps().items():
         for entry in activity_timers:
             if entry["team"] == team and entry["player"] == player:
                 entry["time"] = datetime.fromtimestamp(timestamp, timezone.utc)
@@ -141,7 +141,7 @@ def tracker_data(tracker: UUID) -> dict[str, Any]:
         for player in players:
             connection_timers.append({"team": team, "player": player, "time": None})
 
-    for (team, player), timestamp in tracker_data._multisave.get("client_connection_timers", []):
+    for (team, player), timestamp in tracker_data.get_room_connection_timestamps().items():
         # find the matching entry
         for entry in connection_timers:
             if entry["team"] == team and entry["player"] == player:
@@ -214,7 +214,7 @@ def static_tracker_data(tracker: UUID) -> dict[str, Any]:
     for team, players in all_players.items():
         for player in players:
             player_locations_total.append(
-                {"team": team, "player": player, "total_locations": len(tracker_data.get_player_locations(player))})
+                {"team": team, "player": player, "total_locations": tracker_data.get_player_locations_count(player)})
 
     player_game: list[PlayerGame] = []
     """The played game per player slot."""
@@ -224,7 +224,7 @@ def static_tracker_data(tracker: UUID) -> dict[str, Any]:
 
     return {
         "groups": groups,
-        "datapackage": tracker_data._multidata["datapackage"],
+        "datapackage": tracker_data.get_room_datapackage(),
         "player_locations_total": player_locations_total,
         "player_game": player_game,
     }
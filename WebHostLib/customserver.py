@@ -13,6 +13,7 @@ import threading
 import time
 import typing
 import sys
+from uuid import UUID
 
 import websockets
 from pony.orm import commit, db_session, select
@@ -25,7 +26,9 @@ from MultiServer import (
 )
 from Utils import restricted_loads, cache_argsless
 from .locker import Locker
-from .models import Command, GameDataPackage, Room, db
+from .models import Command, GameDataPackage, Room, TrackerProjection, db
+from .static_data import NameToIdTable, load_static_data, write_static_data
+from .tracker_projection import dump_projection, project_multidata, project_multisave
 
 
 class CustomClientMessageProcessor(ClientMessageProcessor):
@@ -60,8 +63,25 @@ class DBCommandProcessor(ServerCommandProcessor):
         self.ctx.logger.info(text)
 
 
+class StaticNames(collections.ChainMap):
+    """Id to name lookup over static tables, which names unknown ids instead of raising KeyError."""
+
+    def __init__(self, unknown_format: str, *tables: typing.Mapping[int, str]):
+        # writes, if any, go into a room local dict in front of the shared tables
+        super().__init__({}, *tables)
+        self.unknown_format = unknown_format
+
+    def __missing__(self, code: int) -> str:
+        return self.unknown_format.format(code)
+
+
+_decoded_game_packages: typing.Dict[str, typing.Dict[str, typing.Any]] = {}
+"""static game packages decoded from their mapped tables, by checksum, shared by all rooms of this process"""
+
+
 class WebHostContext(Context):
     room_id: int
+    multidata_projection: typing.Dict[str, typing.Any]
 
     def __init__(self, static_server_data: dict, logger: logging.Logger):
         # static server data is used during _load_game_data to load required data,
@@ -89,19 +109,46 @@ class WebHostContext(Context):
             setattr(self, key, value)
         self.non_hintable_names = collections.defaultdict(frozenset, self.non_hintable_names)
 
-    def listen_to_db_commands(self):
-        cmdprocessor = DBCommandProcessor(self)
+    def _init_game_data(self):
+        # games using the static package get views of its mapped tables, instead of decoding them for every room
+        static_games = [game for game, package in self.gamespackage.items()
+                        if isinstance(package.get("item_name_to_id"), NameToIdTable)]
+        archipelago_package = self.gamespackage["Archipelago"] if "Archipelago" in static_games else None
+        for game in static_games:
+            package = self.gamespackage[game]
+            if "checksum" in package:
+                self.checksums[game] = package["checksum"]
+            item_tables = [package["item_name_to_id"].id_to_name]
+            location_tables = [package["location_name_to_id"].id_to_name]
+            if game != "Archipelago" and archipelago_package:
+                item_tables.append(archipelago_package["item_name_to_id"].id_to_name)
+                location_tables.append(archipelago_package["location_name_to_id"].id_to_name)
+            self.item_names[game] = StaticNames("Unknown item (ID:{})", *item_tables)
+            self.location_names[game] = StaticNames("Unknown location (ID:{})", *location_tables)
+            self.all_item_and_group_names[game] = \
+                collections.ChainMap(package["item_name_to_id"], self.item_name_groups.get(game, {}))
+            self.all_location_and_group_names[game] = \
+                collections.ChainMap(package["location_name_to_id"], self.location_name_groups.get(game, {}))
+
+        static_gamespackage = self.gamespackage
+        self.gamespackage = {game: package for game, package in static_gamespackage.items()
+                             if game not in static_games}
+        try:
+            super()._init_game_data()
+        finally:
+            self.gamespackage = static_gamespackage
 
-        while not self.exit_event.is_set():
-            with db_session:
-                commands = select(command for command in Command if command.room.id == self.room_id)
-                if commands:
-                    for command in commands:
-                        self.main_loop.call_soon_threadsafe(cmdprocessor, command.commandtext)
-                        command.delete()
-                    commit()
-            del commands
-            time.sleep(5)
+    def get_game_package(self, game: str) -> typing.Dict[str, typing.Any]:
+        package = self.gamespackage[game]
+        if not isinstance(package.get("item_name_to_id"), NameToIdTable):
+            return package
+        # the mapped tables are only decoded once per process, instead of on every GetDataPackage
+        checksum = package.get("checksum", game)
+        decoded = _decoded_game_packages.get(checksum)
+        if decoded is None:
+            decoded = _decoded_game_packages[checksum] = {
+                key: value.to_dict() if isinstance(value, NameToIdTable) else value for key, value in package.items()}
+        return decoded
 
     @db_session
     def load(self, room_id: int):
@@ -113,6 +160,7 @@ class WebHostContext(Context):
             self.port = get_random_port()
 
         multidata = self.decompress(room.seed.multidata)
+        self.multidata_projection = project_multidata(multidata)
         game_data_packages = {}
 
         static_gamespackage = self.gamespackage  # this is shared across all rooms
@@ -158,13 +206,18 @@ class WebHostContext(Context):
                 if savegame_data:
                     self.set_save(restricted_loads(Room.get(id=self.room_id).multisave))
             self._start_async_saving(atexit_save=False)
-        threading.Thread(target=self.listen_to_db_commands, daemon=True).start()
 
     @db_session
     def _save(self, exit_save: bool = False) -> bool:
         room = Room.get(id=self.room_id)
+        save = self.get_save()
         # Does not use Utils.restricted_dumps because we'd rather make a save than not make one
-        room.multisave = pickle.dumps(self.get_save())
+        room.multisave = pickle.dumps(save)
+        projection = dump_projection(self.multidata_projection, project_multisave(save))
+        if room.tracker_projection:
+            room.tracker_projection.data = projection
+        else:
+            TrackerProjection(room=room, data=projection)
         # saving only occurs on activity, so we can "abuse" this information to mark this as last_activity
         if not exit_save:  # we don't want to count a shutdown as activity, which would restart the server again
             room.last_activity = datetime.datetime.utcnow()
@@ -176,6 +229,56 @@ class WebHostContext(Context):
         return d
 
 
+class CommandDispatcher(threading.Thread):
+    """
+    Fetches the Commands for every room hosted by this process in a single query, and hands each of them to the
+    command processor of its room on the room's event loop.
+    """
+    poll_interval: float
+    _rooms: typing.Dict[UUID, typing.Tuple[asyncio.AbstractEventLoop, typing.Callable[[str], typing.Any]]]
+
+    def __init__(self, poll_interval: float = 1):
+        super().__init__(name="CommandDispatcher", daemon=True)
+        self.poll_interval = poll_interval
+        self._rooms = {}
+        self._lock = threading.Lock()
+
+    def register(self, room_id: UUID, loop: asyncio.AbstractEventLoop,
+                 processor: typing.Callable[[str], typing.Any]) -> None:
+        with self._lock:
+            self._rooms[room_id] = loop, processor
+
+    def unregister(self, room_id: UUID) -> None:
+        with self._lock:
+            self._rooms.pop(room_id, None)
+
+    def dispatch(self) -> int:
+        """Hands out all pending Commands of the registered rooms, returning how many there were."""
+        with self._lock:
+            rooms = dict(self._rooms)
+        if not rooms:
+            return 0
+        room_ids = list(rooms)
+        dispatched = 0
+        with db_session:
+            for command in select(command for command in Command if command.room.id in room_ids):
+                loop, processor = rooms[command.room.id]
+                loop.call_soon_threadsafe(processor, command.commandtext)
+                command.delete()
+                dispatched += 1
+            if dispatched:
+                commit()
+        return dispatched
+
+    def run(self) -> None:
+        while True:
+            try:
+                self.dispatch()
+            except Exception as e:
+                logging.exception(e)
+            time.sleep(self.poll_interval)
+
+
 def get_random_port():
     return random.randint(49152, 65535)
 
@@ -209,6 +312,21 @@ def get_static_server_data() -> dict:
     return data
 
 
+@cache_argsless
+def get_static_server_data_path() -> str:
+    """Writes get_static_server_data to the cache, for server processes to map, and returns its path."""
+    import hashlib
+    import os
+
+    data = get_static_server_data()
+    checksums = "".join(f"{game}:{package.get('checksum')};" for game, package in sorted(data["gamespackage"].items()))
+    digest = hashlib.sha1(f"{Utils.__version__};{checksums}".encode("utf-8")).hexdigest()
+    path = Utils.cache_path("webhost", f"static_server_data_{digest}.bin")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    write_static_data(path, data)
+    return path
+
+
 def set_up_logging(room_id) -> logging.Logger:
     import os
     # logger setup
@@ -229,7 +347,7 @@ def set_up_logging(room_id) -> logging.Logger:
     return logger
 
 
-def run_server_process(name: str, ponyconfig: dict, static_server_data: dict,
+def run_server_process(name: str, ponyconfig: dict, static_server_data_path: str,
                        cert_file: typing.Optional[str], cert_key_file: typing.Optional[str],
                        host: str, rooms_to_run: multiprocessing.Queue, rooms_shutting_down: multiprocessing.Queue):
     from setproctitle import setproctitle
@@ -254,6 +372,8 @@ def run_server_process(name: str, ponyconfig: dict, static_server_data: dict,
     if "worlds" in sys.modules:
         raise Exception("Worlds system should not be loaded in the custom server.")
 
+    static_server_data = load_static_data(static_server_data_path)
+
     import gc
 
     if not cert_file:
@@ -276,6 +396,9 @@ def run_server_process(name: str, ponyconfig: dict, static_server_data: dict,
 
     loop = asyncio.get_event_loop()
 
+    command_dispatcher = CommandDispatcher()
+    command_dispatcher.start()
+
     async def start_room(room_id):
         with Locker(f"RoomLocker {room_id}"):
             try:
@@ -283,6 +406,7 @@ def run_server_process(name: str, ponyconfig: dict, static_server_data: dict,
                 ctx = WebHostContext(static_server_data, logger)
                 ctx.load(room_id)
                 ctx.init_save()
+                command_dispatcher.register(room_id, ctx.main_loop, DBCommandProcessor(ctx))
                 assert ctx.server is None
                 try:
                     ctx.server = websockets.serve(
@@ -340,6 +464,7 @@ def run_server_process(name: str, ponyconfig: dict, static_server_data: dict,
                     setattr(asyncio.current_task(), "save", None)
             finally:
                 try:
+                    command_dispatcher.unregister(room_id)
                     ctx.save_dirty = False  # make sure the saving thread does not write to DB after final wakeup
                     ctx.exit_event.set()  # make sure the saving thread stops at some point
                     # NOTE: async saving should probably be an async task and could be merged with shutdown_task
@@ -1,9 +1,10 @@
 import concurrent.futures
 import json
+import logging
 import os
 import random
 import tempfile
-import zipfile
+import time
 from collections import Counter
 from pickle import PicklingError
 from typing import Any
@@ -13,13 +14,13 @@ from pony.orm import commit, db_session
 
 from BaseClasses import get_seed, seeddigits
 from Generate import PlandoOptions, handle_name, mystery_argparse
-from Main import main as ERmain
-from Utils import __version__, restricted_dumps, DaemonThreadPoolExecutor
+from Main import OutputSink, main as ERmain
+from Utils import __version__, restricted_dumps, DaemonThreadPoolExecutor, GenerationControl
 from WebHostLib import app
 from settings import ServerOptions, GeneratorOptions
 from .check import get_yaml_data, roll_options
 from .models import Generation, STATE_ERROR, STATE_QUEUED, Seed, UUID
-from .upload import upload_zip_to_db
+from .upload import upload_files_to_db
 
 
 def get_meta(options_source: dict, race: bool = False) -> dict[str, list[str] | dict[str, Any]]:
@@ -118,6 +119,12 @@ def start_generation(options: dict[str, dict | str], meta: dict[str, Any]):
         return redirect(url_for("view_seed", seed=seed_id))
 
 
+# how often the progress of a generation is written into its meta at most, in seconds, unless the stage changes
+PROGRESS_WRITE_INTERVAL = 1
+# how long a timed out generation gets to stop at its next cancellation check, before its thread is abandoned
+CANCEL_GRACE_TIME = 10
+
+
 def gen_game(gen_options: dict, meta: dict[str, Any] | None = None, owner=None, sid=None, timeout: int|None = None):
     if meta is None:
         meta = {}
@@ -125,6 +132,29 @@ def gen_game(gen_options: dict, meta: dict[str, Any] | None = None, owner=None,
     meta.setdefault("server_options", {}).setdefault("hint_cost", 10)
     race = meta.setdefault("generator_options", {}).setdefault("race", False)
 
+    last_progress_write = 0.
+    last_progress_stage = ""
+
+    def write_progress(stage: str, percent: float) -> None:
+        nonlocal last_progress_write, last_progress_stage
+        now = time.monotonic()
+        if stage == last_progress_stage and now - last_progress_write < PROGRESS_WRITE_INTERVAL:
+            return
+        last_progress_write = now
+        last_progress_stage = stage
+        try:
+            with db_session:
+                gen = Generation.get(id=sid)
+                if gen is not None:
+                    gen_meta = json.loads(gen.meta)
+                    gen_meta["progress"] = {"stage": stage, "percent": int(percent)}
+                    gen.meta = json.dumps(gen_meta)
+        except Exception as e:
+            # progress is only informational, a failed write must not fail the generation
+            logging.exception(e)
+
+    control = GenerationControl(write_progress if sid else None)
+
     def task():
         target = tempfile.TemporaryDirectory()
         playercount = len(gen_options)
@@ -169,9 +199,10 @@ def gen_game(gen_options: dict, meta: dict[str, Any] | None = None, owner=None,
             args.name[player] = handle_name(args.name[player], player, name_counter)
         if len(set(args.name.values())) != len(args.name):
             raise Exception(f"Names have to be unique. Names: {Counter(args.name.values())}")
-        ERmain(args, seed, baked_server_options=meta["server_options"])
+        output = MemoryOutputSink()
+        ERmain(args, seed, baked_server_options=meta["server_options"], control=control, output_sink=output)
 
-        return upload_to_db(target.name, sid, owner, race)
+        return upload_to_db(output.files, sid, owner, race)
 
     thread_pool = DaemonThreadPoolExecutor(max_workers=1)
     thread = thread_pool.submit(task)
@@ -179,6 +210,7 @@ def gen_game(gen_options: dict, meta: dict[str, Any] | None = None, owner=None,
     try:
         return thread.result(timeout)
     except concurrent.futures.TimeoutError as e:
+        control.cancel()
         if sid:
             with db_session:
                 gen = Generation.get(id=sid)
@@ -190,6 +222,8 @@ def gen_game(gen_options: dict, meta: dict[str, Any] | None = None, owner=None,
                                      format_exception(e))
                     gen.meta = json.dumps(meta)
                     commit()
+        # wait for the generation to notice, so that it doesn't keep using this worker's time and memory
+        concurrent.futures.wait([thread], CANCEL_GRACE_TIME)
     except (KeyboardInterrupt, SystemExit):
         # don't update db, retry next time
         raise
@@ -206,8 +240,8 @@ def gen_game(gen_options: dict, meta: dict[str, Any] | None = None, owner=None,
         raise
     finally:
         # free resources claimed by thread pool, if possible
-        # NOTE: Timeout depends on the process being killed at some point
-        #       since we can't actually cancel a running gen at the moment.
+        # NOTE: a timed out gen is cancelled, but only stops at its next check. If it is stuck somewhere without checks,
+        #       this depends on the process being killed at some point.
         thread_pool.shutdown(wait=False, cancel_futures=True)
 
 
@@ -228,19 +262,26 @@ def wait_seed(seed: UUID):
     return render_template("waitSeed.html", seed_id=seed_id)
 
 
-def upload_to_db(folder, sid, owner, race):
-    for file in os.listdir(folder):
-        file = os.path.join(folder, file)
-        if file.endswith(".zip"):
-            with db_session:
-                with zipfile.ZipFile(file) as zfile:
-                    res = upload_zip_to_db(zfile, owner, {"race": race}, sid)
-                if type(res) == "str":
-                    raise Exception(res)
-                elif res:
-                    seed = res
-                    gen = Generation.get(id=seed.id)
-                    if gen is not None:
-                        gen.delete()
-                    return seed.id
-    raise Exception("Generation zipfile not found.")
+class MemoryOutputSink(OutputSink):
+    """Keeps the output files of a generation in memory, to upload them without creating an archive first."""
+    files: list[tuple[str, bytes]]
+
+    def __init__(self) -> None:
+        self.files = []
+
+    def add_data(self, name: str, data: bytes) -> None:
+        self.files.append((name, data))
+
+
+def upload_to_db(files: list[tuple[str, bytes]], sid, owner, race):
+    with db_session:
+        res = upload_files_to_db([(name, lambda data=data: data) for name, data in files], owner, {"race": race}, sid)
+        if isinstance(res, str):
+            raise Exception(res)
+        elif res:
+            seed = res
+            gen = Generation.get(id=seed.id)
+            if gen is not None:
+                gen.delete()
+            return seed.id
+    raise Exception("Generation multidata not found.")
@@ -31,6 +31,13 @@ class Room(db.Entity):
     tracker = Optional(UUID, index=True)
     # Port special value -1 means the server errored out. Another attempt can be made with a page refresh
     last_port = Optional(int, default=lambda: 0)
+    tracker_projection = Optional('TrackerProjection', cascade_delete=True)
+
+
+class TrackerProjection(db.Entity):
+    # written together with Room.multisave; a separate table, so existing Room tables don't need a new column
+    room = PrimaryKey(Room)
+    data = Required(bytes)  # see tracker_projection.py
 
 
 class Seed(db.Entity):
@@ -0,0 +1,64 @@
+"""
+Compact, read-only form of the static server data, written once by the autolauncher and memory-mapped by each room
+hosting process. The id <-> name tables of all installed games, packed like in DataPackageTables, then live in the
+shared page cache, instead of every process holding its own copy as Python objects, and names are only decoded when
+they are looked up.
+"""
+from __future__ import annotations
+
+import mmap
+import os
+import pickle
+import struct
+import typing
+
+from DataPackageTables import IdToNameTable, NameToIdTable, align, pack_table, table_keys
+
+__all__ = ["NameToIdTable", "IdToNameTable", "write_static_data", "load_static_data"]
+
+_MAGIC = b"APSTATIC"
+_VERSION = 1
+_header = struct.Struct("<8sII")
+
+
+def write_static_data(path: str, static_server_data: typing.Dict[str, typing.Any]) -> None:
+    """
+    Writes static server data to path, with the id <-> name tables of each game package packed into sorted arrays.
+
+    :param path: The file to (atomically) replace.
+    :param static_server_data: The data as returned by get_static_server_data.
+    """
+    tables = bytearray()
+    games = {}
+    for game, package in static_server_data["gamespackage"].items():
+        games[game] = {key: pack_table(tables, value) if key in table_keys else value
+                       for key, value in package.items()}
+    index = pickle.dumps({**static_server_data, "gamespackage": games}, pickle.HIGHEST_PROTOCOL)
+    header_size = _header.size + len(index)
+
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(_header.pack(_MAGIC, _VERSION, len(index)))
+        f.write(index)
+        f.write(bytes(align(header_size) - header_size))
+        f.write(tables)
+    os.replace(temp_path, path)
+
+
+def load_static_data(path: str) -> typing.Dict[str, typing.Any]:
+    """
+    Maps a file written by write_static_data. The game packages in the returned data hold NameToIdTables,
+    which are backed by the mapping, in place of the name to id dicts.
+    """
+    with open(path, "rb") as f:
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, index_size = _header.unpack_from(data)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError(f"{path} is not a static data file of version {_VERSION}.")
+    static_server_data = pickle.loads(data[_header.size:_header.size + index_size])
+    buffer = memoryview(data)[align(_header.size + index_size):]
+    for package in static_server_data["gamespackage"].values():
+        for key in table_keys:
+            if key in package:
+                package[key] = NameToIdTable(buffer, *package[key])
+    return static_server_data
@@ -1,5 +1,6 @@
 import datetime
 import collections
+import functools
 from dataclasses import dataclass
 from typing import Any, Callable, Dict, List, Optional, Set, Tuple, NamedTuple, Counter
 from uuid import UUID
@@ -12,7 +13,8 @@ from MultiServer import Context, get_saving_second
 from NetUtils import ClientStatus, Hint, NetworkItem, NetworkSlot, SlotType
 from Utils import restricted_loads, KeyedDefaultDict
 from . import app, cache
-from .models import GameDataPackage, Room
+from .models import GameDataPackage, Room, TrackerProjection
+from .tracker_projection import dump_projection, load_projection, project_multidata, project_multisave
 
 # Multisave is currently updated, at most, every minute.
 TRACKER_CACHE_TIMEOUT_IN_SECONDS = 60
@@ -40,24 +42,52 @@ def _cache_results(func: Callable) -> Callable:
     return method_wrapper
 
 
+@functools.lru_cache(maxsize=128)
+def _get_data_package_tables(checksum: str) -> Tuple[Dict[int, str], Dict[int, str], Dict[str, int], Dict[str, int]]:
+    """Retrieves the id to name and name to id tables of items and locations of a stored data package.
+
+    Data packages never change for a checksum, so the tables are shared by all trackers of this process.
+    """
+    game_package = restricted_loads(GameDataPackage.get(checksum=checksum).data)
+    return (
+        {id: name for name, id in game_package["item_name_to_id"].items()},
+        {id: name for name, id in game_package["location_name_to_id"].items()},
+        game_package["item_name_to_id"],
+        game_package["location_name_to_id"],
+    )
+
+
 @dataclass
 class TrackerData:
     """A helper dataclass that is instantiated each time an HTTP request comes in for tracker data.
 
     Provides helper methods to lazily load necessary data that each tracker require and caches any results so any
     subsequent helper method calls do not need to recompute results during the lifetime of this instance.
+
+    Most data is read from the room's tracker projection, the multidata and multisave are only loaded if a tracker
+    needs data that is not in it.
     """
     room: Room
-    _multidata: Dict[str, Any]
-    _multisave: Dict[str, Any]
+    _projection: Dict[str, Any]
     _tracker_cache: Dict[str, Any]
 
     def __init__(self, room: Room):
         """Initialize a new RoomMultidata object for the current room."""
         self.room = room
-        self._multidata = Context.decompress(room.seed.multidata)
-        self._multisave = restricted_loads(room.multisave) if room.multisave else {}
         self._tracker_cache = {}
+        projection = load_projection(room.tracker_projection.data) if room.tracker_projection else None
+        if projection is None:
+            # rooms that did not save since projections were introduced, or that never saved at all,
+            # stored with this request, so that later requests can read it until the room's server saves again
+            multidata_projection = project_multidata(self._multidata)
+            multisave_projection = project_multisave(self._multisave)
+            projection = {**multidata_projection, **multisave_projection}
+            data = dump_projection(multidata_projection, multisave_projection)
+            if room.tracker_projection:
+                room.tracker_projection.data = data
+            else:
+                TrackerProjection(room=room, data=data)
+        self._projection = projection
 
         self.item_name_to_id: Dict[str, Dict[str, int]] = {}
         self.location_name_to_id: Dict[str, Dict[str, int]] = {}
@@ -69,20 +99,29 @@ class TrackerData:
         self.location_id_to_name: Dict[str, Dict[int, str]] = KeyedDefaultDict(lambda game_name: {
             game_name: KeyedDefaultDict(lambda code: f"Unknown Game {game_name} - Location (ID: {code})")
         })
-        for game, game_package in self._multidata["datapackage"].items():
-            game_package = restricted_loads(GameDataPackage.get(checksum=game_package["checksum"]).data)
-            self.item_id_to_name[game] = KeyedDefaultDict(lambda code: f"Unknown Item (ID: {code})", {
-                id: name for name, id in game_package["item_name_to_id"].items()})
-            self.location_id_to_name[game] = KeyedDefaultDict(lambda code: f"Unknown Location (ID: {code})", {
-                id: name for name, id in game_package["location_name_to_id"].items()})
+        for game, game_package in self._projection["datapackage"].items():
+            item_id_to_name, location_id_to_name, item_name_to_id, location_name_to_id = \
+                _get_data_package_tables(game_package["checksum"])
+            # copied, as looking up unknown ids adds them
+            self.item_id_to_name[game] = KeyedDefaultDict(lambda code: f"Unknown Item (ID: {code})", item_id_to_name)
+            self.location_id_to_name[game] = KeyedDefaultDict(lambda code: f"Unknown Location (ID: {code})",
+                                                              location_id_to_name)
 
             # Normal lookup tables as well.
-            self.item_name_to_id[game] = game_package["item_name_to_id"]
-            self.location_name_to_id[game] = game_package["location_name_to_id"]
+            self.item_name_to_id[game] = item_name_to_id
+            self.location_name_to_id[game] = location_name_to_id
+
+    @functools.cached_property
+    def _multidata(self) -> Dict[str, Any]:
+        return Context.decompress(self.room.seed.multidata)
+
+    @functools.cached_property
+    def _multisave(self) -> Dict[str, Any]:
+        return restricted_loads(self.room.multisave) if self.room.multisave else {}
 
     def get_seed_name(self) -> str:
         """Retrieves the seed name."""
-        return self._multidata["seed_name"]
+        return self._projection["seed_name"]
 
     def get_slot_data(self, player: int) -> Dict[str, Any]:
         """Retrieves the slot data for a given player."""
@@ -90,7 +129,7 @@ class TrackerData:
 
     def get_slot_info(self, player: int) -> NetworkSlot:
         """Retrieves the NetworkSlot data for a given player."""
-        return self._multidata["slot_info"][player]
+        return self._projection["slot_info"][player]
 
     def get_player_name(self, player: int) -> str:
         """Retrieves the slot name for a given player."""
@@ -104,13 +143,17 @@ class TrackerData:
         """Retrieves all locations with their containing item's metadata for a given player."""
         return self._multidata["locations"][player]
 
+    def get_player_locations_count(self, player: int) -> int:
+        """Retrieves the amount of locations for a given player."""
+        return self._projection["location_counts"][player]
+
     def get_player_starting_inventory(self, player: int) -> List[int]:
         """Retrieves a list of all item codes a given slot starts with."""
-        return self._multidata["precollected_items"][player]
+        return self._projection["precollected_items"][player]
 
     def get_player_checked_locations(self, team: int, player: int) -> Set[int]:
         """Retrieves the set of all locations marked complete by this player."""
-        return self._multisave.get("location_checks", {}).get((team, player), set())
+        return self._projection["location_checks"].get((team, player), set())
 
     @_cache_results
     def get_player_missing_locations(self, team: int, player: int) -> Set[int]:
@@ -119,16 +162,14 @@ class TrackerData:
 
     def get_player_received_items(self, team: int, player: int) -> List[NetworkItem]:
         """Returns all items received to this player in order of received."""
-        return self._multisave.get("received_items", {}).get((team, player, True), [])
+        return self._projection["received_items"].get((team, player), [])
 
     @_cache_results
     def get_player_inventory_counts(self, team: int, player: int) -> collections.Counter:
         """Retrieves a dictionary of all items received by their id and their received count."""
         received_items = self.get_player_received_items(team, player)
         starting_items = self.get_player_starting_inventory(player)
-        inventory = collections.Counter()
-        for item in received_items:
-            inventory[item.item] += 1
+        inventory = collections.Counter(network_item.item for network_item in received_items)
         for item in starting_items:
             inventory[item] += 1
 
@@ -137,7 +178,7 @@ class TrackerData:
     @_cache_results
     def get_player_hints(self, team: int, player: int) -> Set[Hint]:
         """Retrieves a set of all hints relevant for a particular player."""
-        return self._multisave.get("hints", {}).get((team, player), set())
+        return self._projection["hints"].get((team, player), set())
 
     @_cache_results
     def get_player_last_activity(self, team: int, player: int) -> Optional[datetime.timedelta]:
@@ -148,11 +189,11 @@ class TrackerData:
 
     def get_player_client_status(self, team: int, player: int) -> ClientStatus:
         """Retrieves the ClientStatus of a particular player."""
-        return self._multisave.get("client_game_state", {}).get((team, player), ClientStatus.CLIENT_UNKNOWN)
+        return self._projection["client_game_state"].get((team, player), ClientStatus.CLIENT_UNKNOWN)
 
     def get_player_alias(self, team: int, player: int) -> Optional[str]:
         """Returns the alias of a particular player, if any."""
-        return self._multisave.get("name_aliases", {}).get((team, player), None)
+        return self._projection["name_aliases"].get((team, player), None)
 
     @_cache_results
     def get_team_completed_worlds_count(self) -> Dict[int, int]:
@@ -178,7 +219,7 @@ class TrackerData:
     def get_team_locations_total_count(self) -> Dict[int, int]:
         """Retrieves a dictionary of total player locations each team has."""
         return {
-            team: sum(len(self.get_player_locations(player)) for player in players)
+            team: sum(self.get_player_locations_count(player) for player in players)
             for team, players in self.get_all_players().items()
         }
 
@@ -197,7 +238,7 @@ class TrackerData:
         """Retrieves a dictionary of all players ids on each team."""
         return {
             0: [
-                player for player, slot_info in self._multidata["slot_info"].items()
+                player for player, slot_info in self._projection["slot_info"].items()
             ]
         }
 
@@ -208,7 +249,7 @@ class TrackerData:
         """Retrieves a dictionary of all player slot-type players ids on each team."""
         return {
             0: [
-                player for player, slot_info in self._multidata["slot_info"].items()
+                player for player, slot_info in self._projection["slot_info"].items()
                 if self.get_slot_info(player).type == SlotType.player
             ]
         }
@@ -229,6 +270,14 @@ class TrackerData:
             for team, players in self.get_all_players().items() for player in players
         }
 
+    @_cache_results
+    def get_room_locations_count(self) -> Dict[TeamPlayer, int]:
+        """Retrieves a dictionary of the amount of locations per player."""
+        return {
+            (team, player): self.get_player_locations_count(player)
+            for team, players in self.get_all_players().items() for player in players
+        }
+
     @_cache_results
     def get_room_games(self) -> Dict[TeamPlayer, str]:
         """Retrieves a dictionary of games for each player."""
@@ -274,11 +323,31 @@ class TrackerData:
         """
         last_activity: Dict[TeamPlayer, datetime.timedelta] = {}
         now = datetime.datetime.utcnow()
-        for (team, player), timestamp in self._multisave.get("client_activity_timers", []):
+        for (team, player), timestamp in self._projection["client_activity_timers"]:
             last_activity[team, player] = now - datetime.datetime.utcfromtimestamp(timestamp)
 
         return last_activity
 
+    @_cache_results
+    def get_room_activity_timestamps(self) -> Dict[TeamPlayer, float]:
+        """Retrieves a dictionary of all players and the POSIX timestamp of their last activity.
+        Does not include players who have no activity recorded.
+        """
+        return {(team, player): timestamp for (team, player), timestamp
+                in self._projection["client_activity_timers"]}
+
+    @_cache_results
+    def get_room_connection_timestamps(self) -> Dict[TeamPlayer, float]:
+        """Retrieves a dictionary of all players and the POSIX timestamp of their last connection.
+        Does not include players who never connected.
+        """
+        return {(team, player): timestamp for (team, player), timestamp
+                in self._projection["client_connection_timers"]}
+
+    def get_room_datapackage(self) -> Dict[str, Dict[str, Any]]:
+        """Retrieves the data package checksums of each game in this room."""
+        return self._projection["datapackage"]
+
     @_cache_results
     def get_room_videos(self) -> Dict[TeamPlayer, Tuple[str, str]]:
         """Retrieves a dictionary of any players who have video streaming enabled and their feeds.
@@ -286,7 +355,7 @@ class TrackerData:
         Only supported platforms are Twitch and YouTube.
         """
         video_feeds = {}
-        for (team, player), video_data in self._multisave.get("video", []):
+        for (team, player), video_data in self._projection["video"]:
             video_feeds[team, player] = video_data
 
         return video_feeds
@@ -449,7 +518,7 @@ def render_generic_multiworld_tracker(tracker_data: TrackerData, enabled_tracker
         get_slot_info=tracker_data.get_slot_info,
         all_slots=tracker_data.get_all_slots(),
         room_players=tracker_data.get_all_players(),
-        locations=tracker_data.get_room_locations(),
+        locations_count=tracker_data.get_room_locations_count(),
         locations_complete=tracker_data.get_room_locations_complete(),
         total_team_locations=tracker_data.get_team_locations_total_count(),
         total_team_locations_complete=tracker_data.get_team_locations_checked_count(),
@@ -510,7 +579,7 @@ if "Factorio" in network_data_package["games"]:
             get_slot_info=tracker_data.get_slot_info,
             all_slots=tracker_data.get_all_slots(),
             room_players=tracker_data.get_all_players(),
-            locations=tracker_data.get_room_locations(),
+            locations_count=tracker_data.get_room_locations_count(),
             locations_complete=tracker_data.get_room_locations_complete(),
             total_team_locations=tracker_data.get_team_locations_total_count(),
             total_team_locations_complete=tracker_data.get_team_locations_checked_count(),
@@ -643,7 +712,7 @@ if "A Link to the Past" in network_data_package["games"]:
             get_slot_info=tracker_data.get_slot_info,
             all_slots=tracker_data.get_all_slots(),
             room_players=tracker_data.get_all_players(),
-            locations=tracker_data.get_room_locations(),
+            locations_count=tracker_data.get_room_locations_count(),
             locations_complete=tracker_data.get_room_locations_complete(),
             total_team_locations=tracker_data.get_team_locations_total_count(),
             total_team_locations_complete=tracker_data.get_team_locations_checked_count(),
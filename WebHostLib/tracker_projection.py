@@ -0,0 +1,60 @@
+"""
+Compact projection of the parts of a room's multidata and multisave the trackers show, written by the room's server
+whenever it saves, so that tracker requests don't have to decompress the multidata and unpickle the whole multisave.
+"""
+from __future__ import annotations
+
+import pickle
+import typing
+
+from Utils import restricted_loads
+
+__all__ = ["PROJECTION_VERSION", "project_multidata", "project_multisave", "dump_projection", "load_projection"]
+
+PROJECTION_VERSION = 2
+"""Increase when the content of projections changes, so that older projections are rebuilt instead of read."""
+
+
+def project_multidata(multidata: typing.Dict[str, typing.Any]) -> typing.Dict[str, typing.Any]:
+    """The parts of a seed's multidata the trackers use, which don't change over the lifetime of a room."""
+    return {
+        "seed_name": multidata["seed_name"],
+        # copied, as the server removes the games it has static data for
+        "datapackage": dict(multidata["datapackage"]),
+        "slot_info": multidata["slot_info"],
+        "location_counts": {player: len(locations) for player, locations in multidata["locations"].items()},
+        "precollected_items": multidata["precollected_items"],
+    }
+
+
+def project_multisave(multisave: typing.Dict[str, typing.Any]) -> typing.Dict[str, typing.Any]:
+    """The parts of a room's multisave the trackers use."""
+    return {
+        "location_checks": multisave.get("location_checks", {}),
+        "received_items": {
+            (team, player): items
+            for (team, player, remote), items in multisave.get("received_items", {}).items() if remote
+        },
+        "hints": multisave.get("hints", {}),
+        "client_game_state": multisave.get("client_game_state", {}),
+        "name_aliases": multisave.get("name_aliases", {}),
+        "client_activity_timers": multisave.get("client_activity_timers", ()),
+        "client_connection_timers": multisave.get("client_connection_timers", ()),
+        "video": multisave.get("video", []),
+    }
+
+
+def dump_projection(multidata_projection: typing.Dict[str, typing.Any],
+                    multisave_projection: typing.Dict[str, typing.Any]) -> bytes:
+    return pickle.dumps({"version": PROJECTION_VERSION, **multidata_projection, **multisave_projection},
+                        pickle.HIGHEST_PROTOCOL)
+
+
+def load_projection(data: typing.Optional[bytes]) -> typing.Optional[typing.Dict[str, typing.Any]]:
+    """Loads a dumped projection, or returns None if there is none or it was written in another version."""
+    if not data:
+        return None
+    projection = restricted_loads(data)
+    if projection.get("version") != PROJECTION_VERSION:
+        return None
+    return projection
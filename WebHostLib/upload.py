@@ -95,63 +95,71 @@ def process_multidata(compressed_multidata, files={}):
 
 
 def upload_zip_to_db(zfile: zipfile.ZipFile, owner=None, meta={"race": False}, sid=None):
-    if not owner:
-        owner = session["_id"]
     infolist = zfile.infolist()
     if all(allowed_options(file.filename) or file.is_dir() for file in infolist):
         flash(Markup("Error: Your .zip file only contains options files. "
                      'Did you mean to <a href="/generate">generate a game</a>?'))
         return
 
+    return upload_files_to_db([(file.filename, lambda file=file: zfile.open(file, "r").read()) for file in infolist],
+                              owner, meta, sid)
+
+
+def upload_files_to_db(files_to_load: typing.Iterable[typing.Tuple[str, typing.Callable[[], bytes]]], owner=None,
+                       meta={"race": False}, sid=None):
+    """Creates a seed from the output files of a generation, given as their file name and a function reading them."""
+    if not owner:
+        owner = session["_id"]
+
     spoiler = ""
     files = {}
     multidata = None
 
     # Load files.
-    for file in infolist:
-        handler = AutoPatchRegister.get_handler(file.filename)
-        if banned_file(file.filename):
+    for filename, read in files_to_load:
+        handler = AutoPatchRegister.get_handler(filename)
+        if banned_file(filename):
             return "Uploaded data contained a rom file, which is likely to contain copyrighted material. " \
                    "Your file was deleted."
 
         # AP Container
         elif handler:
-            data = zfile.open(file, "r").read()
+            data = read()
             with zipfile.ZipFile(BytesIO(data)) as container:
                 player = json.loads(container.open("archipelago.json").read())["player"]
             files[player] = data
 
         # Spoiler
-        elif file.filename.endswith(".txt"):
-            spoiler = zfile.open(file, "r").read().decode("utf-8-sig")
+        elif filename.endswith(".txt"):
+            spoiler = read().decode("utf-8-sig")
 
         # Multi-data
-        elif file.filename.endswith(".archipelago"):
+        elif filename.endswith(".archipelago"):
             try:
-                multidata = zfile.open(file).read()
+                multidata = read()
             except:
                 flash("Could not load multidata. File may be corrupted or incompatible.")
                 multidata = None
 
 
         # Factorio
-        elif file.filename.endswith(".zip"):
+        elif filename.endswith(".zip"):
             try:
-                _, _, slot_id, *_ = file.filename.split('_')[0].split('-', 3)
+                _, _, slot_id, *_ = filename.split('_')[0].split('-', 3)
             except ValueError:
-                flash("Error: Unexpected file found in .zip: " + file.filename)
+                flash("Error: Unexpected file found in .zip: " + filename)
                 return
-            data = zfile.open(file, "r").read()
+            data = read()
             files[int(slot_id[1:])] = data
 
         # All other files using the standard MultiWorld.get_out_file_name_base method
         else:
             try:
-                _, _, slot_id, *_ = file.filename.split('.')[0].split('_', 3)
+                _, _, slot_id, *_ = filename.split('.')[0].split('_', 3)
             except ValueError:
-                flash("Error: Unexpected file found in .zip: " + file.filename)
+                flash("Error: Unexpected file found in .zip: " + filename)
                 return
-            data = zfile.open(file, "r").read()
+            data = read()
             files[int(slot_id[1:])] = data
 
     # Load multi data.
@@ -0,0 +1,148 @@
+"""
+Cached index of the installed worlds.
+
+Importing the worlds package imports every world, which dominates the startup of every entry point. The index records
+what entry points need to know about each world without importing it - its game, version, data package and the import
+paths of its classes - and is stored in the cache directory, keyed on the modification times and sizes of all world
+files. Entry points can then serve data packages from the index, or restrict the import of the worlds package to the
+worlds they actually use with `restrict_world_loading`.
+"""
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import importlib.util
+import logging
+import os
+import pickle
+import sys
+from typing import AbstractSet, Dict, FrozenSet, Iterable, Optional
+
+from NetUtils import GamesPackage
+from Utils import Version, __version__, cache_path, local_path, user_path
+
+__all__ = ["IndexedWorld", "get_world_index", "restrict_world_loading", "world_sources_to_load"]
+
+world_sources_to_load: Optional[AbstractSet[str]] = None
+"""Names of the world sources the worlds package loads, or None to load all of them."""
+
+_world_index: Optional[Dict[str, IndexedWorld]] = None
+
+
+@dataclasses.dataclass(frozen=True)
+class IndexedWorld:
+    game: str
+    world_version: Version
+    source: str
+    """Name of the world source (folder or .apworld) the world is loaded from."""
+    world_class: str
+    """Import path of the World class."""
+    options_dataclass: str
+    """Import path of the world's options dataclass."""
+    data_package: GamesPackage
+    hint_blacklist: FrozenSet[str]
+
+
+def _get_world_folders() -> list[str]:
+    # same folders the worlds package loads from, found without importing it
+    spec = importlib.util.find_spec("worlds")
+    assert spec and spec.submodule_search_locations, "Could not find the worlds package"
+    local_folder = spec.submodule_search_locations[0]
+    user_folder = user_path("worlds") if user_path() != local_path() else user_path("custom_worlds")
+    return [folder for folder in (user_folder, local_folder) if os.path.isdir(folder)]
+
+
+def _get_index_key() -> str:
+    """Hash of the core version and the modification time and size of every file that could define a world."""
+    key = hashlib.sha256(f"{__version__};{sys.version_info[:2]}".encode("utf-8"))
+    for folder in _get_world_folders():
+        for dirpath, dirnames, filenames in os.walk(folder):
+            dirnames[:] = sorted(dirname for dirname in dirnames
+                                 if dirname != "__pycache__" and not dirname.startswith("."))
+            for filename in sorted(filenames):
+                if filename.startswith("."):
+                    continue
+                stat = os.stat(os.path.join(dirpath, filename))
+                key.update(f"{dirpath}/{filename};{stat.st_mtime_ns};{stat.st_size}\n".encode("utf-8"))
+    return key.hexdigest()
+
+
+def _build_world_index() -> Dict[str, IndexedWorld]:
+    import worlds
+    from worlds.AutoWorld import AutoWorldRegister
+
+    return {
+        game: IndexedWorld(
+            game=game,
+            world_version=world.world_version,
+            source=world.__module__.split(".")[1],
+            world_class=f"{world.__module__}.{world.__qualname__}",
+            options_dataclass=f"{world.options_dataclass.__module__}.{world.options_dataclass.__qualname__}",
+            data_package=worlds.network_data_package["games"][game],
+            hint_blacklist=world.hint_blacklist,
+        )
+        for game, world in AutoWorldRegister.world_types.items()
+        if world.__module__.startswith("worlds.")  # not a world registered by tests
+    }
+
+
+def _read_world_index(path: str, key: str) -> Optional[Dict[str, IndexedWorld]]:
+    try:
+        with open(path, "rb") as f:
+            if pickle.load(f) != key:
+                return None
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logging.debug(f"Could not read world index {path}: {e}")
+        return None
+
+
+def _write_world_index(path: str, key: str, world_index: Dict[str, IndexedWorld]) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as f:
+        pickle.dump(key, f, pickle.HIGHEST_PROTOCOL)
+        pickle.dump(world_index, f, pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_path, path)
+
+
+def get_world_index() -> Dict[str, IndexedWorld]:
+    """
+    Returns the index of all installed worlds by game. Reads the cached index if the worlds did not change since it was
+    written, otherwise imports all worlds and updates the cache.
+    """
+    global _world_index
+    if _world_index is None:
+        path = cache_path("world_index.pickle")
+        key = _get_index_key()
+        world_index = _read_world_index(path, key)
+        if world_index is None:
+            assert world_sources_to_load is None, "Cannot index worlds after restricting which worlds to load"
+            world_index = _build_world_index()
+            try:
+                _write_world_index(path, key, world_index)
+            except OSError as e:
+                logging.warning(f"Could not write world index {path}: {e}")
+        _world_index = world_index
+    return _world_index
+
+
+def restrict_world_loading(games: Iterable[str]) -> bool:
+    """
+    Makes the upcoming import of the worlds package only load the worlds of games, plus the generic world. Does nothing
+    if the worlds package was already imported, or if the index was out of date and all worlds had to be loaded to
+    update it.
+
+    :param games: Games to load. Names without an indexed world are ignored.
+    :return: Whether loading was restricted.
+    """
+    global world_sources_to_load
+    if "worlds" in sys.modules:
+        return False
+    world_index = get_world_index()
+    if "worlds" in sys.modules:
+        return False
+    world_sources_to_load = frozenset({"generic"} | {world_index[game].source for game in games if game in world_index})
+    return True
@@ -14,6 +14,7 @@ from cpython cimport PyObject
 from typing import Any, Dict, Iterable, Iterator, Generator, Sequence, Tuple, TypeVar, Union, Set, List, TYPE_CHECKING
 from cymem.cymem cimport Pool
 from libc.stdint cimport int64_t, uint32_t
+from libc.stdlib cimport free, malloc, qsort
 from collections import defaultdict
 
 cdef extern from *:
@@ -69,6 +70,25 @@ cdef struct IndexEntry:
     size_t count
 
 
+cdef struct ReceivedEntry:
+    # only used while sorting entries for the receiver index
+    ap_player_t receiver
+    ap_id_t item
+    size_t entry
+
+
+cdef int compare_received(const void* a, const void* b) noexcept nogil:
+    cdef const ReceivedEntry* lhs = <const ReceivedEntry*>a
+    cdef const ReceivedEntry* rhs = <const ReceivedEntry*>b
+    if lhs.receiver != rhs.receiver:
+        return -1 if lhs.receiver < rhs.receiver else 1
+    if lhs.item != rhs.item:
+        return -1 if lhs.item < rhs.item else 1
+    if lhs.entry != rhs.entry:
+        return -1 if lhs.entry < rhs.entry else 1
+    return 0
+
+
 if TYPE_CHECKING:
     State = Dict[Tuple[int, int], Set[int]]
 else:
@@ -92,6 +112,9 @@ cdef class LocationStore:
     cdef size_t entry_count
     cdef IndexEntry* sender_index  # 16KB/1000 players
     cdef size_t sender_index_size
+    cdef size_t* received  # 800KB/100k items, indices into entries sorted by receiver, item, sender and location
+    cdef IndexEntry* receiver_index  # 16KB/1000 players, range of received per receiver
+    cdef size_t receiver_index_size
     cdef list _keys  # ~36KB/1000 players, speed up iter (28 per int + 8 per list entry)
     cdef list _items  # ~64KB/1000 players, speed up items (56 per tuple + 8 per list entry)
     cdef list _proxies  # ~92KB/1000 players, speed up self[player] (56 per struct + 28 per len + 8 per list entry)
@@ -100,7 +123,8 @@ cdef class LocationStore:
     def get_size(self):
         from sys import getsizeof
         size = getsizeof(self) + getsizeof(self._mem) + getsizeof(self._len) \
-                + sizeof(LocationEntry) * self.entry_count + sizeof(IndexEntry) * self.sender_index_size
+                + sizeof(LocationEntry) * self.entry_count + sizeof(IndexEntry) * self.sender_index_size \
+                + sizeof(size_t) * self.entry_count + sizeof(IndexEntry) * self.receiver_index_size
         size += getsizeof(self._keys) + getsizeof(self._items) + getsizeof(self._proxies)
         size += sum(sizeof(key) for key in self._keys)
         size += sum(sizeof(item) for item in self._items)
@@ -117,6 +141,7 @@ cdef class LocationStore:
 
         # iterate over everything to get all maxima and validate everything
         cdef size_t max_sender = INVALID_SIZE  # keep track of highest used player id for indexing
+        cdef size_t max_receiver = 0
         cdef size_t sender_count = 0
         cdef size_t count = 0
         for sender, locations in locations_dict.items():
@@ -131,6 +156,7 @@ cdef class LocationStore:
                 receiver = data[1]
                 if receiver < 1 or receiver > MAX_PLAYER_ID:
                     raise ValueError(f"Invalid player id {receiver} for item")
+                max_receiver = max(max_receiver, receiver)
                 count += 1
             sender_count += 1
 
@@ -148,11 +174,14 @@ cdef class LocationStore:
         if count:
             # leaving entries as NULL if there are none, makes potential memory errors more visible
             self.entries = <LocationEntry*>self._mem.alloc(count, sizeof(LocationEntry))
+            self.received = <size_t*>self._mem.alloc(count, sizeof(size_t))
         self.sender_index = <IndexEntry*>self._mem.alloc(max_sender + 1, sizeof(IndexEntry))
+        self.receiver_index = <IndexEntry*>self._mem.alloc(max_receiver + 1, sizeof(IndexEntry))
         self._raw_proxies = <PyObject**>self._mem.alloc(max_sender + 1, sizeof(PyObject*))
 
         assert (not self.entries) == (not count)
         assert self.sender_index
+        assert self.receiver_index
         assert self._raw_proxies
 
         # build entries and index
@@ -172,6 +201,26 @@ cdef class LocationStore:
                 self.sender_index[sender].count += 1
                 i += 1
 
+        # build receiver index, so finding items for a receiver does not have to look at every entry
+        cdef ReceivedEntry* received_entries
+        cdef ap_player_t receiver_id
+        if count:
+            received_entries = <ReceivedEntry*>malloc(count * sizeof(ReceivedEntry))
+            if not received_entries:
+                raise MemoryError()
+            for i in range(count):
+                received_entries[i].receiver = self.entries[i].receiver
+                received_entries[i].item = self.entries[i].item
+                received_entries[i].entry = i
+            qsort(received_entries, count, sizeof(ReceivedEntry), compare_received)
+            for i in range(count):
+                receiver_id = received_entries[i].receiver
+                if not self.receiver_index[receiver_id].count:
+                    self.receiver_index[receiver_id].start = i
+                self.receiver_index[receiver_id].count += 1
+                self.received[i] = received_entries[i].entry
+            free(received_entries)
+
         # build pyobject caches
         self._proxies.append(None)  # player 0
         assert self.sender_index[0].count == 0
@@ -187,6 +236,7 @@ cdef class LocationStore:
             self._raw_proxies[i] = <PyObject*>proxy
 
         self.sender_index_size = max_sender + 1
+        self.receiver_index_size = max_receiver + 1
         self.entry_count = count
         self._len = sender_count
 
@@ -215,47 +265,82 @@ cdef class LocationStore:
         return self._items
 
     # specialized accessors
+    cdef IndexEntry _find_received(self, ap_player_t receiver, ap_id_t item) noexcept nogil:
+        """Returns the range of received with the item for receiver."""
+        cdef IndexEntry found
+        found.start = 0
+        found.count = 0
+        if receiver >= self.receiver_index_size:
+            return found
+        # binary search for the first entry of the item, received is sorted by item per receiver
+        cdef size_t l = self.receiver_index[receiver].start
+        cdef size_t e = l + self.receiver_index[receiver].count
+        cdef size_t r = e
+        cdef size_t m
+        while l < r:
+            m = (l + r) // 2
+            if self.entries[self.received[m]].item < item:
+                l = m + 1
+            else:
+                r = m
+        found.start = l
+        while l < e and self.entries[self.received[l]].item == item:
+            l += 1
+        found.count = l - found.start
+        return found
+
     def find_item(self, slots: Set[int], seeked_item_id: int) -> Generator[Tuple[int, int, int, int, int], None, None]:
         cdef ap_id_t item = seeked_item_id
         cdef ap_player_t receiver
         cdef ap_player_set* receivers
         cdef size_t slot_count = len(slots)
+        cdef IndexEntry found
+        cdef LocationEntry* entry
+        cdef size_t i
         if slot_count == 1:
             # specialized implementation for single slot
             receiver = list(slots)[0]
-            with nogil:
-                for entry in self.entries[:self.entry_count]:
-                    if entry.item == item and entry.receiver == receiver:
-                        with gil:
-                            yield entry.sender, entry.location, entry.item, entry.receiver, entry.flags
+            found = self._find_received(receiver, item)
+            for i in range(found.start, found.start + found.count):
+                entry = self.entries + self.received[i]
+                yield entry.sender, entry.location, entry.item, entry.receiver, entry.flags
         elif slot_count:
             # generic implementation with lookup in set
             receivers = ap_player_set_new(min(1023, slot_count))  # limit top level struct to 16KB
             if not receivers:
                 raise MemoryError()
+            matches = []
             try:
                 for receiver in slots:
                     if not ap_player_set_add(receivers, receiver):
                         raise MemoryError()
-                with nogil:
-                    for entry in self.entries[:self.entry_count]:
-                        if entry.item == item and ap_player_set_contains(receivers, entry.receiver):
-                            with gil:
-                                yield entry.sender, entry.location, entry.item, entry.receiver, entry.flags
+                for receiver in range(1, self.receiver_index_size):
+                    if ap_player_set_contains(receivers, receiver):
+                        found = self._find_received(receiver, item)
+                        for i in range(found.start, found.start + found.count):
+                            matches.append(self.received[i])
             finally:
                 ap_player_set_free(receivers)
+            matches.sort()  # yield in the same order as iterating all entries would
+            for i in matches:
+                entry = self.entries + i
+                yield entry.sender, entry.location, entry.item, entry.receiver, entry.flags
 
     def get_for_player(self, slot: int) -> Dict[int, Set[int]]:
         cdef ap_player_t receiver = slot
+        cdef LocationEntry* entry
+        cdef size_t i
         all_locations: Dict[int, Set[int]] = {}
-        with nogil:
-            for entry in self.entries[:self.entry_count]:
-                if entry.receiver == receiver:
-                    with gil:
-                        sender: int = entry.sender
-                        if sender not in all_locations:
-                            all_locations[sender] = set()
-                        all_locations[sender].add(entry.location)
+        if receiver >= self.receiver_index_size:
+            return all_locations
+        cdef size_t start = self.receiver_index[receiver].start
+        cdef size_t count = self.receiver_index[receiver].count
+        for i in range(start, start + count):
+            entry = self.entries + self.received[i]
+            sender: int = entry.sender
+            if sender not in all_locations:
+                all_locations[sender] = set()
+            all_locations[sender].add(entry.location)
         return all_locations
 
     def get_checked(self, state: State, team: int, slot: int) -> List[int]:
@@ -180,14 +180,20 @@ class ERPlacementState:
     """A lookup table of all unconnected ER targets"""
     coupled: bool
     """Whether entrance randomization is operating in coupled mode"""
+    _sweep_all_players: bool
+    """Whether sweeps have to go through every player's locations, as some world declared cross-world logic"""
+    _speculative_state: tuple[Entrance, Entrance, CollectionState] | None
+    """The last successful speculative connection and the state it was tested with, to reuse if it is placed"""
 
     def __init__(self, world: World, entrance_lookup: EntranceLookup, coupled: bool):
         self.placements = []
         self.pairings = []
         self.world = world
         self.coupled = coupled
-        self.collection_state = world.multiworld.get_all_state(False, True)
+        self.collection_state = world.multiworld.get_all_state(allow_partial_entrances=True)
         self.entrance_lookup = entrance_lookup
+        self._sweep_all_players = any(other.cross_world_logic for other in world.multiworld.worlds.values())
+        self._speculative_state = None
 
     @property
     def placed_regions(self) -> set[Region]:
@@ -206,6 +212,27 @@ class ERPlacementState:
         self.world.random.shuffle(placeable_randomized_exits)
         return placeable_randomized_exits
 
+    def sweep_for_advancements(self, state: CollectionState | None = None) -> None:
+        """
+        Sweeps a state for the advancements which became reachable after placing entrances. Only the randomizing
+        player's locations are swept, as other players' worlds can't depend on this player's region graph, unless a
+        world declared cross-world logic or this player's locations hold advancements for other players.
+
+        :param state: The state to sweep, defaulting to the state backing the entrance randomization.
+        """
+        if state is None:
+            state = self.collection_state
+        if self._sweep_all_players:
+            state.sweep_for_advancements()
+            return
+        player = self.world.player
+        locations = [location for location in self.world.multiworld.get_locations(player) if location.advancement]
+        for location in locations:
+            if location.item.player != player:
+                state.sweep_for_advancements()
+                return
+        state.sweep_for_advancements(locations)
+
     def _connect_one_way(self, source_exit: Entrance, target_entrance: Entrance) -> None:
         target_region = target_entrance.connected_region
 
@@ -219,14 +246,20 @@ class ERPlacementState:
 
     def test_speculative_connection(self, source_exit: Entrance, target_entrance: Entrance,
                                     usable_exits: set[Entrance]) -> bool:
+        self._speculative_state = None
+        # the simulated connection is only exact if the source exit is actually reachable, only then the state can be
+        # reused once the connection is placed
+        exact = source_exit.can_reach(self.collection_state)
         copied_state = self.collection_state.copy()
         # simulated connection. A real connection is unsafe because the region graph is shallow-copied and would
         # propagate back to the real multiworld.
-        copied_state.reachable_regions[self.world.player].add(target_entrance.connected_region)
+        target_region = target_entrance.connected_region
+        copied_state.reachable_regions[self.world.player].add(target_region)
         copied_state.blocked_connections[self.world.player].remove(source_exit)
-        copied_state.blocked_connections[self.world.player].update(target_entrance.connected_region.exits)
+        copied_state.blocked_connections[self.world.player].update(target_region.exits)
+        copied_state.path[target_region] = (target_region.name, copied_state.path.get(source_exit, None))
         copied_state.update_reachable_regions(self.world.player)
-        copied_state.sweep_for_advancements()
+        self.sweep_for_advancements(copied_state)
         # test that at there are newly reachable randomized exits that are ACTUALLY reachable
         available_randomized_exits = copied_state.blocked_connections[self.world.player]
         for _exit in available_randomized_exits:
@@ -242,9 +275,27 @@ class ERPlacementState:
             # on_connect, which have not happened here (because we didn't do a real connection, and if we did, we would
             # not want them to persist). can_reach is a close enough approximation most of the time.
             if _exit.can_reach(copied_state):
+                if exact:
+                    self._speculative_state = (source_exit, target_entrance, copied_state)
                 return True
         return False
 
+    def _take_speculative_state(self, source_exit: Entrance, target_entrance: Entrance) -> bool:
+        """
+        Replaces the collection state with the state of the speculative connection between source_exit and
+        target_entrance, if that connection was the last one tested successfully and has been placed since.
+
+        :returns: Whether the speculative state was taken
+        """
+        speculative, self._speculative_state = self._speculative_state, None
+        if speculative is None or speculative[0] is not source_exit or speculative[1] is not target_entrance:
+            return False
+        # the real connection may have connected more, e.g. the reverse exit when coupled, so the reachable regions
+        # need an update, but everything behind the new connection is already swept
+        self.collection_state = speculative[2]
+        self.collection_state.stale[self.world.player] = True
+        return True
+
     def connect(
             self,
             source_exit: Entrance,
@@ -400,14 +451,16 @@ def randomize_entrances(
 
     def do_placement(source_exit: Entrance, target_entrance: Entrance) -> None:
         placed_exits, paired_entrances = er_state.connect(source_exit, target_entrance)
+        # if this connection was tested speculatively, continue from the state it was tested with
+        er_state._take_speculative_state(source_exit, target_entrance)
         # propagate new connections
         er_state.collection_state.update_reachable_regions(world.player)
-        er_state.collection_state.sweep_for_advancements()
+        er_state.sweep_for_advancements()
         if on_connect:
             change = on_connect(er_state, placed_exits, paired_entrances)
             if change:
                 er_state.collection_state.update_reachable_regions(world.player)
-                er_state.collection_state.sweep_for_advancements()
+                er_state.sweep_for_advancements()
 
     def needs_speculative_sweep(dead_end: bool, require_new_exits: bool, placeable_exits: list[Entrance]) -> bool:
         # speculative sweep is expensive. We currently only do it as a last resort, if we might cap off the graph
@@ -615,6 +615,7 @@ class ServerOptions(Group):
     multidata: str | None = None
     savefile: str | None = None
     disable_save: bool = False
+    save_journal: bool = False
     loglevel: str = "info"
     logtime: bool = False
     server_password: ServerPassword | None = None
@@ -687,6 +688,41 @@ class GeneratorOptions(Group):
         start_inventory -> Move remaining items to start_inventory, generate additional filler items to fill locations.
         """
 
+    class IncrementalSweep(IntEnum):
+        """
+        Reuse the spheres found in the previous placement round of the main fill when sweeping for the next one,
+        instead of sweeping the whole multiworld from scratch every round. Faster for large multiworlds.
+        """
+        OFF = 0
+        ON = 1
+
+    class OutputProcesses(int):
+        """
+        Amount of processes to run the output jobs of worlds in, such as building roms and patches.
+        0 runs them in the output threads instead, where they can not use more than one core between them.
+        """
+
+    class RollProcesses(int):
+        """
+        Amount of processes to read player files and roll their options in. 0 does both in the generating process.
+        With processes, options are rolled with a random source per player derived from the seed, so the same seed
+        rolls different options than without them.
+        """
+
+    class CachePlayerFiles(IntEnum):
+        """
+        Keep parsed player files in the cache directory, keyed by a hash of their content, so that generating with the
+        same files again does not have to parse them again.
+        """
+        OFF = 0
+        ON = 1
+
+    class OutputCompression(int):
+        """
+        Deflate level of the generated archive from 1 (fastest) to 9 (smallest), or 0 to not compress it at all.
+        Files that are zip archives already, like most patch files, are always stored without compressing them again.
+        """
+
     enemizer_path: EnemizerPath = EnemizerPath("EnemizerCLI/EnemizerCLI.Core")  # + ".exe" is implied on Windows
     player_files_path: PlayerFilesPath = PlayerFilesPath("Players")
     players: Players = Players(0)
@@ -696,6 +732,11 @@ class GeneratorOptions(Group):
     race: Race = Race(0)
     plando_options: PlandoOptions = PlandoOptions("bosses, connections, texts")
     panic_method: PanicMethod = PanicMethod("swap")
+    incremental_sweep: IncrementalSweep = IncrementalSweep(0)
+    output_processes: OutputProcesses = OutputProcesses(0)
+    output_compression: OutputCompression = OutputCompression(9)
+    roll_processes: RollProcesses = RollProcesses(0)
+    cache_player_files: CachePlayerFiles = CachePlayerFiles(0)
     loglevel: str = "info"
     logtime: bool = False
 
@@ -0,0 +1,110 @@
+def run_patch_benchmark(rom_size: int = 0x400000, token_count: int = 50_000) -> None:
+    """
+    Run a benchmark of applying a procedure patch, comparing the in place patch steps, which share one buffer, to the
+    same steps taking and returning bytes.
+
+    :param rom_size: Size of the random data to patch, defaults to the size of a 32 Mbit SNES rom.
+    :param token_count: Amount of random tokens in the token file.
+    """
+    import logging
+    import os
+    import random
+    import tempfile
+    from timeit import timeit
+
+    from Utils import init_logging
+    from worlds.Files import APPatchExtension, APProcedurePatch, APTokenMixin, APTokenTypes
+
+    init_logging("Benchmark Runner")
+    logger = logging.getLogger("Benchmark")
+
+    def apply_tokens_bytes(caller: APProcedurePatch, rom: bytes, token_file: str) -> bytes:
+        """apply_tokens as it was before patching in place"""
+        token_data = caller.get_file(token_file)
+        rom_data = bytearray(rom)
+        token_count = int.from_bytes(token_data[0:4], "little")
+        bpr = 4
+        for _ in range(token_count):
+            token_type = token_data[bpr:bpr + 1][0]
+            offset = int.from_bytes(token_data[bpr + 1:bpr + 5], "little")
+            size = int.from_bytes(token_data[bpr + 5:bpr + 9], "little")
+            data = token_data[bpr + 9:bpr + 9 + size]
+            if token_type in [APTokenTypes.AND_8, APTokenTypes.OR_8, APTokenTypes.XOR_8]:
+                arg = data[0]
+                if token_type == APTokenTypes.AND_8:
+                    rom_data[offset] = rom_data[offset] & arg
+                elif token_type == APTokenTypes.OR_8:
+                    rom_data[offset] = rom_data[offset] | arg
+                else:
+                    rom_data[offset] = rom_data[offset] ^ arg
+            elif token_type in [APTokenTypes.COPY, APTokenTypes.RLE]:
+                length = int.from_bytes(data[:4], "little")
+                value = int.from_bytes(data[4:], "little")
+                if token_type == APTokenTypes.COPY:
+                    rom_data[offset: offset + length] = rom_data[value: value + length]
+                else:
+                    rom_data[offset: offset + length] = bytes([value] * length)
+            else:
+                rom_data[offset:offset + len(data)] = data
+            bpr += 9 + size
+        return bytes(rom_data)
+
+    def calc_snes_crc_bytes(caller: APProcedurePatch, rom: bytes) -> bytes:
+        """calc_snes_crc as it was before patching in place"""
+        rom_data = bytearray(rom)
+        crc = (sum(rom_data[:0x7FDC] + rom_data[0x7FE0:]) + 0x01FE) & 0xFFFF
+        inv = crc ^ 0xFFFF
+        rom_data[0x7FDC:0x7FE0] = [inv & 0xFF, (inv >> 8) & 0xFF, crc & 0xFF, (crc >> 8) & 0xFF]
+        return bytes(rom_data)
+
+    class BenchmarkPatch(APProcedurePatch, APTokenMixin):
+        # no game, so the patch type is not registered
+        hash = None
+        patch_file_ending = ".apbenchmark"
+        procedure = [
+            ("apply_tokens", ["token_data.bin"]),
+            ("calc_snes_crc", []),
+        ]
+
+    random.seed(0)
+    BenchmarkPatch.source_data = random.randbytes(rom_size)
+    patch = BenchmarkPatch()
+    for _ in range(token_count):
+        offset = random.randrange(rom_size - 0x100)
+        kind = random.random()
+        if kind < 0.7:
+            patch.write_token(APTokenTypes.WRITE, offset, random.randbytes(random.randint(1, 64)))
+        elif kind < 0.8:
+            patch.write_token(random.choice((APTokenTypes.AND_8, APTokenTypes.OR_8, APTokenTypes.XOR_8)),
+                              offset, random.randrange(0x100))
+        elif kind < 0.9:
+            patch.write_token(APTokenTypes.RLE, offset, (random.randint(16, 0x100), random.randrange(0x100)))
+        else:
+            patch.write_token(APTokenTypes.COPY, offset, (random.randint(16, 0x100), random.randrange(rom_size - 0x100)))
+    patch.write_file("token_data.bin", patch.get_token_binary())
+
+    def patch_bytes() -> bytes:
+        return calc_snes_crc_bytes(patch, apply_tokens_bytes(patch, BenchmarkPatch.source_data, "token_data.bin"))
+
+    def patch_in_place() -> bytearray:
+        rom = bytearray(BenchmarkPatch.source_data)
+        APPatchExtension.apply_tokens(patch, rom, "token_data.bin")
+        return APPatchExtension.calc_snes_crc(patch, rom)
+
+    assert patch_bytes() == patch_in_place(), "patch steps disagree"
+    with tempfile.TemporaryDirectory() as temp_dir:
+        patch.write(os.path.join(temp_dir, "benchmark.apbenchmark"))
+        patch.patch(os.path.join(temp_dir, "benchmark.sfc"))
+        with open(os.path.join(temp_dir, "benchmark.sfc"), "rb") as f:
+            assert f.read() == patch_bytes(), "patched file differs"
+
+    logger.info(f"Patching {rom_size} bytes with {token_count} tokens:")
+    for name, function in (("bytes", patch_bytes), ("in place", patch_in_place)):
+        duration = min(timeit(function, number=1) for _ in range(5))
+        logger.info(f"  {name:8}: {duration * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    import path_change
+    path_change.change_home()
+    run_patch_benchmark()
@@ -0,0 +1,77 @@
+import itertools
+import random
+import unittest
+
+from worlds import Checksums
+
+
+def n64_crc_reference(rom: bytes) -> bytes:
+    """calculate_crc of the OoT world as it was before using the shared checksums"""
+    t1 = t2 = t3 = t4 = t5 = t6 = 0xDF26F436
+    u32 = 0xFFFFFFFF
+    words = (int.from_bytes(rom[i:i + 4], "big") for i in range(0x1000, 0x101000, 4))
+    words2 = [int.from_bytes(rom[i:i + 4], "big") for i in range(0x750, 0x850, 4)]
+    for d, d2 in zip(words, itertools.cycle(words2)):
+        if ((t6 + d) & u32) < t6:
+            t4 += 1
+        t6 = (t6 + d) & u32
+        t3 ^= d
+        shift = d & 0x1F
+        r = ((d << shift) | (d >> (32 - shift)))
+        t5 += r
+        if t2 > d:
+            t2 ^= r & u32
+        else:
+            t2 ^= t6 ^ d
+        t1 += d2 ^ d
+    return ((t6 ^ t4 ^ t3) & u32).to_bytes(4, "big") + ((t5 ^ t2 ^ t1) & u32).to_bytes(4, "big")
+
+
+class TestChecksums(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = random.Random(0)
+        self.roms = {
+            "random": rng.randbytes(0x101000),
+            "empty": bytes(0x101000),
+            "filled": b"\xFF" * 0x101000,
+            "large": rng.randbytes(0x400000),
+        }
+
+    def test_n64_crc(self) -> None:
+        """Test that the N64 CRC is the same with and without NumPy, and the same as the original implementation."""
+        for name, rom in self.roms.items():
+            with self.subTest(rom=name):
+                crc = n64_crc_reference(rom)
+                self.assertEqual(Checksums.n64_crc(rom, use_numpy=False), crc)
+                self.assertEqual(Checksums.n64_crc(bytearray(rom)), crc)
+                self.assertEqual(Checksums.n64_crc(memoryview(rom)), crc)
+        with self.assertRaises(Exception):
+            Checksums.n64_crc(bytes(0x1000))
+
+    def test_snes_checksum(self) -> None:
+        """Test that the SNES checksum is the same with and without NumPy, and the same as summing the bytes."""
+        for name, rom in self.roms.items():
+            with self.subTest(rom=name):
+                checksum = (sum(rom[:0x7FDC] + rom[0x7FE0:]) + 0x01FE) & 0xFFFF
+                self.assertEqual(Checksums.snes_checksum(rom, use_numpy=False), checksum)
+                self.assertEqual(Checksums.snes_checksum(rom), checksum)
+                for use_numpy in (False, True):
+                    written = bytearray(rom)
+                    Checksums.write_snes_checksum(written, use_numpy)
+                    self.assertEqual(written[0x7FDE] | written[0x7FDF] << 8, checksum)
+                    self.assertEqual(sum(written) & 0xFFFF, checksum)
+        self.assertEqual(Checksums.byte_sum(b""), 0)
+        self.assertEqual(Checksums.byte_sum(b"\xFF" * 0x1000000), 0xFF * 0x1000000)
+        with self.assertRaises(Exception):
+            Checksums.snes_checksum(bytes(0x7FFF))
+
+    @unittest.skipIf(Checksums.np is None, "NumPy is not installed")
+    def test_numpy_used(self) -> None:
+        """Test that the defaults use NumPy if it is installed, so the comparisons above compare both implementations."""
+        from unittest import mock
+
+        rom = self.roms["random"]
+        with mock.patch.object(Checksums, "_n64_crc_python", side_effect=AssertionError):
+            Checksums.n64_crc(rom)
+        with mock.patch.object(Checksums, "_n64_crc_numpy", side_effect=AssertionError):
+            Checksums.n64_crc(rom, use_numpy=False)
@@ -2,7 +2,7 @@ from typing import Callable
 import unittest
 from enum import IntEnum
 
-from BaseClasses import Region, EntranceType, MultiWorld, Entrance
+from BaseClasses import Region, EntranceType, MultiWorld, Entrance, Item, ItemClassification, Location
 from entrance_rando import disconnect_entrance_for_randomization, randomize_entrances, EntranceRandomizationError, \
     ERPlacementState, EntranceLookup, bake_target_group_lookup
 from Options import Accessibility
@@ -271,6 +271,49 @@ class TestDisconnectForRandomization(unittest.TestCase):
         self.assertEqual(2, r2.entrances[0].randomization_group)
 
 
+class TestERPlacementStateSweep(unittest.TestCase):
+    def setUp(self) -> None:
+        self.multiworld = generate_test_multiworld(2)
+        generate_disconnected_region_grid(self.multiworld, 2)
+
+    def create_event(self, location_player: int, item_player: int) -> Location:
+        location = Location(location_player, f"Event {len(self.multiworld.get_locations())}", None,
+                            self.multiworld.get_region("Menu", location_player))
+        location.parent_region.locations.append(location)
+        location.place_locked_item(Item(f"Event Item {location.name}", ItemClassification.progression, None,
+                                        item_player))
+        return location
+
+    def test_sweeps_randomizing_player(self):
+        """tests that only the randomizing player's locations are swept"""
+        er_state = ERPlacementState(self.multiworld.worlds[1], EntranceLookup(self.multiworld.random, False, set(), []),
+                                    False)
+        own_event = self.create_event(1, 1)
+        other_event = self.create_event(2, 2)
+        er_state.sweep_for_advancements()
+        self.assertIn(own_event, er_state.collection_state.advancements)
+        self.assertNotIn(other_event, er_state.collection_state.advancements)
+
+    def test_sweeps_all_players_with_cross_world_items(self):
+        """tests that all locations are swept if the randomizing player's locations hold other players' items"""
+        er_state = ERPlacementState(self.multiworld.worlds[1], EntranceLookup(self.multiworld.random, False, set(), []),
+                                    False)
+        own_event = self.create_event(1, 2)
+        other_event = self.create_event(2, 2)
+        er_state.sweep_for_advancements()
+        self.assertIn(own_event, er_state.collection_state.advancements)
+        self.assertIn(other_event, er_state.collection_state.advancements)
+
+    def test_sweeps_all_players_with_cross_world_logic(self):
+        """tests that all locations are swept if any world declares cross-world logic"""
+        self.multiworld.worlds[2].cross_world_logic = True
+        er_state = ERPlacementState(self.multiworld.worlds[1], EntranceLookup(self.multiworld.random, False, set(), []),
+                                    False)
+        other_event = self.create_event(2, 2)
+        er_state.sweep_for_advancements()
+        self.assertIn(other_event, er_state.collection_state.advancements)
+
+
 class TestRandomizeEntrances(unittest.TestCase):
     def test_determinism(self):
         """tests that the same output is produced for the same input"""
@@ -303,6 +346,22 @@ class TestRandomizeEntrances(unittest.TestCase):
         self.assertEqual(80, len(result.pairings))
         self.assertEqual(80, len(result.placements))
 
+    def test_state_matches_fresh_state(self):
+        """tests that the state after randomization, which reuses speculative sweeps, matches a freshly swept state"""
+        for coupled in (False, True):
+            with self.subTest(coupled=coupled):
+                multiworld = generate_test_multiworld()
+                generate_disconnected_region_grid(multiworld, 5, 1)
+                for location in multiworld.get_locations(1):
+                    location.place_locked_item(Item(f"{location.name} Event", ItemClassification.progression, None, 1))
+
+                result = randomize_entrances(multiworld.worlds[1], coupled, directionally_matched_group_lookup)
+
+                fresh_state = multiworld.get_all_state()
+                self.assertEqual(fresh_state.reachable_regions[1], result.collection_state.reachable_regions[1])
+                self.assertEqual(fresh_state.prog_items[1], result.collection_state.prog_items[1])
+                self.assertEqual(fresh_state.advancements, result.collection_state.advancements)
+
     def test_coupled(self):
         """tests that in coupled mode, all 2 way transitions have an inverse"""
         multiworld = generate_test_multiworld()
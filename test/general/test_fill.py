@@ -3,9 +3,10 @@ import unittest
 
 from Options import Accessibility
 from test.general import generate_items, generate_locations, generate_test_multiworld
-from Fill import FillError, balance_multiworld_progression, fill_restrictive, \
+from Fill import FillError, IncrementalSweep, balance_multiworld_progression, fill_restrictive, \
     distribute_early_items, distribute_items_restrictive
-from BaseClasses import Entrance, LocationProgressType, MultiWorld, Region, Item, Location, \
+from Utils import GenerationCancelled
+from BaseClasses import CollectionState, Entrance, LocationProgressType, MultiWorld, Region, Item, Location, \
     ItemClassification
 from worlds.generic.Rules import CollectionRule, add_item_rule, locality_rules, set_rule
 
@@ -463,6 +464,133 @@ class TestFillRestrictive(unittest.TestCase):
         self.assertEqual(1, len(player1.prog_items))
         self.assertIsNot(loc0.item, player1.prog_items[0], "Filled item was still present in item pool")
 
+    def test_incremental_sweep(self):
+        """Test that keeping the exploration state across placements fills the same as sweeping every time"""
+        def fill(incremental_sweep: bool, track_rule_dependencies: bool = False,
+                 single_player_placement: bool = False) -> List[str]:
+            multiworld = generate_test_multiworld(2)
+            players = [generate_player_data(multiworld, player, 2, prog_item_count=12) for player in (1, 2)]
+            for player in players:
+                multiworld.worlds[player.id].track_rule_dependencies = track_rule_dependencies
+                items = player.prog_items.copy()
+                region = player.menu
+                for i in range(0, 12, 3):
+                    region = player.generate_region(
+                        region, 3, lambda state, required=list(names(items[i:i + 3])), pid=player.id:
+                        state.has_any(required, pid))
+                    set_rule(region.locations[0], lambda state, required=items[i].name, pid=player.id:
+                             state.has(required, pid))
+                multiworld.completion_condition[player.id] = lambda state, required=list(names(items)), pid=player.id: \
+                    state.has_all(required, pid)
+
+            if single_player_placement:
+                for player in players:
+                    fill_restrictive(multiworld, multiworld.state, multiworld.get_unfilled_locations(player.id),
+                                     player.prog_items, single_player_placement=True,
+                                     incremental_sweep=incremental_sweep)
+            else:
+                fill_restrictive(multiworld, multiworld.state, multiworld.get_unfilled_locations(),
+                                 [item for player in players for item in player.prog_items],
+                                 incremental_sweep=incremental_sweep)
+            self.assertTrue(multiworld.can_beat_game())
+            return [f"{location.name}: {location.item.name}" for location in multiworld.get_filled_locations()]
+
+        expected = fill(False)
+        self.assertEqual(expected, fill(True))
+        self.assertEqual(expected, fill(True, track_rule_dependencies=True))
+        self.assertEqual(fill(False, single_player_placement=True),
+                         fill(True, track_rule_dependencies=True, single_player_placement=True))
+
+    def test_incremental_sweep_locations(self):
+        """Test that the incremental sweep only replays the locations it is asked to sweep through"""
+        multiworld = generate_test_multiworld(2)
+        player1 = generate_player_data(multiworld, 1, 1, 1)
+        player2 = generate_player_data(multiworld, 2, 1, 1)
+        multiworld.push_item(player1.locations[0], player1.prog_items[0], False)
+        multiworld.push_item(player2.locations[0], player2.prog_items[0], False)
+        exploration = IncrementalSweep(multiworld.state)
+        self.assertTrue(exploration.state.has(player2.prog_items[0].name, player2.id), "Test is flawed")
+
+        state = exploration.update(locations=player1.locations)
+        self.assertTrue(state.has(player1.prog_items[0].name, player1.id))
+        self.assertFalse(state.has(player2.prog_items[0].name, player2.id))
+
+    def test_incremental_sweep_rechecks(self):
+        """Test that the incremental sweep only checks a blocked location again once something its rules read changed"""
+        multiworld = generate_test_multiworld()
+        multiworld.worlds[1].track_rule_dependencies = True
+        player1 = generate_player_data(multiworld, 1, 2, 2)
+        first_location, second_location = player1.locations
+        required = player1.prog_items[1]
+        rule_calls: List[str] = []
+
+        def rule(state: CollectionState) -> bool:
+            rule_calls.append(second_location.name)
+            return state.has(required.name, player1.id)
+
+        set_rule(second_location, rule)
+        multiworld.push_item(first_location, player1.prog_items[0], False)
+        multiworld.push_item(second_location, required, False)
+        exploration = IncrementalSweep(multiworld.state)
+        self.assertIn(first_location, exploration.state.advancements)
+        self.assertEqual(1, len(rule_calls))
+
+        state = exploration.update()
+        self.assertNotIn(second_location, state.advancements)
+        self.assertEqual(1, len(rule_calls))
+
+        state = exploration.update([required])
+        self.assertIn(second_location, state.advancements)
+        self.assertEqual(2, len(rule_calls))
+
+    def test_incremental_sweep_swapped_item(self):
+        """Test that the incremental sweep does not collect a swapped out item from a location it collected before"""
+        multiworld = generate_test_multiworld()
+        player1 = generate_player_data(multiworld, 1, 2, 2, 1)
+        first_location, second_location = player1.locations
+        set_rule(second_location, lambda state: state.has(player1.prog_items[0].name, player1.id))
+        multiworld.push_item(first_location, player1.prog_items[0], False)
+        multiworld.push_item(second_location, player1.prog_items[1], False)
+        exploration = IncrementalSweep(multiworld.state)
+        self.assertIn(second_location, exploration.state.advancements, "Test is flawed")
+
+        # swap a non-advancement item into the reachable location
+        multiworld.push_item(first_location, player1.basic_items[0], False)
+        state = exploration.update()
+        self.assertNotIn(first_location, state.advancements)
+        self.assertNotIn(second_location, state.advancements)
+        self.assertFalse(state.has(player1.basic_items[0].name, player1.id))
+        self.assertFalse(state.has(player1.prog_items[1].name, player1.id))
+
+    def test_incremental_sweep_swap(self):
+        """Test that fill_restrictive swaps with the incremental sweep like it does without it"""
+        def fill(incremental_sweep: bool) -> List[str]:
+            multiworld = generate_test_multiworld(1)
+            player1 = generate_player_data(multiworld, 1, 4, 4)
+            locations = player1.locations[:]
+            items = player1.prog_items[:]
+            for location in locations[:-1]:
+                set_rule(location, lambda state: any(state.has(item.name, player1.id) for item in items))
+            sphere1_loc = locations[-1]
+            add_item_rule(sphere1_loc, lambda item_to_place: item_to_place == items[1])
+            fill_restrictive(multiworld, multiworld.state, player1.locations, player1.prog_items,
+                             incremental_sweep=incremental_sweep)
+            self.assertEqual(sphere1_loc.item, items[1], "Did not swap required item into Sphere 1")
+            self.assertTrue(multiworld.can_beat_game())
+            return [f"{location.name}: {location.item.name}" for location in multiworld.get_filled_locations()]
+
+        self.assertEqual(fill(False), fill(True))
+
+    def test_cancelled_fill(self):
+        """Tests that `fill_restrictive` stops once the generation got cancelled, without placing anything"""
+        multiworld = generate_test_multiworld()
+        player1 = generate_player_data(multiworld, 1, 2, 2)
+        multiworld.generation_control.cancel()
+
+        with self.assertRaises(GenerationCancelled):
+            fill_restrictive(multiworld, multiworld.state, player1.locations.copy(), player1.prog_items.copy())
+        self.assertFalse(any(location.item for location in player1.locations))
+
 
 class TestDistributeItemsRestrictive(unittest.TestCase):
     def test_basic_distribute(self):
@@ -880,3 +1008,56 @@ class TestBalanceMultiworldProgression(unittest.TestCase):
 
         self.assertRegionContains(
             self.player1.regions[2], self.player2.prog_items[0])
+
+
+class TestSphereSweep(unittest.TestCase):
+    def setUp(self) -> None:
+        self.multiworld = generate_test_multiworld()
+        self.player1 = generate_player_data(self.multiworld, 1)
+        menu = self.player1.menu
+        self.key_location = Location(1, "Key Location", 1, menu)
+        self.event_location = Location(1, "Event Location", None, menu)
+        menu.locations += [self.key_location, self.event_location]
+        locked_regions = (
+            self.player1.generate_region(menu, 1, lambda state: state.has("Key", 1)),
+            self.player1.generate_region(menu, 1, lambda state: state.has("Event", 1)),
+            self.player1.generate_region(menu, 1, lambda state: state.has("Missing", 1)),
+        )
+        self.key_region_location, self.event_region_location, self.unreachable_location = \
+            (region.locations[0] for region in locked_regions)
+        for address, location in enumerate((self.key_region_location, self.event_region_location,
+                                            self.unreachable_location), start=2):
+            location.address = address
+            self.multiworld.push_item(location, Item("Filler", ItemClassification.filler, address, 1), False)
+        self.multiworld.push_item(self.key_location, Item("Key", ItemClassification.progression, 1, 1), False)
+        self.multiworld.push_item(self.event_location, Item("Event", ItemClassification.progression, None, 1), False)
+
+    def test_sweep_spheres(self) -> None:
+        """Tests that events are collected ahead of the sphere they unlock"""
+        sweep = self.multiworld.sweep_spheres(keep_states=True)
+        self.assertEqual(sweep.spheres, [{self.key_location, self.event_region_location}, {self.key_region_location}])
+        self.assertEqual(sweep.steps, [{self.event_location}, *sweep.spheres])
+        self.assertEqual([], self.multiworld.sweep_spheres().states)
+        self.assertEqual(len(sweep.states), len(sweep.steps))
+        self.assertFalse(sweep.states[0].has("Event", 1))
+        self.assertTrue(sweep.states[1].has("Event", 1))
+        self.assertEqual(sweep.unreachable, {self.unreachable_location})
+        self.assertTrue(sweep.state.has_all(("Key", "Event"), 1))
+
+    def test_sendable_spheres(self) -> None:
+        """Tests that sendable spheres leave out events and end with the unreachable locations"""
+        self.assertEqual(list(self.multiworld.get_sendable_spheres()), [
+            {self.key_location, self.event_region_location},
+            {self.key_region_location},
+            set(),
+            {self.unreachable_location},
+        ])
+
+    def test_cached_sweep(self) -> None:
+        """Tests that the sweep is only shared once caching is enabled"""
+        self.assertIsNot(self.multiworld.get_sphere_sweep(), self.multiworld.get_sphere_sweep())
+        self.multiworld.cache_spheres = True
+        self.assertIs(self.multiworld.get_sphere_sweep(), self.multiworld.get_sphere_sweep())
+        sweep = self.multiworld.get_sphere_sweep(keep_states=True)
+        self.assertEqual(len(sweep.steps), len(sweep.states))
+        self.assertIs(sweep, self.multiworld.get_sphere_sweep())
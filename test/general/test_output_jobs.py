@@ -0,0 +1,35 @@
+import concurrent.futures
+import functools
+import pathlib
+import tempfile
+import unittest
+
+from test.general import generate_test_multiworld
+from worlds.AutoWorld import call_output_job
+
+
+class TestOutputJobs(unittest.TestCase):
+    def test_run_output_job(self) -> None:
+        """Tests that output jobs write their output, both in the calling thread and in a process pool."""
+        multiworld = generate_test_multiworld()
+        with tempfile.TemporaryDirectory() as temp_dir, concurrent.futures.ProcessPoolExecutor(1) as pool:
+            for executor in (None, pool):
+                with self.subTest(executor=executor):
+                    out_file = pathlib.Path(temp_dir, f"{executor is None}.txt")
+                    multiworld.worlds[1].get_output_job = \
+                        lambda output_directory: functools.partial(pathlib.Path.write_text, out_file, output_directory)
+                    call_output_job(multiworld, 1, temp_dir, executor)
+                    self.assertEqual(out_file.read_text(), temp_dir)
+
+    def test_output_job_error(self) -> None:
+        """Tests that errors in output jobs get raised to the caller."""
+        multiworld = generate_test_multiworld()
+        multiworld.worlds[1].get_output_job = lambda output_directory: functools.partial(int, "not a number")
+        with concurrent.futures.ProcessPoolExecutor(1) as pool:
+            with self.assertRaises(ValueError):
+                call_output_job(multiworld, 1, "", pool)
+
+    def test_no_output_job(self) -> None:
+        """Tests that Worlds can skip their output job."""
+        multiworld = generate_test_multiworld()
+        call_output_job(multiworld, 1, "")
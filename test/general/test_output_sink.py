@@ -0,0 +1,34 @@
+import io
+import os
+import tempfile
+import unittest
+import zipfile
+
+from Main import ZipOutputSink
+
+
+class TestZipOutputSink(unittest.TestCase):
+    def test_compression(self) -> None:
+        """Tests that files get compressed, except files that are zip archives already or if compression is off."""
+        container = io.BytesIO()
+        with zipfile.ZipFile(container, "w") as zf:
+            zf.writestr("archipelago.json", "{}")
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            patch_path = os.path.join(temp_dir, "AP_0_P1_Player.apcontainer")
+            with open(patch_path, "wb") as f:
+                f.write(container.getvalue())
+
+            for compresslevel, text_compression in ((9, zipfile.ZIP_DEFLATED), (0, zipfile.ZIP_STORED)):
+                with self.subTest(compresslevel=compresslevel):
+                    archive_path = os.path.join(temp_dir, f"{compresslevel}.zip")
+                    sink = ZipOutputSink(archive_path, compresslevel)
+                    sink.add_file(patch_path)
+                    sink.add_data("AP_0_Spoiler.txt", b"spoiler" * 100)
+                    sink.close()
+
+                    with zipfile.ZipFile(archive_path) as zf:
+                        self.assertEqual(zf.getinfo("AP_0_P1_Player.apcontainer").compress_type, zipfile.ZIP_STORED)
+                        self.assertEqual(zf.read("AP_0_P1_Player.apcontainer"), container.getvalue())
+                        self.assertEqual(zf.getinfo("AP_0_Spoiler.txt").compress_type, text_compression)
+                        self.assertEqual(zf.read("AP_0_Spoiler.txt"), b"spoiler" * 100)
@@ -1,6 +1,12 @@
-﻿import unittest
+﻿import os
+import tempfile
+import unittest
+
+import bsdiff4
+
 from worlds.AutoWorld import AutoWorldRegister
-from worlds.Files import AutoPatchRegister
+from worlds.Files import APPatchExtension, APProcedurePatch, APTokenMixin, APTokenTypes, AutoPatchRegister, \
+    write_snes_checksum
 
 
 class TestPatches(unittest.TestCase):
@@ -9,3 +15,66 @@ class TestPatches(unittest.TestCase):
             with self.subTest(game=game_name):
                 self.assertIn(game_name, AutoWorldRegister.world_types.keys(),
                               f"Patch '{game_name}' does not match the name of any world.")
+
+
+class TokenPatch(APProcedurePatch, APTokenMixin):
+    # no game, so the patch type is not registered
+    hash = None
+    patch_file_ending = ".aptest"
+    procedure = [
+        ("apply_tokens", ["token_data.bin"]),
+        ("apply_bsdiff4", ["delta.bsdiff4"]),
+        ("calc_snes_crc", []),
+    ]
+    source_data = bytes(range(256)) * 0x100
+
+
+class TestProcedurePatch(unittest.TestCase):
+    def test_apply_tokens(self) -> None:
+        """Tests that every token type changes the data like it should."""
+        patch = TokenPatch()
+        patch.write_token(APTokenTypes.WRITE, 0x10, b"\x01\x02\x03")
+        patch.write_token(APTokenTypes.COPY, 0x20, (4, 0x10))
+        patch.write_token(APTokenTypes.RLE, 0x30, (3, 0xAB))
+        patch.write_token(APTokenTypes.AND_8, 0x40, 0x0F)
+        patch.write_token(APTokenTypes.OR_8, 0x41, 0xF0)
+        patch.write_token(APTokenTypes.XOR_8, 0x42, 0xFF)
+        patch.write_file("token_data.bin", patch.get_token_binary())
+
+        expected = bytearray(TokenPatch.source_data)
+        expected[0x10:0x13] = b"\x01\x02\x03"
+        expected[0x20:0x24] = b"\x01\x02\x03\x13"
+        expected[0x30:0x33] = b"\xAB\xAB\xAB"
+        expected[0x40] = 0x40 & 0x0F
+        expected[0x41] = 0x41 | 0xF0
+        expected[0x42] = 0x42 ^ 0xFF
+        rom = bytearray(TokenPatch.source_data)
+        self.assertIs(APPatchExtension.apply_tokens(patch, rom, "token_data.bin"), rom)
+        self.assertEqual(rom, expected)
+
+    def test_snes_checksum(self) -> None:
+        """Tests that the written checksum is the one the SNES header expects."""
+        rom = bytearray(TokenPatch.source_data)
+        write_snes_checksum(rom)
+        checksum = int.from_bytes(rom[0x7FDE:0x7FE0], "little")
+        self.assertEqual(checksum ^ 0xFFFF, int.from_bytes(rom[0x7FDC:0x7FDE], "little"))
+        self.assertEqual(sum(rom) & 0xFFFF, checksum)
+
+    def test_procedure(self) -> None:
+        """Tests that in place steps and steps taking bytes can be mixed in one procedure."""
+        patch = TokenPatch()
+        patch.write_token(APTokenTypes.WRITE, 0x100, b"patched")
+        patch.write_file("token_data.bin", patch.get_token_binary())
+        tokens_applied = bytearray(TokenPatch.source_data)
+        tokens_applied[0x100:0x107] = b"patched"
+        target = bytearray(tokens_applied)
+        target[0x200:0x204] = b"diff"
+        patch.write_file("delta.bsdiff4", bsdiff4.diff(bytes(tokens_applied), bytes(target)))
+        write_snes_checksum(target)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            patch.write(os.path.join(temp_dir, "test.aptest"))
+            patch.patch(os.path.join(temp_dir, "test.sfc"))
+            with open(os.path.join(temp_dir, "test.sfc"), "rb") as f:
+                self.assertEqual(f.read(), target)
+        self.assertEqual(TokenPatch.source_data, bytes(range(256)) * 0x100, "source data was changed")
@@ -1,7 +1,10 @@
 import unittest
+from collections import Counter
+from typing import Callable, Set
 
+from BaseClasses import CollectionState, Item, ItemClassification, Location, Region
 from worlds.AutoWorld import AutoWorldRegister, call_all
-from . import setup_solo_multiworld
+from . import generate_test_multiworld, setup_solo_multiworld
 
 
 class TestBase(unittest.TestCase):
@@ -27,3 +30,135 @@ class TestBase(unittest.TestCase):
                     with self.subTest("Step", step=step):
                         call_all(multiworld, step)
                         self.assertTrue(multiworld.get_all_state(False, allow_partial_entrances=True))
+
+
+class TestRuleDependencies(unittest.TestCase):
+    def setUp(self) -> None:
+        self.multiworld = generate_test_multiworld()
+        self.multiworld.worlds[1].track_rule_dependencies = True
+        self.rule_calls: Counter[str] = Counter()
+        menu = self.multiworld.get_region("Menu", 1)
+        regions = {name: Region(name, 1, self.multiworld) for name in ("A", "B", "C", "D")}
+        self.multiworld.regions += regions.values()
+
+        def rule(name: str, condition: Callable[[CollectionState], bool]) -> Callable[[CollectionState], bool]:
+            def counted_rule(state: CollectionState) -> bool:
+                self.rule_calls[name] += 1
+                return condition(state)
+            return counted_rule
+
+        menu.connect(regions["A"], "Menu -> A", rule("A", lambda state: state.has("a", 1)))
+        regions["A"].connect(regions["B"], "A -> B", rule("B", lambda state: state.has("b", 1)))
+        menu.connect(regions["C"], "Menu -> C", rule("C", lambda state: state.can_reach_region("B", 1)))
+        regions["C"].connect(regions["D"], "C -> D", rule("D", lambda state: state.has("c", 1, 2)))
+
+    def collect(self, state: CollectionState, item_name: str) -> None:
+        state.collect(Item(item_name, ItemClassification.progression, None, 1), True)
+
+    def reachable(self, state: CollectionState) -> Set[str]:
+        return {region.name for region in self.multiworld.get_regions(1) if region.can_reach(state)}
+
+    def test_same_reachability(self) -> None:
+        """Test that tracking rule dependencies reaches the same regions as checking every blocked entrance"""
+        tracked_state = CollectionState(self.multiworld)
+        untracked_state = CollectionState(self.multiworld)
+        world = self.multiworld.worlds[1]
+        world.track_rule_dependencies = False
+        world.explicit_indirect_conditions = False
+        for item_name in ("c", "b", "x", "c", "a"):
+            self.collect(untracked_state, item_name)
+            self.reachable(untracked_state)
+        world.track_rule_dependencies = True
+
+        for item_name, expected in (("c", {"Menu"}), ("b", {"Menu"}), ("x", {"Menu"}), ("c", {"Menu"}),
+                                    ("a", {"Menu", "A", "B", "C", "D"})):
+            self.collect(tracked_state, item_name)
+            with self.subTest(item=item_name):
+                self.assertEqual(expected, self.reachable(tracked_state))
+                copied_state = tracked_state.copy()
+                self.assertEqual(expected, self.reachable(copied_state))
+        self.assertEqual(self.reachable(untracked_state), self.reachable(tracked_state))
+
+    def test_only_dependent_rules_rechecked(self) -> None:
+        """Test that collecting an item only rechecks the entrances that read it"""
+        state = CollectionState(self.multiworld)
+        self.reachable(state)
+        self.rule_calls.clear()
+        self.collect(state, "x")
+        self.reachable(state)
+        self.assertEqual(Counter(), self.rule_calls)
+        self.collect(state, "a")
+        self.reachable(state)
+        self.assertEqual(Counter({"A": 1, "B": 1}), self.rule_calls)
+        self.collect(state, "b")
+        self.reachable(state)
+        # C reads region B, so gets rechecked once B is reached
+        self.assertEqual(Counter({"A": 1, "B": 2, "C": 1, "D": 1}), self.rule_calls)
+
+    def test_containers_kept(self) -> None:
+        """Test that updating reachable regions neither replaces nor snapshots the per player containers"""
+        state = CollectionState(self.multiworld)
+        self.reachable(state)
+        prog_items = state.prog_items[1]
+        reachable_regions = state.reachable_regions[1]
+        self.collect(state, "a")
+        self.assertEqual({"a"}, prog_items.changed)
+        self.reachable(state)
+        self.assertIs(prog_items, state.prog_items[1])
+        self.assertIs(reachable_regions, state.reachable_regions[1])
+        self.assertEqual(set(), prog_items.changed)
+        self.assertEqual({"Menu", "A"}, {region.name for region in reachable_regions})
+
+    def test_location_dependencies(self) -> None:
+        """Test that an unreachable location records the items and Regions its rules read"""
+        region_a = self.multiworld.get_region("A", 1)
+        location = Location(1, "A Location", None, region_a)
+        location.access_rule = lambda state: state.has("b", 1)
+        region_a.locations.append(location)
+        state = CollectionState(self.multiworld)
+        dependencies = self.multiworld.rule_dependencies
+
+        self.assertFalse(state.can_reach_recording_dependencies(location))
+        self.assertIn(location, dependencies[1][region_a])
+        self.assertNotIn(location, dependencies[1].get("b", set()))
+        self.collect(state, "a")
+        self.assertFalse(state.can_reach_recording_dependencies(location))
+        self.assertIn(location, dependencies[1]["b"])
+        self.collect(state, "b")
+        self.assertTrue(state.can_reach_recording_dependencies(location))
+
+
+class TestCopy(unittest.TestCase):
+    def setUp(self) -> None:
+        self.multiworld = generate_test_multiworld(2)
+
+    def test_copies_are_independent(self) -> None:
+        """Test that per player containers shared between copies are never modified through another state"""
+        state = CollectionState(self.multiworld)
+        state.collect(Item("a", ItemClassification.progression, None, 1), True)
+        copied_state = state.copy()
+        copied_state.collect(Item("b", ItemClassification.progression, None, 1), True)
+        state.collect(Item("c", ItemClassification.progression, None, 2), True)
+        second_copy = copied_state.copy()
+        second_copy.remove(Item("a", ItemClassification.progression, None, 1))
+        state.update_reachable_regions(1)
+        state.update_reachable_regions(2)
+
+        self.assertEqual(Counter({"a": 1}), state.prog_items[1])
+        self.assertEqual(Counter({"c": 1}), state.prog_items[2])
+        self.assertEqual(Counter({"a": 1, "b": 1}), copied_state.prog_items[1])
+        self.assertEqual(Counter(), copied_state.prog_items[2])
+        self.assertEqual(Counter({"b": 1}), +second_copy.prog_items[1])
+        self.assertEqual(set(), copied_state.reachable_regions[1])
+        self.assertEqual({"Menu"}, {region.name for region in state.reachable_regions[1]})
+        self.assertEqual({1: {"a": 1}, 2: {"c": 1}},
+                         {player: dict(counter) for player, counter in state.prog_items.items()})
+
+    def test_copy_of_plain_dict(self) -> None:
+        """Test that states with per player containers replaced by plain dicts still copy them"""
+        state = CollectionState(self.multiworld)
+        state.prog_items = {1: Counter(), 2: Counter()}
+        copied_state = state.copy()
+        copied_state.collect(Item("a", ItemClassification.progression, None, 1), True)
+        self.assertEqual(Counter(), state.prog_items[1])
+        self.assertEqual(Counter({"a": 1}), copied_state.prog_items[1])
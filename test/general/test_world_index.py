@@ -0,0 +1,34 @@
+import os
+import tempfile
+import unittest
+
+import WorldIndex
+from worlds import network_data_package
+from worlds.AutoWorld import AutoWorldRegister
+
+
+class TestWorldIndex(unittest.TestCase):
+    def test_index_matches_worlds(self) -> None:
+        """Test that the index has the same data as the loaded worlds."""
+        world_index = WorldIndex._build_world_index()
+        world_types = {game: world_type for game, world_type in AutoWorldRegister.world_types.items()
+                       if world_type.__module__.startswith("worlds.")}
+        self.assertEqual(world_index.keys(), world_types.keys())
+        for game, world_type in world_types.items():
+            with self.subTest(game=game):
+                indexed_world = world_index[game]
+                self.assertEqual(indexed_world.world_version, world_type.world_version)
+                self.assertEqual(indexed_world.data_package, network_data_package["games"][game])
+                self.assertEqual(indexed_world.hint_blacklist, world_type.hint_blacklist)
+                self.assertTrue(world_type.__module__.startswith(f"worlds.{indexed_world.source}"))
+                self.assertEqual(indexed_world.world_class, f"{world_type.__module__}.{world_type.__qualname__}")
+
+    def test_cache_roundtrip(self) -> None:
+        """Test that a cached index is only read back with the key it was written with."""
+        world_index = WorldIndex._build_world_index()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "world_index.pickle")
+            self.assertIsNone(WorldIndex._read_world_index(path, "key"))
+            WorldIndex._write_world_index(path, "key", world_index)
+            self.assertEqual(WorldIndex._read_world_index(path, "key"), world_index)
+            self.assertIsNone(WorldIndex._read_world_index(path, "other key"))
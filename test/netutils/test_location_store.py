@@ -112,6 +112,12 @@ class Base:
             self.assertEqual(sorted(self.store.find_item(set(range(2048)), 13)),
                              [(1, 13, 13, 1, 0)])
 
+        def test_find_item_order(self) -> None:
+            # matches are found through the receiver index, but still returned in sender and location order
+            self.assertEqual(list(self.store.find_item({5, 4, 3}, 99)),
+                             [(3, 9, 99, 4, 0), (4, 9, 99, 3, 0), (5, 9, 99, 5, 0)])
+            self.assertEqual(list(self.store.find_item({1, 2}, 12)), [(2, 22, 12, 1, 0)])
+
         def test_get_for_player(self) -> None:
             self.assertEqual(self.store.get_for_player(3), {4: {9}})
             self.assertEqual(self.store.get_for_player(1), {1: {13}, 2: {22, 23}})
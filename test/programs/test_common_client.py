@@ -1,7 +1,10 @@
+import os
+import tempfile
 import unittest
 
 import NetUtils
 from CommonClient import CommonContext
+from DataPackageTables import load_game_package, write_game_package
 
 
 class TestCommonContext(unittest.IsolatedAsyncioTestCase):
@@ -93,3 +96,25 @@ class TestCommonContext(unittest.IsolatedAsyncioTestCase):
         assert self.ctx.item_names.lookup_in_slot(-1, 3) == "Nothing"
         assert self.ctx.item_names.lookup_in_game(-1, "__TestGame1") == "Nothing"
         assert self.ctx.item_names.lookup_in_game(-1, "__TestGame2") == "Nothing"
+
+    async def test_cached_package_lookups(self):
+        package = {
+            "checksum": "0123",
+            "location_name_to_id": {"Test Location 4 - Cached": 2**54 + 4},
+            "item_name_to_id": {"Test Item 4 - Cached": 2**54 + 4, "Test Item 5 - Ünïcode": 2**54 + 5},
+        }
+        # the mapping stays valid after the file is gone, but can prevent removing it on Windows
+        with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as temp_dir:
+            path = os.path.join(temp_dir, "0123.bin")
+            write_game_package(path, package)
+            cached_package = load_game_package(path)
+        assert dict(cached_package["item_name_to_id"]) == package["item_name_to_id"]
+        assert cached_package["checksum"] == "0123"
+
+        self.ctx.update_game(cached_package, "__TestGame2")
+        assert self.ctx.checksums["__TestGame2"] == "0123"
+        assert self.ctx.item_names.lookup_in_game(2 ** 54 + 4, "__TestGame2") == "Test Item 4 - Cached"
+        assert self.ctx.item_names.lookup_in_game(2 ** 54 + 5, "__TestGame2") == "Test Item 5 - Ünïcode"
+        assert self.ctx.item_names.lookup_in_game(2 ** 54 + 2, "__TestGame2") == f"Unknown item (ID: {2 ** 54 + 2})"
+        assert self.ctx.item_names.lookup_in_game(-1, "__TestGame2") == "Nothing"
+        assert self.ctx.location_names.lookup_in_game(2 ** 54 + 4, "__TestGame2") == "Test Location 4 - Cached"
@@ -137,3 +137,45 @@ class TestGenerateWeights(TestGenerateMain):
                     result, getattr(namespace, option_name)[player].value,
                     "Generated results from weights file did not match expected value."
                 )
+
+    def test_generate_roll_processes(self):
+        """Tests that rolling options in processes gives the same results for the same seed."""
+        from settings import get_settings
+        settings = get_settings()
+        settings.generator.players = 5
+        settings._filename = None
+
+        results = []
+        for _ in range(2):
+            sys.argv = [sys.argv[0], "--seed", "1", "--roll_processes", "2",
+                        "--player_files_path", str(self.abs_input_dir)]
+            namespace, seed = Generate.main()
+            results.append({option_name: {player: getattr(namespace, option_name)[player].value
+                                          for player in range(1, 6)}
+                            for option_name in ("accessibility", "progression_balancing")})
+            self.assertEqual(seed, 1)
+            self.assertEqual(namespace.name, {player: f"Player{player}" for player in range(1, 6)})
+        self.assertEqual(results[0], results[1])
+
+
+class TestReadWeightsCache(unittest.TestCase):
+    def test_cache(self):
+        """Tests that cached player files are read back as parsed, and changing the file's content skips the cache."""
+        original_cache_path = getattr(Generate.Utils.cache_path, "cached_path", None)
+        with TemporaryDirectory() as temp_dir:
+            Generate.Utils.cache_path.cached_path = os.path.join(temp_dir, "cache")
+            try:
+                path = os.path.join(temp_dir, "Player.yaml")
+                Path(path).write_text("name: Player\ngame: Archipelago\n---\nname: Player2\n", encoding="utf-8")
+                parsed = Generate.read_weights_yamls(path, cache=True)
+                self.assertEqual(len(os.listdir(os.path.join(temp_dir, "cache", "weights"))), 1)
+                self.assertEqual(Generate.read_weights_yamls(path, cache=True), parsed)
+                self.assertEqual(Generate.read_weights_yamls(path), parsed)
+
+                Path(path).write_text("name: Changed\n", encoding="utf-8")
+                self.assertEqual(Generate.read_weights_yamls(path, cache=True), ({"name": "Changed"},))
+            finally:
+                if original_cache_path is None:
+                    del Generate.Utils.cache_path.cached_path
+                else:
+                    Generate.Utils.cache_path.cached_path = original_cache_path
@@ -1,5 +1,15 @@
+import asyncio
+import os
+import struct
+import tempfile
+import typing
 import unittest
-from MultiServer import Context, ServerCommandProcessor
+import unittest.mock
+import zlib
+
+from MultiServer import Client, ClientMessageProcessor, Context, ServerCommandProcessor, send_items_to, send_new_items
+from NetUtils import Hint, HintStatus, NetworkItem, NetworkSlot, SlotType
+from Utils import restricted_loads
 
 
 class TestResolvePlayerName(unittest.TestCase):
@@ -38,3 +48,209 @@ class TestResolvePlayerName(unittest.TestCase):
         assert p.resolve_player("ABC") == (1, 2, "abc"), "case insensitive resolves when 1 match"
         assert p.resolve_player("abcd") == (1, 3, "abCD"), "case insensitive resolves when 1 match"
         assert not p.resolve_player("aB"), "partial name shouldn't resolve to player"
+
+
+class TestSendNewItems(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.ctx = Context("", 0, "", "", 0, 0, False)
+        self.sent: typing.List[typing.Tuple[Client, typing.List[typing.Dict[str, typing.Any]]]] = []
+
+        async def send_msgs(endpoint: Client, msgs: typing.List[typing.Dict[str, typing.Any]]) -> bool:
+            self.sent.append((endpoint, msgs))
+            return True
+
+        self.ctx.send_msgs = send_msgs
+        self.ctx.clients = {0: {}}
+        for slot in (1, 2, 3):
+            client = Client(None, self.ctx)
+            client.team, client.slot = 0, slot
+            self.ctx.clients[0][slot] = [client]
+
+    async def test_only_grown_slots(self) -> None:
+        """Test that only the clients of slots that received new items get sent anything, once per burst"""
+        send_items_to(self.ctx, 0, 1, NetworkItem(1, 1, 2))
+        send_items_to(self.ctx, 0, 1, NetworkItem(2, 2, 3))
+        send_items_to(self.ctx, 0, 3, NetworkItem(3, 3, 2))
+        send_new_items(self.ctx)
+        await asyncio.sleep(0)
+        self.assertEqual({1: [1, 2], 3: [3]},
+                         {client.slot: [item.item for item in msgs[0]["items"]] for client, msgs in self.sent})
+        self.assertEqual(2, self.ctx.clients[0][1][0].send_index)
+
+        self.sent.clear()
+        send_items_to(self.ctx, 0, 1, NetworkItem(4, 4, 2))
+        send_new_items(self.ctx)
+        send_new_items(self.ctx)
+        await asyncio.sleep(0)
+        self.assertEqual(1, len(self.sent))
+        self.assertEqual(2, self.sent[0][1][0]["index"])
+
+
+class TestHints(unittest.TestCase):
+    def setUp(self) -> None:
+        self.ctx = Context("", 0, "", "", 0, 0, False)
+        self.hints = [Hint(2, 1, 10, 100, False, status=HintStatus.HINT_PRIORITY),
+                      Hint(1, 1, 11, 101, False, status=HintStatus.HINT_PRIORITY),
+                      Hint(1, 2, 10, 102, False, status=HintStatus.HINT_PRIORITY)]
+        for hint in self.hints:
+            self.ctx.hints[0, hint.finding_player].add(hint)
+            self.ctx.hints[0, hint.receiving_player].add(hint)
+        self.ctx.index_hints()
+
+    def test_get_hint(self) -> None:
+        """Test that hints are found by the team, finding player and location"""
+        self.assertEqual(self.hints[0], self.ctx.get_hint(0, 1, 10))
+        self.assertEqual(self.hints[2], self.ctx.get_hint(0, 2, 10))
+        self.assertIsNone(self.ctx.get_hint(0, 2, 11))
+        self.assertIsNone(self.ctx.get_hint(1, 1, 10))
+
+        new_hint = self.hints[0].re_prioritize(self.ctx, HintStatus.HINT_AVOID)
+        for slot in (1, 2):
+            self.ctx.replace_hint(0, slot, self.hints[0], new_hint)
+        self.assertEqual(HintStatus.HINT_AVOID, self.ctx.get_hint(0, 1, 10).status)
+
+    def test_recheck_location_hints(self) -> None:
+        """Test that checking a location only updates the hints for that location, for every player they concern"""
+        self.ctx.location_checks[0, 1] |= {10, 11}
+        changed: typing.Set[typing.Tuple[int, int]] = set()
+        self.ctx.recheck_location_hints(0, 1, {10}, changed)
+
+        self.assertEqual({(0, 1), (0, 2)}, changed)
+        found_hint = self.ctx.get_hint(0, 1, 10)
+        self.assertTrue(found_hint.found)
+        self.assertIn(found_hint, self.ctx.hints[0, 2])
+        self.assertNotIn(self.hints[0], self.ctx.hints[0, 2])
+        self.assertFalse(self.ctx.get_hint(0, 1, 11).found)
+        self.assertFalse(self.ctx.get_hint(0, 2, 10).found)
+
+        # a full recheck catches the rest
+        self.ctx.recheck_hints(0, 1)
+        self.assertTrue(self.ctx.get_hint(0, 1, 11).found)
+        self.assertEqual(3, len(self.ctx.hints[0, 1]))
+
+
+class TestHintCommand(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.ctx = Context("", 0, "", "", 0, 0, False)
+        self.hint = Hint(2, 1, 10, 100, False, status=HintStatus.HINT_PRIORITY)
+        self.ctx._load({
+            "minimum_versions": {"server": (0, 0, 0), "clients": {}},
+            "version": (0, 6, 2),
+            "slot_info": {1: NetworkSlot("Player1", "Archipelago", SlotType.player),
+                          2: NetworkSlot("Player2", "Archipelago", SlotType.player)},
+            "connect_names": {"Player1": (0, 1), "Player2": (0, 2)},
+            "locations": {1: {10: (100, 2, 0)}, 2: {11: (101, 1, 0)}},
+            "slot_data": {1: {}, 2: {}},
+            "er_hint_data": {},
+            "precollected_items": {1: [], 2: []},
+            "precollected_hints": {1: {self.hint}, 2: {self.hint}},
+            "seed_name": "0",
+        }, {}, False)
+        self.sent: typing.List[typing.Tuple[Client, typing.List[typing.Dict[str, typing.Any]]]] = []
+
+        async def send_msgs(endpoint: Client, msgs: typing.List[typing.Dict[str, typing.Any]]) -> bool:
+            self.sent.append((endpoint, msgs))
+            return True
+
+        self.ctx.send_msgs = send_msgs
+        self.client = Client(None, self.ctx)
+        self.client.team, self.client.slot = 0, 1
+        self.ctx.clients[0][1] = [self.client]
+
+    async def test_hints(self) -> None:
+        """Test that the hints datastore key and a plain !hint show the hints of a slot, rechecked"""
+        self.ctx.location_checks[0, 1].add(10)
+        self.assertEqual([self.hint.re_check(self.ctx, 0)], self.ctx.read_data["hints_0_1"]())
+        self.assertTrue(self.ctx.read_data["hints_0_2"]()[0].found)
+
+        self.assertTrue(ClientMessageProcessor(self.ctx, self.client)("!hint"))
+        await asyncio.sleep(0)
+        hint_messages = [msg for _, msgs in self.sent for msg in msgs if msg.get("type") == "Hint"]
+        self.assertEqual(1, len(hint_messages))
+        self.assertTrue(hint_messages[0]["found"])
+
+
+class TestSaveJournal(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.ctx = self.create_context()
+
+    def create_context(self) -> Context:
+        ctx = Context("", 0, "", "", 0, 0, False)
+        ctx.save_filename = os.path.join(self.temp_dir.name, "test.apsave")
+        ctx.save_journal = True
+        ctx.clients = {0: {1: [], 2: []}}
+        ctx.saving = True
+        return ctx
+
+    def load(self) -> Context:
+        ctx = self.create_context()
+        ctx.auto_saver_thread = True  # don't start saving
+        ctx.init_save()
+        return ctx
+
+    def test_replay(self) -> None:
+        """Test that loading a save replays the changes appended to its journal"""
+        self.ctx.location_checks[0, 1] |= {1, 2}
+        self.assertTrue(self.ctx._save())
+        snapshot_size = os.path.getsize(self.ctx.save_filename)
+
+        send_items_to(self.ctx, 0, 1, NetworkItem(10, 3, 2))
+        self.ctx.location_checks[0, 2] |= {3}
+        self.ctx.journal_location_checks[0, 2] |= {3}
+        self.ctx.hints[0, 2].add(Hint(1, 2, 4, 11, False))
+        self.ctx.journal_hints.add((0, 2))
+        self.ctx.stored_data["key"] = [1]
+        self.ctx.journal_stored_data.add("key")
+        self.assertTrue(self.ctx._save())
+        send_items_to(self.ctx, 0, 1, NetworkItem(11, 4, 2))
+        self.ctx.client_game_state[0, 1] = 30
+        self.assertTrue(self.ctx._save())
+        self.assertEqual(snapshot_size, os.path.getsize(self.ctx.save_filename), "save file was rewritten")
+
+        loaded = self.load()
+        self.assertEqual({1, 2}, loaded.location_checks[0, 1])
+        self.assertEqual({3}, loaded.location_checks[0, 2])
+        self.assertEqual([10, 11], [item.item for item in loaded.received_items[0, 1, True]])
+        self.assertEqual({Hint(1, 2, 4, 11, False)}, loaded.hints[0, 2])
+        self.assertEqual([1], loaded.stored_data["key"])
+        self.assertEqual(30, loaded.client_game_state[0, 1])
+
+    def test_record_changes_only(self) -> None:
+        """Test that journal records only contain new location checks and the parts of the save that changed"""
+        self.ctx.location_checks[0, 1] |= {1, 2}
+        self.assertTrue(self.ctx._save())
+        self.ctx.location_checks[0, 1] |= {3}
+        self.ctx.journal_location_checks[0, 1] |= {3}
+        self.ctx.client_game_state[0, 1] = 30
+        with unittest.mock.patch.object(self.ctx, "recheck_hints") as recheck_hints:
+            self.assertTrue(self.ctx._save())
+        recheck_hints.assert_not_called()
+
+        with open(self.ctx.journal_filename, "rb") as f:
+            journal = f.read()
+        size, = struct.unpack_from("<I", journal)
+        record = restricted_loads(zlib.decompress(journal[4 + size + 4:]))
+        self.assertEqual({(0, 1): {3}}, record["location_checks"])
+        self.assertEqual({(0, 1): 30}, record["client_game_state"])
+        self.assertNotIn("hints_used", record)
+        self.assertNotIn("connect_names", record)
+        self.assertEqual({1, 2, 3}, self.load().location_checks[0, 1])
+
+    def test_compaction(self) -> None:
+        """Test that the journal gets compacted into the save file, and that an outdated journal is ignored"""
+        self.ctx.journal_compaction_size = 0
+        self.assertTrue(self.ctx._save())
+        send_items_to(self.ctx, 0, 1, NetworkItem(10, 3, 2))
+        self.assertTrue(self.ctx._save())
+        with open(self.ctx.journal_filename, "rb") as f:
+            outdated_journal = f.read()
+        send_items_to(self.ctx, 0, 1, NetworkItem(11, 4, 2))
+        self.ctx.journal_snapshot_size = self.ctx.journal_size  # journal is as large as the save file, so this compacts
+        self.assertTrue(self.ctx._save())
+        self.assertEqual([10, 11], [item.item for item in self.load().received_items[0, 1, True]])
+
+        with open(self.ctx.journal_filename, "wb") as f:
+            f.write(outdated_journal)
+        self.assertEqual([10, 11], [item.item for item in self.load().received_items[0, 1, True]])
@@ -1,9 +1,13 @@
 # Tests for caches in Utils.py
 
+import hashlib
+import os
+import tempfile
 import unittest
 from typing import Any
 
-from Utils import cache_argsless, cache_self1
+import Utils
+from Utils import cache_argsless, cache_self1, get_derived_data, get_file_md5
 
 
 class TestCacheArgless(unittest.TestCase):
@@ -77,3 +81,44 @@ class TestCacheSelf1(unittest.TestCase):
                 @cache_self1  # type: ignore[arg-type]
                 def func(_1: Any, _2: Any, _3: Any) -> Any:
                     pass
+
+
+class TestFileCaches(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_dir = temp_dir.name
+        old_cache_path = Utils.cache_path()
+        Utils.cache_path.cached_path = os.path.join(self.temp_dir, "cache")
+        self.addCleanup(setattr, Utils.cache_path, "cached_path", old_cache_path)
+        self.addCleanup(vars(get_file_md5).pop, "file_md5s", None)
+        vars(get_file_md5).pop("file_md5s", None)
+
+    def test_file_md5(self) -> None:
+        """Tests that file checksums are remembered only while the file stays the same"""
+        path = os.path.join(self.temp_dir, "file.bin")
+        with open(path, "wb") as f:
+            f.write(b"data")
+        self.assertEqual(get_file_md5(path), hashlib.md5(b"data").hexdigest())
+        vars(get_file_md5).pop("file_md5s")  # read back from the cache directory
+        self.assertEqual(get_file_md5(path), hashlib.md5(b"data").hexdigest())
+
+        with open(path, "wb") as f:
+            f.write(b"other data")
+        self.assertEqual(get_file_md5(path), hashlib.md5(b"other data").hexdigest())
+
+    def test_derived_data(self) -> None:
+        """Tests that derived data is only derived once per key"""
+        calls = []
+
+        def derive() -> bytes:
+            calls.append(None)
+            return b"derived"
+
+        for _ in range(2):
+            with get_derived_data("test", "key", derive) as data:
+                self.assertEqual(bytes(data), b"derived")
+        self.assertEqual(len(calls), 1)
+        with get_derived_data("test", "other key", derive) as data:
+            self.assertEqual(bytes(data), b"derived")
+        self.assertEqual(len(calls), 2)
@@ -0,0 +1,39 @@
+import threading
+import unittest
+
+from Utils import GenerationCancelled, GenerationControl
+
+
+class TestGenerationControl(unittest.TestCase):
+    def test_cancel(self) -> None:
+        """Tests that checks only raise once cancelled, including from another thread"""
+        control = GenerationControl()
+        control.check()
+        control.set_stage("Filling", 0, 50)
+        control.set_progress(1, 2)
+
+        thread = threading.Thread(target=control.cancel)
+        thread.start()
+        thread.join()
+
+        self.assertTrue(control.cancelled)
+        with self.assertRaises(GenerationCancelled):
+            control.check()
+        with self.assertRaises(GenerationCancelled):
+            control.set_stage("Post filling", 50, 60)
+        with self.assertRaises(GenerationCancelled):
+            control.set_progress(2, 2)
+
+    def test_progress(self) -> None:
+        """Tests that progress is scaled into the current stage and only ever reported forward"""
+        reports = []
+        control = GenerationControl(lambda stage, percent: reports.append((stage, percent)))
+        control.set_stage("Filling", 20, 60)
+        control.set_progress(1, 4)
+        control.set_progress(0, 4)  # a later step of the stage starting over
+        control.set_progress(0, 0)
+        control.set_progress(4, 4)
+        control.set_stage("Writing output", 60, 100)
+
+        self.assertEqual([("Filling", 20), ("Filling", 30), ("Filling", 60), ("Writing output", 60)], reports)
+        self.assertEqual(60, control.percent)
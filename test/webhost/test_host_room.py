@@ -191,3 +191,36 @@ class TestHostFakeRoom(TestBase):
         with db_session:
             commands = select(command for command in Command if command.room.id == self.room_id)  # type: ignore
             self.assertNotIn("/help", (command.commandtext for command in commands))
+
+    def test_command_dispatcher(self) -> None:
+        """Verify the dispatcher hands out queued commands of registered rooms only, each exactly once."""
+        from pony.orm import db_session, select
+        from WebHostLib.customserver import CommandDispatcher
+        from WebHostLib.models import Command, Room
+
+        class ImmediateLoop:
+            def call_soon_threadsafe(self, callback, *args) -> None:
+                callback(*args)
+
+        with db_session:
+            room: Room = Room.get(id=self.room_id)
+            other_room = Room(seed=room.seed, owner=room.owner, tracker=uuid4())
+            other_room_id = other_room.id
+            Command(room=room, commandtext="/help")
+            Command(room=room, commandtext="/status")
+            Command(room=other_room, commandtext="/exit")
+
+        received: list[str] = []
+        dispatcher = CommandDispatcher()
+        dispatcher.register(self.room_id, ImmediateLoop(), received.append)
+        self.assertEqual(2, dispatcher.dispatch())
+        self.assertEqual(0, dispatcher.dispatch())
+        self.assertEqual(["/help", "/status"], sorted(received))
+        dispatcher.unregister(self.room_id)
+
+        with db_session:
+            self.assertEqual(["/exit"], [command.commandtext for command in
+                                         select(command for command in Command if command.room.id == other_room_id)])
+            for command in select(command for command in Command if command.room.id == other_room_id):
+                command.delete()
+            Room.get(id=other_room_id).delete()
@@ -0,0 +1,59 @@
+import os
+import tempfile
+import unittest
+
+
+class TestStaticData(unittest.TestCase):
+    def setUp(self) -> None:
+        from WebHostLib.customserver import get_static_server_data
+        from WebHostLib.static_data import load_static_data, write_static_data
+
+        self.static_server_data = get_static_server_data()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "static_server_data.bin")
+            write_static_data(path, self.static_server_data)
+            self.mapped_data = load_static_data(path)  # the mapping stays valid after the file is gone
+
+    def test_tables_match(self) -> None:
+        """Verify that the mapped tables have the same content as the game packages they were written from."""
+        self.assertEqual(self.mapped_data["gamespackage"].keys(), self.static_server_data["gamespackage"].keys())
+        for game, package in self.static_server_data["gamespackage"].items():
+            mapped_package = self.mapped_data["gamespackage"][game]
+            with self.subTest(game=game):
+                self.assertEqual(mapped_package["checksum"], package["checksum"])
+                for key in ("item_name_to_id", "location_name_to_id"):
+                    table = mapped_package[key]
+                    self.assertEqual(table.to_dict(), package[key])
+                    self.assertEqual(dict(table), package[key])
+                    self.assertEqual(dict(table.id_to_name), {code: name for name, code in package[key].items()})
+                    self.assertNotIn("", table)
+                    self.assertNotIn(max(package[key].values(), default=0) + 1, table.id_to_name)
+                    self.assertNotIn("", table.id_to_name)
+        for key in ("item_name_groups", "location_name_groups", "non_hintable_names"):
+            self.assertEqual(self.mapped_data[key], self.static_server_data[key])
+
+    def test_context_names(self) -> None:
+        """Verify that a room using the mapped data names items and locations like one using plain dicts."""
+        import asyncio
+        import logging
+
+        from WebHostLib.customserver import WebHostContext
+
+        async def init_game_data(static_server_data: dict) -> WebHostContext:
+            ctx = WebHostContext(static_server_data, logging.getLogger("TestStaticData"))
+            ctx._init_game_data()
+            return ctx
+
+        plain_ctx = asyncio.run(init_game_data(self.static_server_data))
+        mapped_ctx = asyncio.run(init_game_data(self.mapped_data))
+        for game, package in self.static_server_data["gamespackage"].items():
+            with self.subTest(game=game):
+                self.assertEqual(mapped_ctx.checksums[game], plain_ctx.checksums[game])
+                self.assertEqual(dict(mapped_ctx.item_names[game]), dict(plain_ctx.item_names[game]))
+                self.assertEqual(dict(mapped_ctx.location_names[game]), dict(plain_ctx.location_names[game]))
+                self.assertEqual(set(mapped_ctx.all_item_and_group_names[game]),
+                                 set(plain_ctx.all_item_and_group_names[game]))
+                self.assertEqual(mapped_ctx.get_game_package(game), plain_ctx.get_game_package(game))
+                self.assertIs(mapped_ctx.get_game_package(game), mapped_ctx.get_game_package(game))
+                missing_id = max(package["item_name_to_id"].values(), default=0) + 1
+                self.assertEqual(mapped_ctx.item_names[game][missing_id], plain_ctx.item_names[game][missing_id])
@@ -103,3 +103,64 @@ class TestTracker(TestBase):
                 self.assertEqual(response.status_code, 200)
             with self.client.open(url_for("api.tracker_slot_data", tracker=self.tracker_uuid)) as response:
                 self.assertEqual(response.status_code, 200)
+
+    def test_tracker_projection(self) -> None:
+        """Verify that the tracker data read from a room's projection is the same as read from its multisave."""
+        from unittest import mock
+        from pony.orm import db_session
+        from MultiServer import Context as MultiServerContext
+        from NetUtils import ClientStatus, Hint, NetworkItem
+        from WebHostLib import tracker
+        from WebHostLib.models import Room
+        from WebHostLib.tracker_projection import dump_projection, project_multidata, project_multisave
+
+        multisave = {
+            "location_checks": {(0, 1): {-1}},
+            "received_items": {(0, 1, True): [NetworkItem(-1, -1, 1), NetworkItem(-1, -2, 1)],
+                               (0, 1, False): [NetworkItem(-1, -2, 1)]},
+            "hints": {(0, 1): {Hint(1, 1, -2, -1, False)}},
+            "client_game_state": {(0, 1): ClientStatus.CLIENT_GOAL},
+            "name_aliases": {(0, 1): "Alias"},
+            "client_activity_timers": (((0, 1), 1000000000.0),),
+            "client_connection_timers": (((0, 1), 1000000001.0),),
+            "video": [((0, 1), ("Twitch", "Player1"))],
+        }
+
+        def get_data(tracker_data: tracker.TrackerData) -> tuple:
+            return (
+                tracker_data.get_seed_name(),
+                tracker_data.get_slot_info(1),
+                tracker_data.get_player_locations_count(1),
+                tracker_data.get_player_checked_locations(0, 1),
+                tracker_data.get_player_received_items(0, 1),
+                tracker_data.get_player_inventory_counts(0, 1),
+                tracker_data.get_player_hints(0, 1),
+                tracker_data.get_player_client_status(0, 1),
+                tracker_data.get_player_alias(0, 1),
+                tracker_data.get_team_locations_total_count(),
+                tracker_data.get_team_locations_checked_count(),
+                tracker_data.get_room_activity_timestamps(),
+                tracker_data.get_room_connection_timestamps(),
+                tracker_data.get_room_videos(),
+                tracker_data.get_room_datapackage(),
+                dict(tracker_data.item_id_to_name["Archipelago"]),
+                dict(tracker_data.location_id_to_name["Archipelago"]),
+            )
+
+        with db_session:
+            room = Room.get(id=self.room_id)
+            room.multisave = pickle.dumps(multisave)
+            self.assertIsNone(room.tracker_projection)
+            expected = get_data(tracker.TrackerData(room))
+            self.assertEqual(expected[4], [NetworkItem(-1, -1, 1), NetworkItem(-1, -2, 1)])
+            self.assertEqual(expected[5], {-1: 2})
+            self.assertEqual(expected[12], {(0, 1): 1000000001.0})
+            # rooms without a projection get one stored by the first tracker request
+            self.assertEqual(room.tracker_projection.data,
+                             dump_projection(project_multidata(MultiServerContext.decompress(self.data)),
+                                             project_multisave(multisave)))
+
+            with mock.patch.object(tracker.Context, "decompress", side_effect=AssertionError), \
+                    mock.patch.object(tracker, "restricted_loads", side_effect=AssertionError):
+                # the data package tables are cached by now, so nothing but the projection is unpickled
+                self.assertEqual(get_data(tracker.TrackerData(room)), expected)
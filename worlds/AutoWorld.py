@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import concurrent.futures
 import hashlib
 import logging
 import pathlib
@@ -191,6 +192,28 @@ def call_single(multiworld: "MultiWorld", method_name: str, player: int, *args:
         return ret
 
 
+def call_output_job(multiworld: "MultiWorld", player: int, output_directory: str,
+                    executor: Optional[concurrent.futures.Executor] = None) -> None:
+    """
+    Gets the output job of player's World and runs it, in executor if given, else in the calling thread.
+    """
+    job = call_single(multiworld, "get_output_job", player, output_directory)
+    if job is None:
+        return
+    try:
+        if executor is None:
+            job()
+        else:
+            executor.submit(job).result()
+    except Exception as e:
+        message = f"Exception in output job {job} for player {player}, named {multiworld.player_name[player]}."
+        if sys.version_info >= (3, 11, 0):
+            e.add_note(message)  # PEP 678
+        else:
+            logging.error(message)
+        raise e
+
+
 def call_all(multiworld: "MultiWorld", method_name: str, *args: Any) -> None:
     world_types: Set[AutoWorldRegister] = set()
     for player in multiworld.player_ids:
@@ -318,6 +341,19 @@ class World(metaclass=AutoWorldRegister):
     If False, everything is rechecked at every step, which is slower computationally, 
     but may be desirable in complex/dynamic worlds."""
 
+    track_rule_dependencies: bool = False
+    """If True, the items and Regions each blocked Entrance's access rule reads are recorded, so that updating
+    reachable regions only rechecks the Entrances that read something which changed, instead of every blocked one.
+    Locations checked through CollectionState.can_reach_recording_dependencies get recorded the same way.
+    Takes precedence over explicit_indirect_conditions. Only safe if Entrance and Location access rules get everything
+    they depend on from this world's items and Regions through the CollectionState, e.g. through state.has*/count*,
+    state.prog_items or Region/Location/Entrance.can_reach, and never get more restrictive with more items."""
+
+    cross_world_logic: bool = False
+    """If True, this world's rules may depend on other players' items or Regions. Processes that assume each world only
+    depends on itself, like entrance randomization only sweeping the randomizing player's locations, then fall back to
+    checking every player."""
+
     multiworld: "MultiWorld"
     """autoset on creation. The MultiWorld object for the currently generating multiworld."""
     player: int
@@ -431,6 +467,16 @@ class World(metaclass=AutoWorldRegister):
         """
         pass
 
+    def get_output_job(self, output_directory: str) -> Optional[Callable[[], Any]]:
+        """
+        Alternative to generate_output for Worlds whose output takes a lot of CPU time, like building a rom or patch.
+        Gets called from the same threadpool instead of generate_output, and returns a picklable callable, such as a
+        functools.partial of a module level function, that writes the output into output_directory. If enabled in the
+        host.yaml, the job runs in a separate process, so it must only need the data it was given.
+        Return None if there is nothing left to do.
+        """
+        return None
+
     def fill_slot_data(self) -> Mapping[str, Any]:  # json of WebHostLib.models.Slot
         """
         What is returned from this function will be in the `slot_data` field
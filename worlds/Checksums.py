@@ -0,0 +1,126 @@
+"""
+Checksums of rom images, shared by the worlds that write or patch roms.
+
+Uses NumPy to calculate them over whole arrays of the rom at once if it is installed, and falls back to plain Python
+otherwise. Both give bit-identical results.
+"""
+from __future__ import annotations
+
+import struct
+from typing import Union
+
+try:
+    import numpy as np
+except ImportError:  # not bundled with frozen builds
+    np = None
+
+__all__ = ["byte_sum", "n64_crc", "snes_checksum", "write_snes_checksum"]
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+_n64_crc_seed = 0xDF26F436
+_n64_crc_start = 0x1000
+_n64_crc_length = 0x100000
+_n64_crc_key_start = 0x750
+_n64_crc_key_length = 0x100
+_n64_crc_words = struct.Struct(f">{_n64_crc_length // 4}I")
+_n64_crc_key_words = struct.Struct(f">{_n64_crc_key_length // 4}I")
+
+
+def byte_sum(data: Buffer, use_numpy: bool = True) -> int:
+    """Sum of all bytes in data."""
+    if np is not None and use_numpy:
+        return int(np.frombuffer(data, np.uint8).sum(dtype=np.uint64))
+    return sum(memoryview(data).cast("B"))
+
+
+def snes_checksum(rom: Buffer, use_numpy: bool = True) -> int:
+    """
+    Checksum of a SNES rom, as stored in its header. The checksum and its complement are counted as 0xFF + 0xFF + 0x00 +
+    0x00, whatever their current value in the rom.
+    """
+    if len(rom) < 0x8000:
+        raise Exception("Tried to calculate SNES CRC on file too small to be a SNES ROM.")
+    view = memoryview(rom).cast("B")
+    return (byte_sum(view[:0x7FDC], use_numpy) + byte_sum(view[0x7FE0:], use_numpy) + 0x01FE) & 0xFFFF
+
+
+def write_snes_checksum(rom: bytearray, use_numpy: bool = True) -> None:
+    """Calculates the checksum of a SNES rom and writes it and its complement into the rom header, in place."""
+    crc = snes_checksum(rom, use_numpy)
+    inv = crc ^ 0xFFFF
+    rom[0x7FDC:0x7FE0] = bytes((inv & 0xFF, (inv >> 8) & 0xFF, crc & 0xFF, (crc >> 8) & 0xFF))
+
+
+def n64_crc(rom: Buffer, use_numpy: bool = True) -> bytes:
+    """
+    CRC of an N64 rom using the CIC-NUS-6105 algorithm, as stored at 0x10 of its header.
+
+    :param rom: The whole rom, at least 0x101000 bytes.
+    :param use_numpy: Whether to use NumPy if it is installed, instead of plain Python.
+    :return: The two big-endian 32-bit words of the CRC.
+    """
+    if len(rom) < _n64_crc_start + _n64_crc_length:
+        raise Exception("Tried to calculate N64 CRC on file too small to be a N64 ROM.")
+    if np is not None and use_numpy:
+        crc0, crc1 = _n64_crc_numpy(rom)
+    else:
+        crc0, crc1 = _n64_crc_python(rom)
+    return struct.pack(">II", crc0, crc1)
+
+
+def _n64_crc_python(rom: Buffer) -> tuple[int, int]:
+    t1 = t2 = t3 = t4 = t5 = t6 = _n64_crc_seed
+    u32 = 0xFFFFFFFF
+    words = _n64_crc_words.unpack_from(rom, _n64_crc_start)
+    key_words = _n64_crc_key_words.unpack_from(rom, _n64_crc_key_start)
+    key_count = len(key_words)
+
+    for i, d in enumerate(words):
+        # keep t2 and t6 in u32 for comparisons; others can wait to be truncated
+        if ((t6 + d) & u32) < t6:
+            t4 += 1
+
+        t6 = (t6 + d) & u32
+        t3 ^= d
+        shift = d & 0x1F
+        r = ((d << shift) | (d >> (32 - shift)))
+        t5 += r
+
+        if t2 > d:
+            t2 ^= r & u32
+        else:
+            t2 ^= t6 ^ d
+
+        t1 += key_words[i % key_count] ^ d
+
+    return (t6 ^ t4 ^ t3) & u32, (t5 ^ t2 ^ t1) & u32
+
+
+def _n64_crc_numpy(rom: Buffer) -> tuple[int, int]:
+    u32 = 0xFFFFFFFF
+    # uint64 holds the sums of all 2**18 words without overflowing
+    words = np.frombuffer(rom, ">u4", _n64_crc_length // 4, _n64_crc_start).astype(np.uint64)
+    key_words = np.frombuffer(rom, ">u4", _n64_crc_key_length // 4, _n64_crc_key_start).astype(np.uint64)
+
+    # t6 is a running sum, t4 counts how often it overflowed
+    t6_steps = np.cumsum(words)
+    t6_steps += _n64_crc_seed
+    t4 = _n64_crc_seed + (int(t6_steps[-1]) >> 32)
+    t6_steps &= u32
+    t6 = int(t6_steps[-1])
+    t3 = _n64_crc_seed ^ int(np.bitwise_xor.reduce(words))
+    shifts = words & 0x1F
+    rotated = ((words << shifts) | (words >> (32 - shifts))) & u32
+    t5 = _n64_crc_seed + int(rotated.sum())
+    t1 = _n64_crc_seed + int((words.reshape(-1, len(key_words)) ^ key_words).sum())
+
+    # which value t2 is xored with depends on t2 itself, so only this part is left sequential
+    t2 = _n64_crc_seed
+    for d, r, x in zip(words.tolist(), rotated.tolist(), (t6_steps ^ words).tolist()):
+        if t2 > d:
+            t2 ^= r
+        else:
+            t2 ^= x
+
+    return (t6 ^ t4 ^ t3) & u32, (t5 ^ t2 ^ t1) & u32
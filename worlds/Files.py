@@ -5,14 +5,17 @@ import json
 import zipfile
 from enum import IntEnum
 import os
+import struct
 import threading
 from io import BytesIO
 
-from typing import (ClassVar, Dict, List, Literal, Tuple, Any, Optional, Union, BinaryIO, overload, Sequence,
+from typing import (Callable, ClassVar, Dict, List, Literal, Tuple, Any, Optional, Union, BinaryIO, overload, Sequence,
                     TYPE_CHECKING)
 
 import bsdiff4
 
+from .Checksums import write_snes_checksum
+
 semaphore = threading.Semaphore(os.cpu_count() or 4)
 
 del threading
@@ -347,18 +350,24 @@ class APProcedurePatch(APAutoPatchInterface):
         base_data = self.get_source_data_with_cache()
         patch_extender = AutoPatchExtensionRegister.get_handler(self.game)
         assert not isinstance(self.procedure, str), f"{type(self)} must define procedures"
+        data: Union[bytes, bytearray] = base_data
         for step, args in self.procedure:
             if isinstance(patch_extender, list):
                 extension = next((item for item in [getattr(extender, step, None) for extender in patch_extender]
                                   if item is not None), None)
             else:
                 extension = getattr(patch_extender, step, None)
-            if extension is not None:
-                base_data = extension(self, base_data, *args)
-            else:
+            if extension is None:
                 raise NotImplementedError(f"Unknown procedure {step} for {self.game}.")
+            if getattr(extension, "patches_in_place", False):
+                # consecutive in place steps share one buffer, only copied from the (cached) source data once
+                if data is base_data or not isinstance(data, bytearray):
+                    data = bytearray(data)
+            elif isinstance(data, bytearray):
+                data = bytes(data)
+            data = extension(self, data, *args)
         with open(target, 'wb') as f:
-            f.write(base_data)
+            f.write(data)
 
 
 class APDeltaPatch(APProcedurePatch):
@@ -457,13 +466,29 @@ class APTokenMixin:
         self._tokens.append((token_type, offset, data))
 
 
+def patches_in_place(extension: Callable[..., bytearray]) -> Callable[..., bytearray]:
+    """
+    Marks a patch extension function as taking the data to patch as a bytearray, which it changes in place and returns.
+    Consecutive steps of a procedure using such functions then patch the same buffer, instead of each copying the data.
+    """
+    extension.patches_in_place = True  # type: ignore[attr-defined]
+    return extension
+
+
+_token_header = struct.Struct("<BII")
+_token_range = struct.Struct("<II")
+# plain ints, as comparing to the enum members is slow in the token loop
+_COPY, _RLE, _AND_8, _OR_8, _XOR_8 = (int(token_type) for token_type in (
+    APTokenTypes.COPY, APTokenTypes.RLE, APTokenTypes.AND_8, APTokenTypes.OR_8, APTokenTypes.XOR_8))
+
+
 class APPatchExtension(metaclass=AutoPatchExtensionRegister):
     """Class that defines patch extension functions for a given game.
     Patch extension functions must have the following two arguments in the following order:
 
     caller: APProcedurePatch (used to retrieve files from the patch container)
 
-    rom: bytes (the data to patch)
+    rom: bytes (the data to patch), or bytearray for functions decorated with @patches_in_place
 
     Further arguments are passed in from the procedure as defined.
 
@@ -478,44 +503,36 @@ class APPatchExtension(metaclass=AutoPatchExtensionRegister):
         return bsdiff4.patch(rom, caller.get_file(patch))
 
     @staticmethod
-    def apply_tokens(caller: APProcedurePatch, rom: bytes, token_file: str) -> bytes:
+    @patches_in_place
+    def apply_tokens(caller: APProcedurePatch, rom: bytearray, token_file: str) -> bytearray:
         """Applies the given token file from the patch onto the current file."""
-        token_data = caller.get_file(token_file)
-        rom_data = bytearray(rom)
+        token_data = memoryview(caller.get_file(token_file))
         token_count = int.from_bytes(token_data[0:4], "little")
         bpr = 4
         for _ in range(token_count):
-            token_type = token_data[bpr:bpr + 1][0]
-            offset = int.from_bytes(token_data[bpr + 1:bpr + 5], "little")
-            size = int.from_bytes(token_data[bpr + 5:bpr + 9], "little")
-            data = token_data[bpr + 9:bpr + 9 + size]
-            if token_type in [APTokenTypes.AND_8, APTokenTypes.OR_8, APTokenTypes.XOR_8]:
-                arg = data[0]
-                if token_type == APTokenTypes.AND_8:
-                    rom_data[offset] = rom_data[offset] & arg
-                elif token_type == APTokenTypes.OR_8:
-                    rom_data[offset] = rom_data[offset] | arg
-                else:
-                    rom_data[offset] = rom_data[offset] ^ arg
-            elif token_type in [APTokenTypes.COPY, APTokenTypes.RLE]:
-                length = int.from_bytes(data[:4], "little")
-                value = int.from_bytes(data[4:], "little")
-                if token_type == APTokenTypes.COPY:
-                    rom_data[offset: offset + length] = rom_data[value: value + length]
-                else:
-                    rom_data[offset: offset + length] = bytes([value] * length)
+            token_type, offset, size = _token_header.unpack_from(token_data, bpr)
+            bpr += _token_header.size
+            data = token_data[bpr:bpr + size]
+            bpr += size
+            if token_type == _AND_8:
+                rom[offset] &= data[0]
+            elif token_type == _OR_8:
+                rom[offset] |= data[0]
+            elif token_type == _XOR_8:
+                rom[offset] ^= data[0]
+            elif token_type == _COPY:
+                length, value = _token_range.unpack_from(data)
+                rom[offset:offset + length] = rom[value:value + length]
+            elif token_type == _RLE:
+                length, value = _token_range.unpack_from(data)
+                rom[offset:offset + length] = bytes((value,)) * length
             else:
-                rom_data[offset:offset + len(data)] = data
-            bpr += 9 + size
-        return bytes(rom_data)
+                rom[offset:offset + len(data)] = data
+        return rom
 
     @staticmethod
-    def calc_snes_crc(caller: APProcedurePatch, rom: bytes) -> bytes:
+    @patches_in_place
+    def calc_snes_crc(caller: APProcedurePatch, rom: bytearray) -> bytearray:
         """Calculates and applies a valid CRC for the SNES rom header."""
-        rom_data = bytearray(rom)
-        if len(rom) < 0x8000:
-            raise Exception("Tried to calculate SNES CRC on file too small to be a SNES ROM.")
-        crc = (sum(rom_data[:0x7FDC] + rom_data[0x7FE0:]) + 0x01FE) & 0xFFFF
-        inv = crc ^ 0xFFFF
-        rom_data[0x7FDC:0x7FE0] = [inv & 0xFF, (inv >> 8) & 0xFF, crc & 0xFF, (crc >> 8) & 0xFF]
-        return bytes(rom_data)
+        write_snes_checksum(rom)
+        return rom
@@ -10,6 +10,7 @@ import dataclasses
 import json
 from typing import List
 
+import WorldIndex
 from NetUtils import DataPackage
 from Utils import local_path, user_path, Version, version_tuple, tuplize_version
 
@@ -44,6 +45,15 @@ class WorldSource:
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}({self.path}, is_zip={self.is_zip}, relative={self.relative})"
 
+    @property
+    def name(self) -> str:
+        return os.path.basename(self.path).rsplit(".", 1)[0]
+
+    @property
+    def requested(self) -> bool:
+        """Whether this source should be loaded, see WorldIndex.restrict_world_loading."""
+        return WorldIndex.world_sources_to_load is None or self.name in WorldIndex.world_sources_to_load
+
     @property
     def resolved_path(self) -> str:
         if self.relative:
@@ -80,7 +90,7 @@ class WorldSource:
             traceback.print_exc(file=file_like)
             file_like.seek(0)
             logging.exception(file_like.read())
-            failed_world_loads.append(os.path.basename(self.path).rsplit(".", 1)[0])
+            failed_world_loads.append(self.name)
             return False
 
 
@@ -106,6 +116,8 @@ for folder in (folder for folder in (user_folder, local_folder) if folder):
 world_sources.sort()
 apworlds: list[WorldSource] = []
 for world_source in world_sources:
+    if not world_source.requested:
+        continue
     # load all loose files first:
     if world_source.is_zip:
         apworlds.append(world_source)
@@ -116,7 +128,7 @@ for world_source in world_sources:
 from .AutoWorld import AutoWorldRegister
 
 for world_source in world_sources:
-    if not world_source.is_zip:
+    if not world_source.is_zip and world_source.requested:
         # look for manifest
         manifest = {}
         for dirpath, dirnames, filenames in os.walk(world_source.resolved_path):
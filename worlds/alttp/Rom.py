@@ -3,6 +3,7 @@ from __future__ import annotations
 import Utils
 import settings
 import worlds.Files
+from worlds.Checksums import write_snes_checksum
 
 LTTPJPN10HASH: str = "03a63945398191337e896e5771f77173"
 RANDOMIZERBASEHASH: str = "8704fb9b9fa4fad52d4d2f9a95fb5360"
@@ -132,29 +133,21 @@ class LocalRom:
         return expected == buffermd5.hexdigest()
 
     def patch_base_rom(self):
-        if os.path.isfile(user_path('basepatch.sfc')):
-            with open(user_path('basepatch.sfc'), 'rb') as stream:
-                buffer = bytearray(stream.read())
-
-            if self.verify(buffer):
-                self.buffer = buffer
-                return
-
-        with open(local_path("data", "basepatch.bsdiff4"), "rb") as f:
-            delta = f.read()
-
-        buffer = bsdiff4.patch(get_base_rom_bytes(), delta)
-        if self.verify(buffer):
+        def derive_base_patched_rom() -> bytes:
+            with open(local_path("data", "basepatch.bsdiff4"), "rb") as f:
+                buffer = bsdiff4.patch(get_base_rom_bytes(), f.read())
+            if not self.verify(buffer):
+                raise RuntimeError('Base patch unverified.  Unable to continue.')
+            return buffer
+
+        # the base rom is known by its hash, so only the base patch can change what gets derived
+        with Utils.get_derived_data("alttp_basepatch", Utils.get_file_md5(local_path("data", "basepatch.bsdiff4")),
+                                    derive_base_patched_rom) as buffer:
+            # this rom gets patched, so it needs a copy of its own
             self.buffer = bytearray(buffer)
-            with open(user_path('basepatch.sfc'), 'wb') as stream:
-                stream.write(buffer)
-            return
-        raise RuntimeError('Base patch unverified.  Unable to continue.')
 
     def write_crc(self):
-        crc = (sum(self.buffer[:0x7FDC] + self.buffer[0x7FE0:]) + 0x01FE) & 0xFFFF
-        inv = crc ^ 0xFFFF
-        self.write_bytes(0x7FDC, [inv & 0xFF, (inv >> 8) & 0xFF, crc & 0xFF, (crc >> 8) & 0xFF])
+        write_snes_checksum(self.buffer)
 
     def get_hash(self) -> str:
         h = hashlib.md5()
@@ -3007,17 +3000,31 @@ class LttPDeltaPatch(worlds.Files.APDeltaPatch):
         return get_base_rom_bytes()
 
 
+def write_delta_patch(rom_path: str, player: int, player_name: str) -> None:
+    """Replaces the rom at rom_path with its LttPDeltaPatch. Output job of the ALttP World."""
+    patch = LttPDeltaPatch(os.path.splitext(rom_path)[0] + LttPDeltaPatch.patch_file_ending, player=player,
+                           player_name=player_name, patched_path=rom_path)
+    patch.write()
+    os.unlink(rom_path)
+
+
 def get_base_rom_bytes(file_name: str = "") -> bytes:
     base_rom_bytes = getattr(get_base_rom_bytes, "base_rom_bytes", None)
     if not base_rom_bytes:
         file_name = get_base_rom_path(file_name)
-        base_rom_bytes = bytes(read_snes_rom(open(file_name, "rb")))
 
-        basemd5 = hashlib.md5()
-        basemd5.update(base_rom_bytes)
-        if LTTPJPN10HASH != basemd5.hexdigest():
-            raise Exception('Supplied Base Rom does not match known MD5 for Japan(1.0) release. '
-                            'Get the correct game and version, then dump it')
+        def read_base_rom() -> bytes:
+            with open(file_name, "rb") as stream:
+                buffer = bytes(read_snes_rom(stream))
+            if LTTPJPN10HASH != hashlib.md5(buffer).hexdigest():
+                raise Exception('Supplied Base Rom does not match known MD5 for Japan(1.0) release. '
+                                'Get the correct game and version, then dump it')
+            return buffer
+
+        # the header stripped and verified rom, so it is only checked once per file
+        # bsdiff4, which diffs and patches against the base rom, only takes bytes and rejects the mapping itself
+        with Utils.get_derived_data("alttp_base_rom", Utils.get_file_md5(file_name), read_base_rom) as buffer:
+            base_rom_bytes = bytes(buffer)
         get_base_rom_bytes.base_rom_bytes = base_rom_bytes
     return base_rom_bytes
 
@@ -1,3 +1,4 @@
+import functools
 import logging
 import os
 import random
@@ -17,7 +18,7 @@ from .Options import ALTTPOptions, small_key_shuffle
 from .Regions import lookup_name_to_id, create_regions, mark_light_world_regions, lookup_vanilla_location_to_entrance, \
     is_main_entrance, key_drop_data
 from .Rom import LocalRom, patch_rom, patch_race_rom, check_enemizer, patch_enemizer, apply_rom_settings, \
-    get_hash_string, get_base_rom_path, LttPDeltaPatch
+    get_hash_string, get_base_rom_path, LttPDeltaPatch, write_delta_patch
 from .Rules import set_rules
 from .Shops import create_shops, Shop, push_shop_inventories, ShopType, price_rate_display, price_type_display_name
 from .StateHelpers import can_buy_unlimited
@@ -571,7 +572,7 @@ class ALTTPWorld(World):
                     or self.options.pot_shuffle or self.options.bush_shuffle
                     or self.options.killable_thieves)
 
-    def generate_output(self, output_directory: str):
+    def get_output_job(self, output_directory: str):
         multiworld = self.multiworld
         player = self.player
 
@@ -617,15 +618,13 @@ class ALTTPWorld(World):
 
             rompath = os.path.join(output_directory, f"{self.multiworld.get_out_file_name_base(self.player)}.sfc")
             rom.write_to_file(rompath)
-            patch = LttPDeltaPatch(os.path.splitext(rompath)[0]+LttPDeltaPatch.patch_file_ending, player=player,
-                                   player_name=multiworld.player_name[player], patched_path=rompath)
-            patch.write()
-            os.unlink(rompath)
             self.rom_name = rom.name
         except:
             raise
         finally:
             self.rom_name_available_event.set() # make sure threading continues and errors are collected
+        # diffing against the base rom is the slow part, and does not need the multiworld
+        return functools.partial(write_delta_patch, rompath, player, multiworld.player_name[player])
 
     @classmethod
     def stage_extend_hint_information(cls, world, hint_data: typing.Dict[int, typing.Dict[int, str]]):
@@ -1,5 +1,5 @@
-from typing import Dict, List, Tuple, Any, Callable, TYPE_CHECKING
-from BaseClasses import CollectionState
+from typing import Dict, List, Tuple, Any, Callable, Sequence, Set, TYPE_CHECKING
+from BaseClasses import CollectionState, Region
 
 if TYPE_CHECKING:
     from . import BlasphemousWorld
@@ -11,6 +11,8 @@ class BlasRules:
     player: int
     world: BlasphemousWorld
     string_rules: Dict[str, Callable[[CollectionState], bool]]
+    item_requirements: Dict[str, Tuple[str, int]]
+    option_requirements: Set[str]
 
     def __init__(self, world: "BlasphemousWorld") -> None:
         self.player = world.player
@@ -281,6 +283,73 @@ class BlasRules:
             "canBeatLegionary": self.can_beat_legionary
         }
 
+        # string rules that only check for an amount of one item, which load_rule checks directly
+        self.item_requirements = {
+            "blood": ("Blood Perpetuated in Sand", 1),
+            "linen": ("Linen of Golden Thread", 1),
+            "nail": ("Nail Uprooted from Dirt", 1),
+            "shroud": ("Shroud of Dreamt Sins", 1),
+            "bronzeKey": ("Key of the Secular", 1),
+            "silverKey": ("Key of the Scribe", 1),
+            "goldKey": ("Key of the Inquisitor", 1),
+            "peaksKey": ("Key of the High Peaks", 1),
+            "elderKey": ("Key to the Chamber of the Eldest Brother", 1),
+            "woodKey": ("Key Grown from Twisted Wood", 1),
+            "cherubs20": ("Child of Moonlight", 20),
+            "cherubs38": ("Child of Moonlight", 38),
+            "dash": ("Dash Ability", 1),
+            "wallClimb": ("Wall Climb Ability", 1),
+            "boots": ("Boots of Pleading", 1),
+            "doubleJump": ("Purified Hand of the Nun", 1),
+            "wheel": ("The Young Mason's Wheel", 1),
+            "redWax1": ("Bead of Red Wax", 1),
+            "redWax3": ("Bead of Red Wax", 3),
+            "blueWax1": ("Bead of Blue Wax", 1),
+            "blueWax3": ("Bead of Blue Wax", 3),
+            "chalice": ("Chalice of Inverted Verses", 1),
+            "debla": ("Debla of the Lights", 1),
+            "lorquiana": ("Lorquiana", 1),
+            "zarabanda": ("Zarabanda of the Safe Haven", 1),
+            "taranto": ("Taranto to my Sister", 1),
+            "verdiales": ("Verdiales of the Forsaken Hamlet", 1),
+            "cante": ("Cante Jondo of the Three Sisters", 1),
+            "cantina": ("Cantina of the Blue Rose", 1),
+            "ruby": ("Cloistered Ruby", 1),
+            "tiento": ("Tiento to my Sister", 1),
+            "chargeBeam": ("Charged Skill", 3),
+            "rangedAttack": ("Ranged Skill", 1),
+            "guiltBead": ("Weight of True Guilt", 1),
+            "cloth": ("Linen Cloth", 1),
+            "hand": ("Severed Hand", 1),
+            "hatchedEgg": ("Hatched Egg of Deformity", 1),
+            "emptyThimble": ("Empty Golden Thimble", 1),
+            "fullThimble": ("Golden Thimble Filled with Burning Oil", 1),
+            "driedFlowers": ("Dried Flowers bathed in Tears", 1),
+            "egg": ("Egg of Deformity", 1),
+            "cord": ("Cord of the True Burying", 1),
+            "scapular": ("Incomplete Scapular", 1),
+            "trueHeart": ("Apodictic Heart of Mea Culpa", 1),
+            "bell": ("Petrified Bell", 1),
+            "verses4": ("Verses Spun from Gold", 4),
+        }
+
+        # string rules that only depend on options, which load_rule evaluates once
+        self.option_requirements = {
+            "DoubleJump",
+            "NormalLogic",
+            "NormalLogicAndDoubleJump",
+            "HardLogic",
+            "HardLogicAndDoubleJump",
+            "EnemySkips",
+            "EnemySkipsAndDoubleJump",
+            "tears0",
+            "upwarpSkipsAllowed",
+            "mourningSkipAllowed",
+            "enemySkipsAllowed",
+            "obscureSkipsAllowed",
+            "preciseSkipsAllowed",
+        }
+
         boss_strength_indirect_regions: List[str] = [
             # flasks
             "D01Z05S05[SW]",
@@ -497,31 +566,83 @@ class BlasRules:
             or (string[0] == "D" and string[3] == "B" and string[4] == "Z" and string[7] == "S")
 
     def load_rule(self, obj_is_region: bool, name: str, obj: Dict[str, Any]) -> Callable[[CollectionState], bool]:
+        """
+        Compiles the logic of a door or location, any of its clauses with all of their requirements, into a rule.
+        Requirements on options are evaluated once, item requirements become item count thresholds and region
+        requirements are checked on the region directly.
+        """
+        if not obj["logic"]:
+            return lambda state: True
+        clauses: List[Tuple[Tuple[Tuple[str, int], ...], Tuple[str, ...], Tuple[Callable[[CollectionState], bool], ...]]]
         clauses = []
+        always = False
         for clause in obj["logic"]:
-            reqs = []
+            items: Dict[str, int] = {}
+            regions: List[str] = []
+            checks: List[Callable[[CollectionState], bool]] = []
+            possible = True
             for req in clause["item_requirements"]:
                 if self.req_is_region(req):
                     if obj_is_region:
                         # add to indirect conditions if object and requirement are doors
                         self.indirect_conditions.append((req, f"{name} -> {obj['target']}"))
-                    reqs.append(lambda state, req=req: state.can_reach_region(req, self.player))
+                    regions.append(req)
                 else:
                     if obj_is_region and req in self.indirect_regions:
                         # add to indirect conditions if object is door and requirement has list of regions
                         for region in self.indirect_regions[req]:
                             self.indirect_conditions.append((region, f"{name} -> {obj['target']}"))
-                    reqs.append(self.string_rules[req])
-            if len(reqs) == 1:
-                clauses.append(reqs[0])
-            else:
-                clauses.append(lambda state, reqs=reqs: all(req(state) for req in reqs))
-        if not clauses:
+                    if req in self.option_requirements:
+                        # these don't look at the state
+                        possible = possible and self.string_rules[req](self.multiworld.state)
+                    elif req in self.item_requirements:
+                        item, count = self.item_requirements[req]
+                        items[item] = max(count, items.get(item, 0))
+                    else:
+                        checks.append(self.string_rules[req])
+            if not possible:
+                continue
+            if not items and not regions and not checks:
+                always = True
+            clauses.append((tuple(items.items()), tuple(regions), tuple(checks)))
+        if always:
             return lambda state: True
-        elif len(clauses) == 1:
-            return clauses[0]
-        else:
-            return lambda state: any(clause(state) for clause in clauses)
+        if not clauses:
+            return lambda state: False
+        return self.compile_clauses(clauses)
+
+    def compile_clauses(
+        self,
+        clauses: Sequence[Tuple[Tuple[Tuple[str, int], ...], Tuple[str, ...], Tuple[Callable[[CollectionState], bool], ...]]]
+    ) -> Callable[[CollectionState], bool]:
+        player = self.player
+        world = self.world
+        # regions are looked up on first use, as rules are loaded while the regions are still being created
+        resolved_clauses: List[Tuple[Tuple[Tuple[str, int], ...], Tuple[Region, ...],
+                                     Tuple[Callable[[CollectionState], bool], ...]]] = []
+
+        def rule(state: CollectionState) -> bool:
+            if not resolved_clauses:
+                resolved_clauses.extend((items, tuple(world.get_region(region) for region in regions), checks)
+                                        for items, regions, checks in clauses)
+            counts = state.prog_items[player]
+            for items, regions, checks in resolved_clauses:
+                for item, count in items:
+                    if counts[item] < count:
+                        break
+                else:
+                    for region in regions:
+                        if not region.can_reach(state):
+                            break
+                    else:
+                        for check in checks:
+                            if not check(state):
+                                break
+                        else:
+                            return True
+            return False
+
+        return rule
 
     # Relics
     def blood(self, state: CollectionState) -> bool:
@@ -0,0 +1,57 @@
+from BaseClasses import CollectionState
+from . import BlasphemousTestBase
+from ..Locations import location_names
+from ..Rules import BlasRules
+from ..region_data import locations
+
+
+class CompiledRulesTest(BlasphemousTestBase):
+    options = {
+        "difficulty": "normal",
+    }
+
+    @property
+    def run_default_tests(self) -> bool:
+        return False
+
+    def evaluate(self, rules: BlasRules, obj: dict, state: CollectionState) -> bool:
+        """The logic of obj, evaluated with the string rules like before load_rule compiled it."""
+        if not obj["logic"]:
+            return True
+        return any(all(state.can_reach_region(req, self.player) if rules.req_is_region(req)
+                       else rules.string_rules[req](state)
+                       for req in clause["item_requirements"])
+                   for clause in obj["logic"])
+
+    def test_requirement_tables(self) -> None:
+        """Test that the requirements load_rule compiles check the same as their string rules."""
+        rules = BlasRules(self.world)
+        for req, (item, count) in rules.item_requirements.items():
+            with self.subTest(req=req):
+                state = CollectionState(self.multiworld)
+                state.prog_items[self.player][item] = count - 1
+                self.assertFalse(rules.string_rules[req](state))
+                state.prog_items[self.player][item] = count
+                self.assertTrue(rules.string_rules[req](state))
+        all_state = self.multiworld.get_all_state()
+        for req in rules.option_requirements:
+            with self.subTest(req=req):
+                self.assertEqual(rules.string_rules[req](CollectionState(self.multiworld)),
+                                 rules.string_rules[req](all_state))
+
+    def test_compiled_rules(self) -> None:
+        """Test that the compiled location rules give the same results as evaluating their string rules."""
+        rules = BlasRules(self.world)
+        states = [CollectionState(self.multiworld), self.multiworld.get_all_state()]
+        state = CollectionState(self.multiworld)
+        for item in self.multiworld.itempool[::2]:
+            state.collect(item, True)
+        state.sweep_for_advancements()
+        states.append(state)
+        for location in locations:
+            if location["name"] in self.world.disabled_locations:
+                continue
+            rule = rules.load_rule(False, location["name"], location)
+            for index, state in enumerate(states):
+                with self.subTest(location=location_names[location["name"]], state=index):
+                    self.assertEqual(rule(state), self.evaluate(rules, location, state))
@@ -2,7 +2,6 @@ import struct
 import io
 import array
 import zlib
-import copy
 import zipfile
 from .ntype import BigStream
 
@@ -102,7 +101,7 @@ def create_patch_file(rom, rand, xor_range=(0x00B8AD30, 0x00F029A0)):
     xor_address = rand.randint(*xor_range)
     patch_data.append_int32(xor_address)
 
-    new_buffer = copy.copy(rom.original.buffer)
+    new_buffer = bytearray(rom.original.buffer)
 
     # write every changed DMA entry
     for dma_index, (from_file, start, size) in rom.changed_dma.items():
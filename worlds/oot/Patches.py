@@ -52,6 +52,12 @@ class OoTContainer(APPatch):
         super().write_contents(opened_zipfile)
 
 
+def write_patch_container(patch_data: bytes, base_path: str, output_directory: str,
+                          player: int, player_name: str) -> None:
+    """Writes the patch container of patch_data from create_patch_file. Output job of the OoT World."""
+    OoTContainer(patch_data, base_path, output_directory, player=player, player_name=player_name).write()
+
+
 # "Spoiler" argument deleted; can probably be replaced with calls to world.world
 def patch_rom(world, rom):
     with open(data_path('generated/rom_patch.txt'), 'r') as stream:
@@ -1,4 +1,5 @@
 import json
+import mmap
 import os
 import platform
 import struct
@@ -6,7 +7,7 @@ import subprocess
 import copy
 import threading
 from .Utils import subprocess_args, data_path, get_version_bytes, __version__
-from Utils import user_path
+from Utils import get_derived_data, get_file_md5, user_path
 from .ntype import BigStream
 from .crc import calculate_crc
 
@@ -55,10 +56,15 @@ class Rom(BigStream):
         self.decompress_rom_file(file, decomp_file, force_use)
 
         # Add file to maximum size
-        self.buffer.extend(bytearray([0x00] * (0x4000000 - len(self.buffer))))
+        if len(self.buffer) < 0x4000000:
+            self.buffer = bytearray(self.buffer)
+            self.buffer.extend(bytearray([0x00] * (0x4000000 - len(self.buffer))))
         with double_cache_prevention:
             if not self.original:
                 Rom.original = self.copy()
+        # the original is only read from, so only the rom that gets patched needs a copy of a memory mapped rom
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer = bytearray(self.buffer)
 
         # Add version number to header.
         self.write_bytes(0x35, get_version_bytes(__version__))
@@ -66,7 +72,8 @@ class Rom(BigStream):
 
     def copy(self):
         new_rom = Rom()
-        new_rom.buffer = copy.copy(self.buffer)
+        # a read only mapping can't be written to, so it can be shared
+        new_rom.buffer = self.buffer if isinstance(self.buffer, mmap.mmap) else copy.copy(self.buffer)
         new_rom.changed_address = copy.copy(self.changed_address)
         new_rom.changed_dma = copy.copy(self.changed_dma)
         new_rom.force_patch = copy.copy(self.force_patch)
@@ -91,26 +98,34 @@ class Rom(BigStream):
             raise RuntimeError('ROM file %s is not a valid OoT 1.0 US ROM.' % file)
         elif len(self.buffer) == 0x2000000:
             # If Input ROM is compressed, then Decompress it
-
-            sub_dir = data_path("Decompress")
-
-            if platform.system() == 'Windows':
-                subcall = [sub_dir + "\\Decompress.exe", file, decomp_file]
-            elif platform.system() == 'Linux':
-                if platform.uname()[4] == 'aarch64' or platform.uname()[4] == 'arm64':
-                    subcall = [sub_dir + "/Decompress_ARM64", file, decomp_file]
+            def decompress() -> bytes:
+                sub_dir = data_path("Decompress")
+
+                if platform.system() == 'Windows':
+                    subcall = [sub_dir + "\\Decompress.exe", file, decomp_file]
+                elif platform.system() == 'Linux':
+                    if platform.uname()[4] == 'aarch64' or platform.uname()[4] == 'arm64':
+                        subcall = [sub_dir + "/Decompress_ARM64", file, decomp_file]
+                    else:
+                        subcall = [sub_dir + "/Decompress", file, decomp_file]
+                elif platform.system() == 'Darwin':
+                    subcall = [sub_dir + "/Decompress.out", file, decomp_file]
                 else:
-                    subcall = [sub_dir + "/Decompress", file, decomp_file]
-            elif platform.system() == 'Darwin':
-                subcall = [sub_dir + "/Decompress.out", file, decomp_file]
-            else:
-                raise RuntimeError(
-                    'Unsupported operating system for decompression. Please supply an already decompressed ROM.')
-
-            if not os.path.exists(subcall[0]):
-                raise RuntimeError(f'Decompressor does not exist! Please place it at {subcall[0]}.')
-            subprocess.call(subcall, **subprocess_args())
-            self.read_rom(decomp_file)
+                    raise RuntimeError(
+                        'Unsupported operating system for decompression. Please supply an already decompressed ROM.')
+
+                if not os.path.exists(subcall[0]):
+                    raise RuntimeError(f'Decompressor does not exist! Please place it at {subcall[0]}.')
+                subprocess.call(subcall, **subprocess_args())
+                with open(decomp_file, 'rb') as stream:
+                    return stream.read()
+
+            # only run the decompressor once per base rom
+            # the read only mapping is kept for the original rom, see __init__
+            self.buffer = get_derived_data("oot_decompressed_rom", get_file_md5(file), decompress)
+            if not os.path.exists(decomp_file):
+                with open(decomp_file, 'wb') as stream:
+                    stream.write(self.buffer)
         else:
             # ROM file is a valid and already uncompressed
             pass
@@ -124,7 +139,7 @@ class Rom(BigStream):
         self.changed_address.update(zip(range(address, address + len(values)), values))
 
     def restore(self):
-        self.buffer = copy.copy(self.original.buffer)
+        self.buffer = bytearray(self.original.buffer)
         self.changed_address = {}
         self.changed_dma = {}
         self.force_patch = []
@@ -1,13 +1,19 @@
 import ast
 from collections import defaultdict
 from inspect import signature, _ParameterKind
+import hashlib
+import importlib.util
 import logging
+import marshal
+import os
+import pkgutil
 import re
 
 from .Items import item_table
 from .Location import OOTLocation
 from .Regions import TimeOfDay, OOTRegion
 from BaseClasses import CollectionState as State
+from Utils import cache_path
 from .Utils import data_path, read_json
 
 from worlds.generic.Rules import set_rule
@@ -30,6 +36,15 @@ kwarg_defaults = {
 
 allowed_globals = {'TimeOfDay': TimeOfDay}
 
+# Rules parsed by any player, shared by all players and optionally between generations.
+# Generated rules refer to the player by the keyword arg, so the code of a rule is the same for every player.
+# rule string -> list of (dependencies, events, rule ast string)
+parsed_rules = {}
+# rule ast string -> code creating the rule's lambda
+compiled_rules = {}
+rule_cache_changed = False
+rule_cache_loaded = False
+
 rule_aliases = {}
 nonaliases = set()
 
@@ -50,6 +65,60 @@ def isliteral(expr):
     return isinstance(expr, (ast.Num, ast.Str, ast.Bytes, ast.NameConstant))
 
 
+def get_rule_cache_key():
+    key = hashlib.sha256(importlib.util.MAGIC_NUMBER)
+    for resource in ('RuleParser.py', 'Items.py', 'data/LogicHelpers.json'):
+        key.update(pkgutil.get_data(__package__, resource))
+    return key.hexdigest()
+
+
+def load_rule_cache():
+    global parsed_rules, compiled_rules, rule_cache_loaded
+    if rule_cache_loaded:
+        return
+    rule_cache_loaded = True
+    try:
+        with open(cache_path('oot_rule_cache.marshal'), 'rb') as f:
+            key, cached_parsed_rules, cached_compiled_rules = marshal.load(f)
+    except FileNotFoundError:
+        return
+    except Exception as e:
+        logging.getLogger('').debug('Could not read OoT rule cache: %s', e)
+        return
+    if key == get_rule_cache_key():
+        cached_parsed_rules.update(parsed_rules)
+        cached_compiled_rules.update(compiled_rules)
+        parsed_rules, compiled_rules = cached_parsed_rules, cached_compiled_rules
+
+
+def save_rule_cache():
+    global rule_cache_changed
+    if not rule_cache_changed:
+        return
+    rule_cache_changed = False
+    path = cache_path('oot_rule_cache.marshal')
+    try:
+        data = marshal.dumps((get_rule_cache_key(), parsed_rules, compiled_rules))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f'{path}.{os.getpid()}.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except (OSError, ValueError) as e:
+        logging.getLogger('').warning('Could not write OoT rule cache: %s', e)
+
+
+# What parsing a rule looked up and added, to reuse the parsed rule for other spots and players.
+class RuleRecording:
+
+    def __init__(self):
+        # (kind, name) -> value, see Rule_AST_Transformer.lookup
+        self.dependencies = {}
+        self.events = set()
+        # rules creating subrules have to be parsed for every spot
+        self.cacheable = True
+
+
 class Rule_AST_Transformer(ast.NodeTransformer):
 
     def __init__(self, world, player):
@@ -67,6 +136,45 @@ class Rule_AST_Transformer(ast.NodeTransformer):
         self.rule_cache = {}
         self.kwarg_defaults = kwarg_defaults.copy()  # otherwise this gets contaminated between players
         self.kwarg_defaults['player'] = self.player
+        # the generated lambdas get their kwarg defaults from here
+        self.rule_globals = {**allowed_globals, **self.kwarg_defaults}
+        self.recording = None
+
+
+    # Looks up something a parsed rule depends on, recording it while a rule is parsed.
+    def lookup(self, kind, name=None):
+        if kind == 'is setting':
+            value = name in self.world.__dict__
+        elif kind == 'setting':
+            value = self.world.__dict__[name]
+        elif kind == 'attribute':
+            value = getattr(self.world, name)
+        elif kind == 'spot region':
+            value = self.current_spot_region().name
+        else:  # 'spot type'
+            value = self.current_spot.type
+        if self.recording is not None:
+            self.recording.dependencies[kind, name] = value
+        return value
+
+    def dependencies_hold(self, dependencies):
+        for kind, name, value in dependencies:
+            try:
+                current = self.lookup(kind, name)
+            except (KeyError, AttributeError):
+                return False
+            # settings are turned into literals, so True and 1 are not the same
+            if type(current) is not type(value) or current != value:
+                return False
+        return True
+
+    def current_spot_region(self):
+        return self.current_spot if type(self.current_spot) == OOTRegion else self.current_spot.parent_region
+
+    def add_event(self, name):
+        self.events.add(name)
+        if self.recording is not None:
+            self.recording.events.add(name)
 
 
     def visit_Name(self, node):
@@ -84,23 +192,23 @@ class Rule_AST_Transformer(ast.NodeTransformer):
                     value=ast.Name(id='state', ctx=ast.Load()),
                     attr='has',
                     ctx=ast.Load()),
-                args=[ast.Str(escaped_items[node.id]), ast.Constant(self.player)],
+                args=[ast.Str(escaped_items[node.id]), ast.Name(id='player', ctx=ast.Load())],
                 keywords=[])
-        elif node.id in self.world.__dict__:
+        elif self.lookup('is setting', node.id):
             # Settings are constant
-            return ast.parse('%r' % self.world.__dict__[node.id], mode='eval').body
+            return ast.parse('%r' % self.lookup('setting', node.id), mode='eval').body
         elif node.id in State.__dict__:
             return self.make_call(node, node.id, [], [])
         elif node.id in self.kwarg_defaults or node.id in allowed_globals:
             return node
         elif event_name.match(node.id):
-            self.events.add(node.id.replace('_', ' '))
+            self.add_event(node.id.replace('_', ' '))
             return ast.Call(
                 func=ast.Attribute(
                     value=ast.Name(id='state', ctx=ast.Load()),
                     attr='has',
                     ctx=ast.Load()),
-                args=[ast.Str(node.id.replace('_', ' ')), ast.Constant(self.player)],
+                args=[ast.Str(node.id.replace('_', ' ')), ast.Name(id='player', ctx=ast.Load())],
                 keywords=[])
         else:
             raise Exception('Parse Error: invalid node name %s' % node.id, self.current_spot.name, ast.dump(node, False))
@@ -111,7 +219,7 @@ class Rule_AST_Transformer(ast.NodeTransformer):
                 value=ast.Name(id='state', ctx=ast.Load()),
                 attr='has',
                 ctx=ast.Load()),
-            args=[ast.Str(node.s), ast.Constant(self.player)],
+            args=[ast.Str(node.s), ast.Name(id='player', ctx=ast.Load())],
             keywords=[])
 
     # python 3.8 compatibility: ast walking now uses visit_Constant for Constant subclasses
@@ -137,20 +245,20 @@ class Rule_AST_Transformer(ast.NodeTransformer):
 
         if isinstance(count, ast.Name):
             # Must be a settings constant
-            count = ast.parse('%r' % self.world.__dict__[count.id], mode='eval').body
+            count = ast.parse('%r' % self.lookup('setting', count.id), mode='eval').body
 
         if iname in escaped_items:
             iname = escaped_items[iname]
 
         if iname not in item_table:
-            self.events.add(iname)
+            self.add_event(iname)
 
         return ast.Call(
             func=ast.Attribute(
                 value=ast.Name(id='state', ctx=ast.Load()),
                 attr='has',
                 ctx=ast.Load()),
-            args=[ast.Str(iname), ast.Constant(self.player), count],
+            args=[ast.Str(iname), ast.Name(id='player', ctx=ast.Load()), count],
             keywords=[])
 
 
@@ -182,7 +290,7 @@ class Rule_AST_Transformer(ast.NodeTransformer):
         new_args = []
         for child in node.args:
             if isinstance(child, ast.Name):
-                if child.id in self.world.__dict__:
+                if self.lookup('is setting', child.id):
                     # child = ast.Attribute(
                     #     value=ast.Attribute(
                     #         value=ast.Name(id='state', ctx=ast.Load()),
@@ -190,7 +298,7 @@ class Rule_AST_Transformer(ast.NodeTransformer):
                     #         ctx=ast.Load()),
                     #     attr=child.id,
                     #     ctx=ast.Load())
-                    child = ast.Constant(getattr(self.world, child.id))
+                    child = ast.Constant(self.lookup('setting', child.id))
                 elif child.id in rule_aliases:
                     child = self.visit(child)
                 elif child.id in escaped_items:
@@ -221,7 +329,7 @@ class Rule_AST_Transformer(ast.NodeTransformer):
                                 ctx=ast.Load()),
                             attr='worlds',
                             ctx=ast.Load()),
-                        slice=ast.Index(value=ast.Constant(self.player)),
+                        slice=ast.Index(value=ast.Name(id='player', ctx=ast.Load())),
                         ctx=ast.Load()),
                     attr=node.value.id,
                     ctx=ast.Load()),
@@ -242,7 +350,8 @@ class Rule_AST_Transformer(ast.NodeTransformer):
         # Fast check for json can_use
         if (len(node.ops) == 1 and isinstance(node.ops[0], ast.Eq)
                 and isinstance(node.left, ast.Name) and isinstance(node.comparators[0], ast.Name)
-                and node.left.id not in self.world.__dict__ and node.comparators[0].id not in self.world.__dict__):
+                and not self.lookup('is setting', node.left.id)
+                and not self.lookup('is setting', node.comparators[0].id)):
             return ast.NameConstant(node.left.id == node.comparators[0].id)
 
         node.left = escape_or_string(node.left)
@@ -325,7 +434,8 @@ class Rule_AST_Transformer(ast.NodeTransformer):
                     value=ast.Name(id='state', ctx=ast.Load()),
                     attr='has_any' if early_return else 'has_all',
                     ctx=ast.Load()),
-                args=[ast.Tuple(elts=[ast.Str(i) for i in items], ctx=ast.Load()), ast.Constant(self.player)],
+                args=[ast.Tuple(elts=[ast.Str(i) for i in items], ctx=ast.Load()),
+                      ast.Name(id='player', ctx=ast.Load())],
                 keywords=[])] + new_values
         else:
             node.values = new_values
@@ -341,8 +451,8 @@ class Rule_AST_Transformer(ast.NodeTransformer):
         if not hasattr(State, name):
             raise Exception('Parse Error: No such function State.%s' % name, self.current_spot.name, ast.dump(node, False))
 
-        for (k, v) in self.kwarg_defaults.items():
-            keywords.append(ast.keyword(arg=f'{k}', value=ast.Constant(v)))
+        for k in self.kwarg_defaults.keys():
+            keywords.append(ast.keyword(arg=f'{k}', value=ast.Name(id=k, ctx=ast.Load())))
 
         return ast.Call(
             func=ast.Attribute(
@@ -354,6 +464,8 @@ class Rule_AST_Transformer(ast.NodeTransformer):
 
 
     def replace_subrule(self, target, node):
+        if self.recording is not None:
+            self.recording.cacheable = False
         rule = ast.dump(node, False)
         if rule in self.replaced_rules[target]:
             return self.replaced_rules[target][rule]
@@ -367,7 +479,7 @@ class Rule_AST_Transformer(ast.NodeTransformer):
                 value=ast.Name(id='state', ctx=ast.Load()),
                 attr='has',
                 ctx=ast.Load()),
-            args=[ast.Str(subrule_name), ast.Constant(self.player)],
+            args=[ast.Str(subrule_name), ast.Name(id='player', ctx=ast.Load())],
             keywords=[])
         # Cache the subrule for any others in this region
         # (and reserve the item name in the process)
@@ -401,13 +513,14 @@ class Rule_AST_Transformer(ast.NodeTransformer):
 
 
     def make_access_rule(self, body):
+        global rule_cache_changed
         rule_str = ast.dump(body, False)
-        if rule_str not in self.rule_cache:
+        if rule_str not in compiled_rules:
             # requires consistent iteration on dicts
             kwargs = [ast.arg(arg=k) for k in self.kwarg_defaults.keys()]
-            kwd = list(map(ast.Constant, self.kwarg_defaults.values()))
+            kwd = [ast.Name(id=k, ctx=ast.Load()) for k in self.kwarg_defaults.keys()]
             try:
-                self.rule_cache[rule_str] = eval(compile(
+                compiled_rules[rule_str] = compile(
                     ast.fix_missing_locations(
                         ast.Expression(ast.Lambda(
                             args=ast.arguments(
@@ -417,11 +530,16 @@ class Rule_AST_Transformer(ast.NodeTransformer):
                                 kwonlyargs=kwargs,
                                 kw_defaults=kwd),
                             body=body))),
-                    '<string>', 'eval'),
-                    # globals/locals. if undefined, everything in the namespace *now* would be allowed
-                    allowed_globals)
+                    '<string>', 'eval')
             except TypeError as e:
                 raise Exception('Parse Error: %s' % e, self.current_spot.name, ast.dump(body, False))
+            rule_cache_changed = True
+        return self.make_rule(rule_str)
+
+    def make_rule(self, rule_str):
+        if rule_str not in self.rule_cache:
+            # globals/locals. if undefined, everything in the namespace *now* would be allowed
+            self.rule_cache[rule_str] = eval(compiled_rules[rule_str], self.rule_globals)
         return self.rule_cache[rule_str]
 
 
@@ -448,38 +566,56 @@ class Rule_AST_Transformer(ast.NodeTransformer):
     ## Handlers for compile-time optimizations (former State functions)
 
     def at_day(self, node):
-        if self.world.ensure_tod_access:
+        if self.lookup('attribute', 'ensure_tod_access'):
             # tod has DAY or (tod == NONE and (ss or find a path from a provider))
             # parsing is better than constructing this expression by hand
-            r = self.current_spot if type(self.current_spot) == OOTRegion else self.current_spot.parent_region
-            return ast.parse(f"(state.has('Ocarina', player) and state.has('Suns Song', player)) or state._oot_reach_at_time('{r.name}', TimeOfDay.DAY, [], player)", mode='eval').body
+            region_name = self.lookup('spot region')
+            return ast.parse(f"(state.has('Ocarina', player) and state.has('Suns Song', player)) or state._oot_reach_at_time('{region_name}', TimeOfDay.DAY, [], player)", mode='eval').body
         return ast.NameConstant(True)
 
     def at_dampe_time(self, node):
-        if self.world.ensure_tod_access:
+        if self.lookup('attribute', 'ensure_tod_access'):
             # tod has DAMPE or (tod == NONE and (find a path from a provider))
             # parsing is better than constructing this expression by hand
-            r = self.current_spot if type(self.current_spot) == OOTRegion else self.current_spot.parent_region
-            return ast.parse(f"state._oot_reach_at_time('{r.name}', TimeOfDay.DAMPE, [], player)", mode='eval').body
+            region_name = self.lookup('spot region')
+            return ast.parse(f"state._oot_reach_at_time('{region_name}', TimeOfDay.DAMPE, [], player)", mode='eval').body
         return ast.NameConstant(True)
 
     def at_night(self, node):
-        if self.current_spot.type == 'GS Token' and self.world.logic_no_night_tokens_without_suns_song:
+        if (self.lookup('spot type') == 'GS Token'
+                and self.lookup('attribute', 'logic_no_night_tokens_without_suns_song')):
             # Using visit here to resolve 'can_play' rule
             return self.visit(ast.parse('can_play(Suns_Song)', mode='eval').body)
-        if self.world.ensure_tod_access:
+        if self.lookup('attribute', 'ensure_tod_access'):
             # tod has DAMPE or (tod == NONE and (ss or find a path from a provider))
             # parsing is better than constructing this expression by hand
-            r = self.current_spot if type(self.current_spot) == OOTRegion else self.current_spot.parent_region
-            return ast.parse(f"(state.has('Ocarina', player) and state.has('Suns Song', player)) or state._oot_reach_at_time('{r.name}', TimeOfDay.DAMPE, [], player)", mode='eval').body
+            region_name = self.lookup('spot region')
+            return ast.parse(f"(state.has('Ocarina', player) and state.has('Suns Song', player)) or state._oot_reach_at_time('{region_name}', TimeOfDay.DAMPE, [], player)", mode='eval').body
         return ast.NameConstant(True)
 
 
     # Parse entry point
     # If spot is None, here() rules won't work.
     def parse_rule(self, rule_string, spot=None):
+        global rule_cache_changed
         self.current_spot = spot
-        return self.make_access_rule(self.visit(ast.parse(rule_string, mode='eval').body))
+        for dependencies, events, rule_str in parsed_rules.get(rule_string, ()):
+            if self.dependencies_hold(dependencies):
+                self.events.update(events)
+                return self.make_rule(rule_str)
+
+        self.recording = recording = RuleRecording()
+        try:
+            body = self.visit(ast.parse(rule_string, mode='eval').body)
+        finally:
+            self.recording = None
+        access_rule = self.make_access_rule(body)
+        if recording.cacheable:
+            dependencies = tuple((kind, name, value) for (kind, name), value in recording.dependencies.items())
+            parsed_rules.setdefault(rule_string, []).append(
+                (dependencies, frozenset(recording.events), ast.dump(body, False)))
+            rule_cache_changed = True
+        return access_rule
 
     def parse_spot_rule(self, spot):
         rule = spot.rule_string.split('#', 1)[0].strip()
@@ -493,21 +629,21 @@ class Rule_AST_Transformer(ast.NodeTransformer):
 
     # Hijacking functions
     def current_spot_child_access(self, node): 
-        r = self.current_spot if type(self.current_spot) == OOTRegion else self.current_spot.parent_region
-        return ast.parse(f"state._oot_reach_as_age('{r.name}', 'child', {self.player})", mode='eval').body
+        region_name = self.lookup('spot region')
+        return ast.parse(f"state._oot_reach_as_age('{region_name}', 'child', player)", mode='eval').body
 
     def current_spot_adult_access(self, node): 
-        r = self.current_spot if type(self.current_spot) == OOTRegion else self.current_spot.parent_region
-        return ast.parse(f"state._oot_reach_as_age('{r.name}', 'adult', {self.player})", mode='eval').body
+        region_name = self.lookup('spot region')
+        return ast.parse(f"state._oot_reach_as_age('{region_name}', 'adult', player)", mode='eval').body
 
     def current_spot_starting_age_access(self, node): 
-        return self.current_spot_child_access(node) if self.world.starting_age == 'child' else self.current_spot_adult_access(node)
+        return self.current_spot_child_access(node) if self.lookup('attribute', 'starting_age') == 'child' else self.current_spot_adult_access(node)
 
     def has_bottle(self, node): 
-        return ast.parse(f"state._oot_has_bottle({self.player})", mode='eval').body
+        return ast.parse("state._oot_has_bottle(player)", mode='eval').body
 
     def can_live_dmg(self, node):
-        return ast.parse(f"state._oot_can_live_dmg({self.player}, {node.args[0].value})", mode='eval').body
+        return ast.parse(f"state._oot_can_live_dmg(player, {node.args[0].value})", mode='eval').body
 
     def region_has_shortcuts(self, node):
-        return ast.parse(f"state._oot_region_has_shortcuts({self.player}, '{node.args[0].value}')", mode='eval').body
+        return ast.parse(f"state._oot_region_has_shortcuts(player, '{node.args[0].value}')", mode='eval').body
@@ -19,14 +19,14 @@ from .Items import OOTItem, item_table, oot_data_to_ap_id, oot_is_item_of_type
 from .ItemPool import generate_itempool, get_junk_item, get_junk_pool
 from .Regions import OOTRegion, TimeOfDay
 from .Rules import set_rules, set_shop_rules, set_entrances_based_rules
-from .RuleParser import Rule_AST_Transformer
+from .RuleParser import Rule_AST_Transformer, load_rule_cache, save_rule_cache
 from .Options import OoTOptions, oot_option_groups
 from .Utils import data_path, read_json
 from .LocationList import business_scrubs, set_drop_location_names, dungeon_song_locations
 from .DungeonList import dungeon_table, create_dungeons
 from .LogicTricks import normalized_name_tricks
 from .Rom import Rom
-from .Patches import OoTContainer, patch_rom
+from .Patches import patch_rom, write_patch_container
 from .N64Patch import create_patch_file
 from .Cosmetics import patch_cosmetics
 
@@ -85,8 +85,15 @@ class OOTSettings(settings.Group):
         Alternatively, a path to a program to open the .z64 file with
         """
 
+    class RuleCache(settings.Bool):
+        """
+        Set this to true to keep the logic rules parsed during generation in the cache directory,
+        so later generations do not have to parse them again
+        """
+
     rom_file: RomFile = RomFile(RomFile.copy_to)
     rom_start: typing.Union[RomStart, bool] = True
+    rule_cache: typing.Union[RuleCache, bool] = False
 
 
 class OOTWeb(WebWorld):
@@ -208,6 +215,8 @@ class OOTWorld(World):
 
     # Option parsing, handling incompatible options, building useful-item table
     def generate_early(self):
+        if self.settings.rule_cache:
+            load_rule_cache()
         self.parser = Rule_AST_Transformer(self, self.player)
 
         for option_name in self.options_dataclass.type_hints:
@@ -757,6 +766,8 @@ class OOTWorld(World):
         start.connect(self.get_region('Root'))
         create_dungeons(self)
         self.parser.create_delayed_rules()
+        if self.settings.rule_cache:
+            save_rule_cache()
 
         if self.shopsanity != 'off':
             self.random_shop_prices()
@@ -1049,7 +1060,7 @@ class OOTWorld(World):
                 loc.address = None
 
 
-    def generate_output(self, output_directory: str):
+    def get_output_job(self, output_directory: str):
 
         # Write entrances to spoiler log
         all_entrances = self.get_shuffled_entrances()
@@ -1102,13 +1113,12 @@ class OOTWorld(World):
             finally:
                 self.collectible_flags_available.set()
             rom.update_header()
+            # diffing stays under i_o_limiter, so that only the compressed patch outlives the rom
             patch_data = create_patch_file(rom, self.random)
             rom.restore()
 
-            apz5 = OoTContainer(patch_data, outfile_name, output_directory,
-                player=self.player,
-                player_name=self.multiworld.get_player_name(self.player))
-            apz5.write()
+        return functools.partial(write_patch_container, patch_data, outfile_name, output_directory,
+                                 self.player, self.multiworld.get_player_name(self.player))
 
 
     # Gathers hint data for OoT. Loops over all world locations for woth, barren, and major item locations.
@@ -0,0 +1,36 @@
+import unittest
+
+from test.general import setup_multiworld
+from .. import OOTWorld, RuleParser
+
+
+class TestRuleParser(unittest.TestCase):
+    def test_shared_rules(self) -> None:
+        """Test that rules parsed once for all players are the same as rules parsed separately for each player."""
+        options = [
+            {},
+            {"starting_age": "adult", "logic_no_night_tokens_without_suns_song": True},
+            {"open_forest": "closed", "bridge": "vanilla", "logic_tricks": ["Kakariko Tower GS with Jump Slash"]},
+        ]
+        multiworld = setup_multiworld([OOTWorld] * len(options), ("generate_early", "create_regions"), options=options)
+        for player in multiworld.player_ids:
+            world = multiworld.worlds[player]
+            rule_strings = {id(rule): rule_str for rule_str, rule in world.parser.rule_cache.items()}
+            parser = RuleParser.Rule_AST_Transformer(world, player)
+            spots = [*multiworld.get_locations(player), *multiworld.get_entrances(player)]
+            for spot in spots:
+                if not hasattr(spot, "rule_string") or id(spot.access_rule) not in rule_strings:
+                    continue
+                rule_string = spot.rule_string.split("#", 1)[0].strip()
+                if rule_string not in RuleParser.parsed_rules:
+                    continue  # creates subrules, which are numbered per parser
+                with self.subTest(player=player, spot=spot.name):
+                    shared_rules = RuleParser.parsed_rules.pop(rule_string)
+                    try:
+                        rule = parser.parse_rule(rule_string, spot)
+                    finally:
+                        RuleParser.parsed_rules[rule_string] = shared_rules
+                    fresh_rule_strings = {id(rule): rule_str for rule_str, rule in parser.rule_cache.items()}
+                    self.assertEqual(rule_strings[id(spot.access_rule)], fresh_rule_strings[id(rule)])
+                    self.assertEqual(spot.access_rule.__kwdefaults__, {"player": player})
+            self.assertLessEqual(parser.events, world.parser.events)
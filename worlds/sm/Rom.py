@@ -1,11 +1,13 @@
 import hashlib
 import os
+from typing import Dict, Iterable
 
 import settings
 import json
 import Utils
 from Utils import read_snes_rom
-from worlds.Files import APPatchExtension, APProcedurePatch, APTokenMixin, APTokenTypes
+from worlds.Checksums import byte_sum
+from worlds.Files import APPatchExtension, APProcedurePatch, APTokenMixin, APTokenTypes, patches_in_place
 from .variaRandomizer.utils.utils import openFile
 
 SMJUHASH = '21f3e98df4780ee1c667b84e57d88675'
@@ -16,12 +18,13 @@ class SMPatchExtensions(APPatchExtension):
     game = "Super Metroid"
 
     @staticmethod
-    def write_crc(caller: APProcedurePatch, rom: bytes) -> bytes:
+    @patches_in_place
+    def write_crc(caller: APProcedurePatch, rom: bytearray) -> bytearray:
         def checksum_mirror_sum(start, length, mask = 0x800000):
             while not(length & mask) and mask:
                 mask >>= 1
 
-            part1 = sum(start[:mask]) & 0xFFFF
+            part1 = byte_sum(start[:mask]) & 0xFFFF
             part2 = 0
 
             next_length = length - mask
@@ -37,11 +40,10 @@ class SMPatchExtensions(APPatchExtension):
         def write_bytes(buffer, startaddress: int, values):
             buffer[startaddress:startaddress + len(values)] = values
 
-        buffer = bytearray(rom)
-        crc = checksum_mirror_sum(buffer, len(buffer))
+        crc = checksum_mirror_sum(memoryview(rom), len(rom))
         inv = crc ^ 0xFFFF
-        write_bytes(buffer, 0x7FDC, [inv & 0xFF, (inv >> 8) & 0xFF, crc & 0xFF, (crc >> 8) & 0xFF])
-        return bytes(buffer)
+        write_bytes(rom, 0x7FDC, [inv & 0xFF, (inv >> 8) & 0xFF, crc & 0xFF, (crc >> 8) & 0xFF])
+        return rom
 
 class SMProcedurePatch(APProcedurePatch, APTokenMixin):
     hash = SMJUHASH
@@ -62,6 +64,20 @@ class SMProcedurePatch(APProcedurePatch, APTokenMixin):
     def get_source_data(cls) -> bytes:
         return get_base_rom_bytes()
 
+def get_token_data(patches: Dict[int, Iterable[int]]) -> bytes:
+    """Returns the token data of the rom changes in patches, as written by SMProcedurePatch.write_tokens."""
+    patch = SMProcedurePatch()
+    patch.write_tokens(patches)
+    return patch.files["token_data.bin"]
+
+
+def write_patch(token_data: bytes, patch_path: str, player: int, player_name: str) -> None:
+    """Writes the SMProcedurePatch of token_data from get_token_data to patch_path. Output job of the SM World."""
+    patch = SMProcedurePatch(player=player, player_name=player_name)
+    patch.write_file("token_data.bin", token_data)
+    patch.write(patch_path)
+
+
 def get_base_rom_bytes(file_name: str = "") -> bytes:
     base_rom_bytes = getattr(get_base_rom_bytes, "base_rom_bytes", None)
     if not base_rom_bytes:
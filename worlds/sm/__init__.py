@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import base64
 import copy
+import functools
 import logging
 import threading
 import typing
@@ -17,7 +18,8 @@ logger = logging.getLogger("Super Metroid")
 
 from .Options import SMOptions, sm_option_groups
 from .Client import SMSNIClient
-from .Rom import SM_ROM_MAX_PLAYERID, SM_ROM_PLAYERDATA_COUNT, SMProcedurePatch, get_sm_symbols
+from .Rom import SM_ROM_MAX_PLAYERID, SM_ROM_PLAYERDATA_COUNT, SMProcedurePatch, get_sm_symbols, \
+    get_token_data, write_patch
 import Utils
 
 from .variaRandomizer.logic.smboolmanager import SMBoolManager
@@ -62,7 +64,7 @@ class SMCollectionState(metaclass=AutoLogicRegister):
             self.smbm = {}
 
     def copy_mixin(self, ret) -> CollectionState:
-        ret.smbm = {player: copy.deepcopy(self.smbm[player]) for player in self.smbm}
+        ret.smbm = {player: self.smbm[player].snapshot() for player in self.smbm}
         return ret
 
     def get_game_players(self, multiword: MultiWorld, game_name: str):
@@ -796,21 +798,19 @@ class SMWorld(World):
 
         romPatcher.end()
 
-    def generate_output(self, output_directory: str):
+    def get_output_job(self, output_directory: str):
         try:
             patcher = self.variaRando.PatchRom(self.APPrePatchRom, self.APPostPatchRom)
             self.rom_name = self.romName
-
-            patch = SMProcedurePatch(player=self.player, player_name=self.multiworld.player_name[self.player])
-            patch.write_tokens(patcher.romFile.getPatchDict())
-            rom_path = os.path.join(output_directory, f"{self.multiworld.get_out_file_name_base(self.player)}"
-                                                      f"{patch.patch_file_ending}")
-            patch.write(rom_path)
-            
-        except:
-            raise
         finally:
             self.rom_name_available_event.set()  # make sure threading continues and errors are collected
+        # only the token data is handed to the job, not the patcher and its rom
+        token_data = get_token_data(patcher.romFile.getPatchDict())
+
+        patch_path = os.path.join(output_directory, f"{self.multiworld.get_out_file_name_base(self.player)}"
+                                                    f"{SMProcedurePatch.patch_file_ending}")
+        return functools.partial(write_patch, token_data, patch_path,
+                                 self.player, self.multiworld.player_name[self.player])
 
     def checksum_mirror_sum(self, start, length, mask = 0x800000):
         while not(length & mask) and mask:
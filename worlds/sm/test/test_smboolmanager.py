@@ -0,0 +1,35 @@
+import copy
+import unittest
+
+from test.general import setup_solo_multiworld
+from .. import SMWorld
+
+
+class TestSMBoolManager(unittest.TestCase):
+    def test_snapshot(self) -> None:
+        """Test that snapshots of the SMBoolManager evaluate like deep copies and don't share changes to items."""
+        multiworld = setup_solo_multiworld(SMWorld, ("generate_early", "create_regions", "create_items", "set_rules"))
+        state = multiworld.get_all_state()
+        smbm = state.smbm[1]
+        items = smbm.getItems()
+        snapshot = smbm.snapshot()
+        deep_copy = copy.deepcopy(smbm)
+        self.assertEqual(snapshot.getItems(), items)
+
+        snapshot_state = state.copy()
+        for location in multiworld.get_locations(1):
+            with self.subTest(location=location.name):
+                snapshot_state.smbm[1] = snapshot
+                snapshot_result = location.can_reach(snapshot_state)
+                snapshot_state.smbm[1] = deep_copy
+                self.assertEqual(snapshot_result, location.can_reach(snapshot_state))
+
+        snapshot.removeItem("Morph")
+        snapshot.removeItem("Missile")
+        self.assertEqual(smbm.getItems(), items)
+        smbm.removeItem("Varia")
+        self.assertEqual(snapshot.getItems()["Varia"], 1)
+        self.assertEqual(snapshot.getItems()["Morph"], 0)
+        self.assertEqual(snapshot.getItems()["Missile"], items["Missile"] - 1)
+        self.assertEqual(smbm.getItems()["Varia"], 0)
+        self.assertIs(snapshot.heatProof.__self__.smbm, snapshot)
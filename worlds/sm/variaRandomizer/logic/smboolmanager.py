@@ -16,9 +16,14 @@ class SMBoolManager(object):
     countItems = ['Missile', 'Super', 'PowerBomb', 'ETank', 'Reserve']
 
     percentItems = ['Bomb', 'Charge', 'Ice', 'HiJump', 'SpeedBooster', 'Wave', 'Spazer', 'SpringBall', 'Varia', 'Plasma', 'Grapple', 'Morph', 'Gravity', 'XRayScope', 'SpaceJump', 'ScrewAttack']
+    # names of the helpers functions of each helpers class, see createFacadeFunctions
+    facadeNames = {}
+
     def __init__(self, player=0, maxDiff=sys.maxsize, onlyBossLeft = False):
         self._items = { }
         self._counts = { }
+        # whether _items and _counts are shared with snapshots, and have to be copied before changing them
+        self._itemsShared = False
 
         self.player = player
         self.maxDiff = maxDiff
@@ -47,6 +52,7 @@ class SMBoolManager(object):
         new._items = {i: deepcopy(v, memodict) for i, v in self._items.items()}
         # `_counts` is a dict[str, int], so the dict can be copied because its keys and values are immutable.
         new._counts = self._counts.copy()
+        new._itemsShared = False
         # `player` is an int.
         new.player = self.player
         # `maxDiff` is an int.
@@ -76,6 +82,26 @@ class SMBoolManager(object):
 
         return new
 
+    def snapshot(self):
+        # Much cheaper copy than deepcopy, used for every copy of the collection state.
+        new = object.__new__(type(self))
+        # The knows functions, player settings and itemsPositions are never changed in place, so they are shared.
+        new.__dict__.update(self.__dict__)
+        # The item state is shared until either copy changes it. The SMBools in _items are replaced rather than
+        # changed when items are added or removed, so the dicts are copied but the SMBools are not.
+        self._itemsShared = new._itemsShared = True
+        # The HelpersGraph and the facade functions are bound to the instance, so they are created again.
+        new.helpers = Logic.HelpersGraph(new)
+        new.createFacadeFunctions()
+        return new
+
+    def unshareItems(self):
+        # copy on write of the item state shared with snapshots
+        if self._itemsShared:
+            self._items = self._items.copy()
+            self._counts = self._counts.copy()
+            self._itemsShared = False
+
     def computeItemsPositions(self):
         # compute index in cache key for each items
         self.itemsPositions = {}
@@ -141,12 +167,14 @@ class SMBoolManager(object):
     def resetItems(self):
         self._items = { item : smboolFalse for item in self.items }
         self._counts = { item : 0 for item in self.countItems }
+        self._itemsShared = False
 
         #self.cacheKey = 0
         #Cache.update(self.cacheKey)
 
     def addItem(self, item):
         # a new item is available
+        self.unshareItems()
         self._items[item] = SMBool(True, items=[item])
         if self.isCountItem(item):
             count = self._counts[item] + 1
@@ -160,6 +188,7 @@ class SMBoolManager(object):
     def addItems(self, items):
         if len(items) == 0:
             return
+        self.unshareItems()
         for item in items:
             self._items[item] = SMBool(True, items=[item])
             if self.isCountItem(item):
@@ -173,6 +202,7 @@ class SMBoolManager(object):
 
     def removeItem(self, item):
         # randomizer removed an item (or the item was added to test a post available)
+        self.unshareItems()
         if self.isCountItem(item):
             count = self._counts[item] - 1
             self._counts[item] = count
@@ -186,9 +216,12 @@ class SMBoolManager(object):
         #Cache.update(self.cacheKey)
 
     def createFacadeFunctions(self):
-        for fun in dir(self.helpers):
-            if fun != 'smbm' and fun[0:2] != '__':
-                setattr(self, fun, getattr(self.helpers, fun))
+        helpers = self.helpers
+        names = SMBoolManager.facadeNames.get(type(helpers))
+        if names is None:
+            names = [fun for fun in dir(helpers) if fun != 'smbm' and fun[0:2] != '__']
+            SMBoolManager.facadeNames[type(helpers)] = names
+        self.__dict__.update({fun: getattr(helpers, fun) for fun in names})
 
     def traverse(self, doorName):
         return self.doorsManager.traverse(self, doorName)
@@ -291,6 +324,7 @@ class SMBoolManagerPlando(SMBoolManager):
 
     def addItem(self, item):
         # a new item is available
+        self.unshareItems()
         already = self.haveItem(item)
         isCount = self.isCountItem(item)
         if isCount or not already:
@@ -309,6 +343,7 @@ class SMBoolManagerPlando(SMBoolManager):
 
     def removeItem(self, item):
         # randomizer removed an item (or the item was added to test a post available)
+        self.unshareItems()
         if self.isCountItem(item):
             count = self._counts[item] - 1
             self._counts[item] = count